@@ -1,10 +1,19 @@
 from datetime import timedelta
-from fastapi import APIRouter, Depends, HTTPException, status
+import math
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
-
-from app.core.security import authenticate_user, create_access_token, get_current_active_user, ACCESS_TOKEN_EXPIRE_MINUTES
-from app.db.database import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.security import (
+    authenticate_user_async,
+    create_access_token,
+    get_current_active_user,
+    get_password_queue_metrics,
+    is_admin,
+    ACCESS_TOKEN_EXPIRE_MINUTES
+)
+from app.core.throttle import LoginThrottled
+from app.db.database import get_async_db
 from app.db.models import User
 from app.schemas.token import Token
 from app.schemas.user import User as UserSchema
@@ -24,8 +33,9 @@ router = APIRouter(
 
 @router.post("/token", response_model=Token)
 async def login_for_access_token(
+    request: Request,
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Authenticate user and generate an access token.
 
@@ -33,17 +43,27 @@ async def login_for_access_token(
     for authenticating subsequent requests.
 
     Args:
+        request: Incoming request, used for the client IP.
         form_data: OAuth2 password request form containing username and password.
-        db: SQLAlchemy database session.
+        db: SQLAlchemy async database session.
 
     Returns:
         dict: A dictionary containing the access token and token type.
 
     Raises:
         HTTPException: 401 Unauthorized if authentication fails.
+        HTTPException: 429 Too Many Requests if login attempts are throttled.
     """
 
-    user = authenticate_user(db, form_data.username, form_data.password)
+    client_ip = request.client.host if request.client else None
+    try:
+        user = await authenticate_user_async(db, form_data.username, form_data.password, client_ip)
+    except LoginThrottled as e:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=str(e),
+            headers={"Retry-After": str(math.ceil(e.retry_after))},
+        )
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -72,3 +92,17 @@ async def read_users_me(current_user: User = Depends(get_current_active_user)):
     """
 
     return current_user
+
+
+@router.get("/metrics/password-queue")
+async def read_password_queue_metrics(current_user: User = Depends(is_admin)):
+    """Report queue wait times of the password verification worker pool.
+
+    Args:
+        current_user: The authenticated admin user.
+
+    Returns:
+        dict: Pending jobs and average/max/last queue wait in milliseconds.
+    """
+
+    return get_password_queue_metrics()
@@ -0,0 +1,151 @@
+import argparse
+import asyncio
+import time
+from fastapi import Depends, FastAPI, HTTPException
+from jose import jwt
+from sqlalchemy.orm import Session, selectinload
+
+from app.api import logbook
+from app.core.security import ALGORITHM, SECRET_KEY, create_access_token, oauth2_scheme
+from app.db.database import SessionLocal, async_engine, async_read_engine, engine
+from app.db.models import LogbookEntry, User
+from app.schemas.logbook import LogbookEntryPage
+from app.utils.pagination import apply_keyset, fetch_page
+
+"""Concurrent-request benchmark for the logbook API.
+
+Compares GET /logbook/entries on the async session layer with a baseline
+route reproducing the previous implementation, which ran the same queries
+on a blocking SessionLocal session inside the async endpoint.
+
+Keep --concurrency below the sync pool capacity (15 connections by default):
+beyond it the baseline blocks the event loop waiting for a pooled connection
+that only a pending request teardown on the same loop could return.
+
+Usage:
+    python -m app.api.benchmark --requests 500 --concurrency 10
+"""
+
+
+def _blocking_db():
+    """Sync session dependency, as used by the routers before the async port."""
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def _blocking_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(_blocking_db)):
+    """Previous get_current_user: token check plus a blocking user lookup."""
+    username = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM]).get("sub")
+    user = db.query(User).filter(User.username == username).first()
+    if user is None or not user.is_active:
+        raise HTTPException(status_code=401, detail="Could not validate credentials")
+    return user
+
+
+def build_app() -> FastAPI:
+    """Build an app serving both the async router and the blocking baseline.
+
+    Returns:
+        FastAPI: Application with /logbook/entries and /baseline/entries
+    """
+    app = FastAPI()
+    app.include_router(logbook.router)
+
+    @app.get("/baseline/entries", response_model=LogbookEntryPage)
+    async def baseline_entries(
+        limit: int = 100,
+        db: Session = Depends(_blocking_db),
+        current_user: User = Depends(_blocking_current_user)
+    ):
+        query = db.query(LogbookEntry).options(selectinload(LogbookEntry.attachments)).filter(
+            LogbookEntry.is_deleted == False
+        )
+        if current_user.role == "technician":
+            query = query.filter(LogbookEntry.user_id == current_user.id)
+        query = apply_keyset(query, LogbookEntry.created_at, LogbookEntry.id)
+        entries, next_cursor = fetch_page(query, "created_at", limit)
+        return {"items": entries, "next_cursor": next_cursor}
+
+    return app
+
+
+async def run_load(app: FastAPI, path: str, token: str, requests: int, concurrency: int, limit: int) -> dict:
+    """Issue requests against one route with a bounded number in flight.
+
+    Args:
+        app: ASGI application under test
+        path: Route to request
+        token: Bearer token for the Authorization header
+        requests: Total number of requests
+        concurrency: Maximum number of concurrent requests
+        limit: Page size passed to the route
+
+    Returns:
+        dict: Throughput and latency figures
+    """
+    import httpx
+
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    failures = 0
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://benchmark") as client:
+        async def one_request():
+            nonlocal failures
+            async with semaphore:
+                started = time.perf_counter()
+                response = await client.get(
+                    path, params={"limit": limit}, headers={"Authorization": f"Bearer {token}"}
+                )
+                latencies.append(time.perf_counter() - started)
+                if response.status_code != 200:
+                    failures += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one_request() for _ in range(requests)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests_per_second": requests / elapsed,
+        "p50_ms": latencies[len(latencies) // 2] * 1000,
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1] * 1000,
+        "failures": failures,
+    }
+
+
+async def main(requests: int, concurrency: int, limit: int):
+    """Benchmark the baseline and async routes and print the results."""
+    with SessionLocal() as session:
+        user = session.query(User).filter(User.is_active == True).first()
+    if user is None:
+        raise SystemExit("The benchmark needs at least one active user in the database")
+    token = create_access_token(data={"sub": user.username})
+
+    app = build_app()
+    print(f"{requests} requests, concurrency {concurrency}, page size {limit}, database {engine.url}")
+    for label, path in (("blocking Session (before)", "/baseline/entries"), ("AsyncSession (after)", "/logbook/entries")):
+        # Warm up connection pools and statement caches
+        await run_load(app, path, token, concurrency, concurrency, limit)
+        result = await run_load(app, path, token, requests, concurrency, limit)
+        print(
+            f"{label:<26} {result['requests_per_second']:8.1f} req/s   "
+            f"p50 {result['p50_ms']:7.1f} ms   p95 {result['p95_ms']:7.1f} ms   "
+            f"failures {result['failures']}"
+        )
+    await async_engine.dispose()
+    if async_read_engine is not async_engine:
+        await async_read_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark concurrent logbook API requests")
+    parser.add_argument("--requests", type=int, default=500, help="Total requests per route")
+    parser.add_argument("--concurrency", type=int, default=10, help="Requests in flight at once")
+    parser.add_argument("--limit", type=int, default=50, help="Page size requested")
+    args = parser.parse_args()
+
+    asyncio.run(main(args.requests, args.concurrency, args.limit))
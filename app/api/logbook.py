@@ -1,11 +1,14 @@
-from typing import List, Optional
+from typing import List, Literal, Optional
 from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form, Query
-from sqlalchemy.orm import Session
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 import uuid
 from datetime import date
 
-from app.core.security import get_current_active_user, is_manager_or_admin, create_audit_log
-from app.db.database import get_db
+from app.core.security import get_current_active_user, is_manager_or_admin, create_audit_log_async
+from app.db.database import get_async_db
 from app.db.models import LogbookEntry, User, Attachment, Location, Category
 from app.schemas.logbook import (
     LogbookEntryCreate, 
@@ -13,9 +16,17 @@ from app.schemas.logbook import (
     LogbookEntry as LogbookEntrySchema,
     LogbookEntryDetail,
     LogbookEntryStatusUpdate,
-    LogbookEntrySearch
+    LogbookEntrySearch,
+    LogbookEntryPage,
+    EntryHistoryPage
 )
+from app.services.export_service import stream_csv
 from app.services.file_service import save_upload_file
+from app.services.history_service import ENTRY_ENTITY_TYPE, HISTORY_PAGE_SIZE, entity_history
+from app.services.search_service import apply_text_search
+from app.utils.pagination import apply_keyset, decode_cursor, split_page
+import app.services.artifact_service  # noqa: F401  registers the report cache version flush hooks
+import app.services.rollup_service  # noqa: F401  registers the daily rollup flush hooks
 
 """Logbook API endpoints.
 
@@ -24,6 +35,12 @@ This module provides CRUD operations for logbook entries including:
 - Managing entry statuses
 - Handling file attachments
 - Advanced search functionality
+- Cursor (keyset) pagination of entry listings and entry change histories
+- Streaming CSV export
+
+All endpoints use AsyncSession so database IO does not block the event loop.
+Relationships serialized in responses are eager loaded, since lazy loading
+is not available on async sessions.
 """
 
 router = APIRouter(
@@ -36,14 +53,14 @@ router = APIRouter(
 @router.post("/entries", response_model=LogbookEntrySchema, status_code=status.HTTP_201_CREATED)
 async def create_logbook_entry(
     entry: LogbookEntryCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Create a new logbook entry.
 
     Args:
         entry: Logbook entry data to create
-        db: Database session
+        db: Async database session
         current_user: Authenticated user
 
     Returns:
@@ -53,13 +70,13 @@ async def create_logbook_entry(
         HTTPException: 404 if location or category not found
     """
     # Verify location exists
-    location = db.query(Location).filter(Location.id == entry.location_id).first()
+    location = await db.get(Location, entry.location_id)
     if not location:
         raise HTTPException(status_code=404, detail="Location not found")
     
     # Verify category exists if provided
     if entry.category_id:
-        category = db.query(Category).filter(Category.id == entry.category_id).first()
+        category = await db.get(Category, entry.category_id)
         if not category:
             raise HTTPException(status_code=404, detail="Category not found")
     
@@ -69,11 +86,11 @@ async def create_logbook_entry(
         **entry.dict()
     )
     db.add(db_entry)
-    db.commit()
-    db.refresh(db_entry)
+    await db.commit()
+    db_entry = await _get_entry(db, db_entry.id)
     
     # Create audit log
-    create_audit_log(
+    await create_audit_log_async(
         db=db,
         user_id=current_user.id,
         action="create",
@@ -84,37 +101,46 @@ async def create_logbook_entry(
     return db_entry
 
 
-@router.get("/entries", response_model=List[LogbookEntrySchema])
+@router.get("/entries", response_model=LogbookEntryPage)
 async def read_logbook_entries(
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     status: Optional[str] = None,
     start_date_from: Optional[date] = None,
     start_date_to: Optional[date] = None,
     location_id: Optional[int] = None,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_active_user)
 ):
-    """Retrieve paginated list of logbook entries with optional filters.
+    """Retrieve a page of logbook entries with optional filters.
 
     Args:
-        skip: Number of records to skip for pagination
+        skip: Number of records to skip (prefer cursor for deep pages)
         limit: Maximum number of records to return
+        cursor: Opaque next_cursor value from the previous page
         status: Filter by entry status
         start_date_from: Filter entries starting after this date
         start_date_to: Filter entries starting before this date
         location_id: Filter by location ID
-        db: Database session
+        db: Async database session
         current_user: Authenticated user
 
     Returns:
-        List[LogbookEntrySchema]: List of logbook entries
+        LogbookEntryPage: Entries newest first and the cursor for the next page
+
+    Raises:
+        HTTPException: 400 if the cursor is invalid
 
     Notes:
         Technicians can only see their own entries
     """
 
-    query = db.query(LogbookEntry).filter(LogbookEntry.is_deleted == False)
+    position = _decode_cursor_or_400(cursor)
+
+    query = select(LogbookEntry).options(selectinload(LogbookEntry.attachments)).filter(
+        LogbookEntry.is_deleted == False
+    )
     
     # Apply role-based filtering
     if current_user.role == "technician":
@@ -130,18 +156,51 @@ async def read_logbook_entries(
     if location_id:
         query = query.filter(LogbookEntry.location_id == location_id)
     
-    # Order by most recent first
-    query = query.order_by(LogbookEntry.created_at.desc())
+    # Order by most recent first, seeking past the cursor on (created_at, id)
+    query = apply_keyset(query, LogbookEntry.created_at, LogbookEntry.id, position)
+    if skip:
+        query = query.offset(skip)
     
     # Apply pagination
-    entries = query.offset(skip).limit(limit).all()
-    return entries
+    rows = (await db.execute(query.limit(limit + 1))).scalars().all()
+    entries, next_cursor = split_page(rows, "created_at", limit)
+    return {"items": entries, "next_cursor": next_cursor}
+
+
+@router.get("/export.csv")
+async def export_logbook_entries_csv(
+    current_user: User = Depends(get_current_active_user)
+):
+    """Stream all visible logbook entries as a CSV file.
+
+    Rows are read in batches and encoded incrementally, so memory use does
+    not grow with the number of entries.
+
+    Args:
+        current_user: Authenticated user
+
+    Returns:
+        StreamingResponse: text/csv attachment
+
+    Notes:
+        Technicians only export their own entries
+    """
+    filters = []
+    if current_user.role == "technician":
+        filters.append(LogbookEntry.user_id == current_user.id)
+
+    # A sync iterator is consumed in the threadpool, keeping the event loop free
+    return StreamingResponse(
+        stream_csv(filters),
+        media_type="text/csv",
+        headers={"Content-Disposition": 'attachment; filename="logbook_entries.csv"'},
+    )
 
 
 @router.get("/entries/{entry_id}", response_model=LogbookEntryDetail)
 async def read_logbook_entry(
     entry_id: uuid.UUID,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_active_user)
 ):
 
@@ -149,7 +208,7 @@ async def read_logbook_entry(
 
     Args:
         entry_id: UUID of the logbook entry
-        db: Database session
+        db: Async database session
         current_user: Authenticated user
 
     Returns:
@@ -159,7 +218,9 @@ async def read_logbook_entry(
         HTTPException: 404 if entry not found, 403 if unauthorized
     """
 
-    entry = db.query(LogbookEntry).filter(LogbookEntry.id == entry_id, LogbookEntry.is_deleted == False).first()
+    entry = await _get_entry(
+        db, entry_id, LogbookEntry.location, LogbookEntry.category, LogbookEntry.user, LogbookEntry.completed_by
+    )
     if not entry:
         raise HTTPException(status_code=404, detail="Entry not found")
     
@@ -185,11 +246,53 @@ async def read_logbook_entry(
     return result
 
 
+@router.get("/entries/{entry_id}/history", response_model=EntryHistoryPage)
+async def read_logbook_entry_history(
+    entry_id: uuid.UUID,
+    cursor: Optional[str] = None,
+    limit: int = Query(HISTORY_PAGE_SIZE, ge=1, le=200),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Get a page of a logbook entry's change history.
+
+    Args:
+        entry_id: UUID of the logbook entry
+        cursor: Opaque next_cursor value from the previous page
+        limit: Maximum number of events to return
+        db: Async database session
+        current_user: Authenticated user
+
+    Returns:
+        EntryHistoryPage: Events newest first, with field-level changes, and the cursor for the next page
+
+    Raises:
+        HTTPException: 404 if entry not found, 403 if unauthorized, 400 if the cursor is invalid
+
+    Notes:
+        The history of deleted entries stays available
+    """
+    position = _decode_cursor_or_400(cursor)
+
+    owner_id = (await db.execute(select(LogbookEntry.user_id).filter(LogbookEntry.id == entry_id))).scalar()
+    if owner_id is None:
+        raise HTTPException(status_code=404, detail="Entry not found")
+
+    # Check if user has permission to view this entry
+    if current_user.role == "technician" and owner_id != current_user.id:
+        raise HTTPException(status_code=403, detail="Not authorized to access this entry")
+
+    events, next_cursor = await db.run_sync(
+        lambda session: entity_history(session, ENTRY_ENTITY_TYPE, entry_id, position, limit)
+    )
+    return {"items": events, "next_cursor": next_cursor}
+
+
 @router.put("/entries/{entry_id}", response_model=LogbookEntrySchema)
 async def update_logbook_entry(
     entry_id: uuid.UUID,
     entry_update: LogbookEntryUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Update an existing logbook entry.
@@ -197,7 +300,7 @@ async def update_logbook_entry(
     Args:
         entry_id: UUID of the entry to update
         entry_update: Updated entry data
-        db: Database session
+        db: Async database session
         current_user: Authenticated user
 
     Returns:
@@ -208,7 +311,7 @@ async def update_logbook_entry(
     """
 
 
-    db_entry = db.query(LogbookEntry).filter(LogbookEntry.id == entry_id, LogbookEntry.is_deleted == False).first()
+    db_entry = await _get_entry(db, entry_id)
     if not db_entry:
         raise HTTPException(status_code=404, detail="Entry not found")
     
@@ -218,36 +321,40 @@ async def update_logbook_entry(
     
     # Verify location exists if being updated
     if entry_update.location_id is not None:
-        location = db.query(Location).filter(Location.id == entry_update.location_id).first()
+        location = await db.get(Location, entry_update.location_id)
         if not location:
             raise HTTPException(status_code=404, detail="Location not found")
     
     # Verify category exists if being updated
     if entry_update.category_id is not None:
-        category = db.query(Category).filter(Category.id == entry_update.category_id).first()
+        category = await db.get(Category, entry_update.category_id)
         if not category:
             raise HTTPException(status_code=404, detail="Category not found")
     
-    # Update entry fields
+    # Update entry fields, keeping the previous values of changed fields for the audit log
     update_data = entry_update.dict(exclude_unset=True)
+    changes = {}
     for key, value in update_data.items():
+        old_value = getattr(db_entry, key)
+        if old_value != value:
+            changes[key] = {"old": old_value, "new": value}
         setattr(db_entry, key, value)
     
     # If status is being changed to completed, set completed_by
     if update_data.get("status") == "completed" and db_entry.status != "completed":
         db_entry.completed_by_id = current_user.id
     
-    db.commit()
-    db.refresh(db_entry)
+    await db.commit()
+    db_entry = await _get_entry(db, entry_id)
     
     # Create audit log
-    create_audit_log(
+    await create_audit_log_async(
         db=db,
         user_id=current_user.id,
         action="update",
         entity_type="logbook_entry",
         entity_id=str(entry_id),
-        details=update_data
+        details=changes
     )
     
     return db_entry
@@ -257,7 +364,7 @@ async def update_logbook_entry(
 async def update_entry_status(
     entry_id: uuid.UUID,
     status_update: LogbookEntryStatusUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Update the status of a logbook entry.
@@ -265,7 +372,7 @@ async def update_entry_status(
     Args:
         entry_id: UUID of the entry to update
         status_update: New status and optional solution details
-        db: Database session
+        db: Async database session
         current_user: Authenticated user
 
     Returns:
@@ -275,7 +382,7 @@ async def update_entry_status(
         HTTPException: 404 if entry not found, 403 if unauthorized
     """
 
-    db_entry = db.query(LogbookEntry).filter(LogbookEntry.id == entry_id, LogbookEntry.is_deleted == False).first()
+    db_entry = await _get_entry(db, entry_id)
     if not db_entry:
         raise HTTPException(status_code=404, detail="Entry not found")
     
@@ -298,11 +405,11 @@ async def update_entry_status(
     if status_update.status == "completed" and db_entry.status != "completed":
         db_entry.completed_by_id = current_user.id
     
-    db.commit()
-    db.refresh(db_entry)
+    await db.commit()
+    db_entry = await _get_entry(db, entry_id)
     
     # Create audit log
-    create_audit_log(
+    await create_audit_log_async(
         db=db,
         user_id=current_user.id,
         action="status_update",
@@ -317,21 +424,21 @@ async def update_entry_status(
 @router.delete("/entries/{entry_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_logbook_entry(
     entry_id: uuid.UUID,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Soft delete a logbook entry (mark as deleted without removing from DB).
 
     Args:
         entry_id: UUID of the entry to delete
-        db: Database session
+        db: Async database session
         current_user: Authenticated user
 
     Raises:
         HTTPException: 404 if entry not found, 403 if unauthorized
     """
 
-    db_entry = db.query(LogbookEntry).filter(LogbookEntry.id == entry_id, LogbookEntry.is_deleted == False).first()
+    db_entry = await _get_entry(db, entry_id)
     if not db_entry:
         raise HTTPException(status_code=404, detail="Entry not found")
     
@@ -341,10 +448,10 @@ async def delete_logbook_entry(
     
     # Soft delete
     db_entry.is_deleted = True
-    db.commit()
+    await db.commit()
     
     # Create audit log
-    create_audit_log(
+    await create_audit_log_async(
         db=db,
         user_id=current_user.id,
         action="delete",
@@ -360,7 +467,7 @@ async def upload_attachment(
     entry_id: uuid.UUID,
     file: UploadFile = File(...),
     description: str = Form(None),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Upload a file attachment for a logbook entry.
@@ -369,7 +476,7 @@ async def upload_attachment(
         entry_id: UUID of the associated logbook entry
         file: File to upload
         description: Optional description of the attachment
-        db: Database session
+        db: Async database session
         current_user: Authenticated user
 
     Returns:
@@ -380,7 +487,7 @@ async def upload_attachment(
     """
 
     # Check if entry exists
-    entry = db.query(LogbookEntry).filter(LogbookEntry.id == entry_id, LogbookEntry.is_deleted == False).first()
+    entry = await _get_entry(db, entry_id)
     if not entry:
         raise HTTPException(status_code=404, detail="Entry not found")
     
@@ -403,48 +510,60 @@ async def upload_attachment(
     )
     
     db.add(attachment)
-    db.commit()
-    db.refresh(attachment)
+    await db.commit()
+    await db.refresh(attachment)
     
-    # Create audit log
-    create_audit_log(
+    # Create audit log (recorded against the entry, so it shows in the entry's history)
+    await create_audit_log_async(
         db=db,
         user_id=current_user.id,
-        action="upload_attachment",
-        entity_type="attachment",
-        entity_id=str(attachment.id),
-        details={"file_name": file.filename, "entry_id": str(entry_id)}
+        action="attachment_added",
+        entity_type=ENTRY_ENTITY_TYPE,
+        entity_id=str(entry_id),
+        details={"file_name": attachment.file_name, "attachment_id": str(attachment.id)}
     )
     
     return {"id": attachment.id, "file_name": attachment.file_name}
 
 
-@router.post("/search", response_model=List[LogbookEntrySchema])
+@router.post("/search", response_model=LogbookEntryPage)
 async def search_logbook_entries(
     search_params: LogbookEntrySearch,
     skip: int = Query(0),
     limit: int = Query(100),
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = Query(None),
+    sort: Literal["recent", "relevance"] = Query("recent"),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Advanced search for logbook entries with multiple filter criteria.
 
     Args:
         search_params: Search criteria object
-        skip: Number of records to skip for pagination
+        skip: Number of records to skip (prefer cursor for deep pages)
         limit: Maximum number of records to return
-        db: Database session
+        cursor: Opaque next_cursor value from the previous page
+        sort: 'recent' (newest first, cursor paginated) or 'relevance'
+              (best full-text match first, skip paginated)
+        db: Async database session
         current_user: Authenticated user
 
     Returns:
-        List[LogbookEntrySchema]: List of matching logbook entries
+        LogbookEntryPage: Matching entries and the cursor for the next page
+
+    Raises:
+        HTTPException: 400 if the cursor is invalid
 
     Notes:
         Supports text search across multiple fields
         Technicians can only search their own entries
     """
 
-    query = db.query(LogbookEntry).filter(LogbookEntry.is_deleted == False)
+    position = _decode_cursor_or_400(cursor)
+
+    query = select(LogbookEntry).options(selectinload(LogbookEntry.attachments)).filter(
+        LogbookEntry.is_deleted == False
+    )
     
     # Apply role-based filtering
     if current_user.role == "technician":
@@ -470,18 +589,66 @@ async def search_logbook_entries(
     if search_params.user_id and (current_user.role in ["admin", "manager"]):
         query = query.filter(LogbookEntry.user_id == search_params.user_id)
     
-    # Text search in description fields
+    # Full-text search in description fields
     if search_params.search_text:
-        search_term = f"%{search_params.search_text}%"
-        query = query.filter(
-            (LogbookEntry.call_description.ilike(search_term)) |
-            (LogbookEntry.solution_description.ilike(search_term)) |
-            (LogbookEntry.device.ilike(search_term))
+        # The index lookup inspects the schema, which needs the session's sync API
+        query = await db.run_sync(
+            lambda session: apply_text_search(query, session, search_params.search_text, rank=(sort == "relevance"))
         )
     
-    # Order by most recent first
-    query = query.order_by(LogbookEntry.created_at.desc())
+    if sort == "relevance":
+        # Relevance scores shift as entries change, so this order is paged with skip only
+        query = query.order_by(LogbookEntry.created_at.desc())
+        entries = (await db.execute(query.offset(skip).limit(limit))).scalars().all()
+        return {"items": entries, "next_cursor": None}
+    
+    # Order by most recent first, seeking past the cursor on (created_at, id)
+    query = apply_keyset(query, LogbookEntry.created_at, LogbookEntry.id, position)
+    if skip:
+        query = query.offset(skip)
     
     # Apply pagination
-    entries = query.offset(skip).limit(limit).all()
-    return entries
+    rows = (await db.execute(query.limit(limit + 1))).scalars().all()
+    entries, next_cursor = split_page(rows, "created_at", limit)
+    return {"items": entries, "next_cursor": next_cursor}
+
+
+async def _get_entry(db: AsyncSession, entry_id: uuid.UUID, *relationships):
+    """Load a non-deleted entry with its attachments and any extra relationships.
+
+    Args:
+        db: Async database session
+        entry_id: UUID of the entry
+        *relationships: Additional LogbookEntry relationships to eager load
+
+    Returns:
+        LogbookEntry: The entry with fresh column values, or None if not found
+    """
+    query = select(LogbookEntry).options(
+        selectinload(LogbookEntry.attachments),
+        *(selectinload(relationship) for relationship in relationships)
+    ).filter(
+        LogbookEntry.id == entry_id,
+        LogbookEntry.is_deleted == False
+    ).execution_options(populate_existing=True)
+    return (await db.execute(query)).scalars().first()
+
+
+def _decode_cursor_or_400(cursor: Optional[str]):
+    """Decode an optional cursor query parameter.
+
+    Args:
+        cursor: Cursor token from the request, or None
+
+    Returns:
+        tuple: (created_at, id) keyset position, or None when no cursor was given
+
+    Raises:
+        HTTPException: 400 if the cursor is malformed
+    """
+    if not cursor:
+        return None
+    try:
+        return decode_cursor(cursor)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
@@ -0,0 +1,115 @@
+import os
+import threading
+import time
+from dotenv import load_dotenv
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+
+from app.db.models import User
+
+"""Short-lived in-process cache of authenticated principals.
+
+This module provides:
+- A TTL cache of User objects keyed by JWT subject and expiry, so
+  authenticated requests can skip the users table lookup
+- Invalidation whenever a User row is updated or deleted through the ORM
+  (user management screens, login bookkeeping, API changes)
+
+Cached users are shared between requests and must be treated as read-only.
+"""
+
+# Load environment variables
+load_dotenv()
+
+PRINCIPAL_CACHE_TTL_SECONDS = float(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", "60"))
+"""Maximum age of a cached principal; 0 disables the cache."""
+
+PRINCIPAL_CACHE_MAX_ENTRIES = 10000
+"""Number of cached tokens above which expired entries are purged."""
+
+_lock = threading.Lock()
+_principals = {}
+"""{(subject, token expiry): (User, cache expiry)}"""
+
+
+def get_cached_principal(subject: str, token_expiry):
+    """Return the cached user for a token, if still fresh.
+
+    Args:
+        subject: Token subject (username)
+        token_expiry: Token 'exp' claim
+
+    Returns:
+        User: The cached user, or None on a miss
+    """
+    now = time.time()
+    with _lock:
+        cached = _principals.get((subject, token_expiry))
+        if cached is None:
+            return None
+        user, expires_at = cached
+        if expires_at <= now:
+            del _principals[(subject, token_expiry)]
+            return None
+        return user
+
+
+def cache_principal(subject: str, token_expiry, user: User):
+    """Cache the user resolved for a token.
+
+    The entry lives for PRINCIPAL_CACHE_TTL_SECONDS, but never past the
+    token's own expiry.
+
+    Args:
+        subject: Token subject (username)
+        token_expiry: Token 'exp' claim (seconds since the epoch)
+        user: User loaded for the subject
+    """
+    if PRINCIPAL_CACHE_TTL_SECONDS <= 0:
+        return
+    now = time.time()
+    expires_at = now + PRINCIPAL_CACHE_TTL_SECONDS
+    if isinstance(token_expiry, (int, float)):
+        expires_at = min(expires_at, token_expiry)
+    with _lock:
+        if len(_principals) >= PRINCIPAL_CACHE_MAX_ENTRIES:
+            for key in [key for key, (_, entry_expiry) in _principals.items() if entry_expiry <= now]:
+                del _principals[key]
+        _principals[(subject, token_expiry)] = (user, expires_at)
+
+
+def invalidate_principal(user_id=None):
+    """Drop cached principals for one user, or all of them.
+
+    Args:
+        user_id: Id of the user to drop; None clears the whole cache
+    """
+    with _lock:
+        if user_id is None:
+            _principals.clear()
+            return
+        for key in [key for key, (user, _) in _principals.items() if user.id == user_id]:
+            del _principals[key]
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_changed_user(mapper, connection, target):
+    """Invalidate a user as soon as its row changes, and again after commit."""
+    invalidate_principal(target.id)
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault("changed_user_ids", set()).add(target.id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_users(session):
+    """Drop principals re-cached from pre-commit state by concurrent requests."""
+    for user_id in session.info.pop("changed_user_ids", ()):
+        invalidate_principal(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changed_users(session):
+    """Forget users changed in a rolled back transaction."""
+    session.info.pop("changed_user_ids", None)
@@ -1,22 +1,33 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 import os
 from dotenv import load_dotenv
 
-from app.db.database import get_db
-from app.db.models import User
+from app.db.database import get_async_db
+from app.core.principal_cache import cache_principal, get_cached_principal
+from app.core.throttle import check_login_allowed
+from app.db.models import AuditLog, User
 from app.schemas.token import TokenData
+from app.services.audit_sink_service import record_audit
 
 """Security and authentication utilities.
 
 This module provides:
-- Password hashing and verification
+- Password hashing and verification (bcrypt runs in a bounded worker pool)
+- Login throttling before password verification
 - JWT token creation and validation
+- Cached resolution of the token's user
 - User authentication and authorization
 - Role-based permission checks
 - Audit logging functionality
@@ -36,6 +47,13 @@ pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 # OAuth2 password bearer token setup
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
+PASSWORD_WORKERS = int(os.getenv("PASSWORD_WORKERS", "4"))
+"""Maximum number of concurrent bcrypt verifications."""
+
+# Worker pool for bcrypt; bcrypt releases the GIL, so threads run in parallel
+_password_executor = ThreadPoolExecutor(max_workers=PASSWORD_WORKERS, thread_name_prefix="password")
+_queue_lock = threading.Lock()
+_queue_metrics = {"pending": 0, "count": 0, "total_wait": 0.0, "max_wait": 0.0, "last_wait": 0.0}
 
 
 def verify_password(plain_password, hashed_password):
@@ -51,6 +69,81 @@ def verify_password(plain_password, hashed_password):
     return pwd_context.verify(plain_password, hashed_password)
 
 
+def _timed_verify(submitted_at: float, plain_password, hashed_password):
+    """Run verify_password in the worker pool, recording how long it was queued."""
+    wait = time.perf_counter() - submitted_at
+    with _queue_lock:
+        _queue_metrics["pending"] -= 1
+        _queue_metrics["count"] += 1
+        _queue_metrics["total_wait"] += wait
+        _queue_metrics["max_wait"] = max(_queue_metrics["max_wait"], wait)
+        _queue_metrics["last_wait"] = wait
+    return verify_password(plain_password, hashed_password)
+
+
+def _submit_verify(plain_password, hashed_password):
+    """Queue a password verification on the worker pool.
+
+    Returns:
+        Future: Resolves to the verify_password result
+    """
+    with _queue_lock:
+        _queue_metrics["pending"] += 1
+    return _password_executor.submit(_timed_verify, time.perf_counter(), plain_password, hashed_password)
+
+
+def verify_password_pooled(plain_password, hashed_password):
+    """Verify a password on the worker pool, blocking the calling thread.
+
+    Used by synchronous callers (e.g. Flet event handlers) so all bcrypt work
+    shares the same concurrency bound.
+
+    Args:
+        plain_password: The plain text password to verify
+        hashed_password: The stored hashed password
+
+    Returns:
+        bool: True if passwords match, False otherwise
+    """
+    return _submit_verify(plain_password, hashed_password).result()
+
+
+async def verify_password_async(plain_password, hashed_password):
+    """Verify a password on the worker pool without blocking the event loop.
+
+    Args:
+        plain_password: The plain text password to verify
+        hashed_password: The stored hashed password
+
+    Returns:
+        bool: True if passwords match, False otherwise
+    """
+    return await asyncio.wrap_future(_submit_verify(plain_password, hashed_password))
+
+
+def get_password_queue_metrics() -> dict:
+    """Return queue wait statistics of the password worker pool.
+
+    Returns:
+        dict: Statistics with keys:
+            pending: Verifications queued or running
+            count: Verifications started since process start
+            avg_wait_ms: Mean time spent queued before a worker picked a job up
+            max_wait_ms: Longest queue wait
+            last_wait_ms: Queue wait of the most recent verification
+    """
+    with _queue_lock:
+        metrics = dict(_queue_metrics)
+    count = metrics["count"]
+    return {
+        "pending": metrics["pending"],
+        "count": count,
+        "avg_wait_ms": metrics["total_wait"] / count * 1000 if count else 0.0,
+        "max_wait_ms": metrics["max_wait"] * 1000,
+        "last_wait_ms": metrics["last_wait"] * 1000,
+    }
+
+
 def get_password_hash(password):
     """Generate a secure hash of a password.
 
@@ -63,25 +156,30 @@ def get_password_hash(password):
     return pwd_context.hash(password)
 
 
-def authenticate_user(db: Session, username: str, password: str):
+def authenticate_user(db: Session, username: str, password: str, client_ip: Optional[str] = None):
     """Authenticate a user with username and password.
 
     Args:
         db: Database session
         username: User's username
         password: User's plain text password
+        client_ip: Optional address of the client, used for throttling
 
     Returns:
         User: The authenticated user object if successful
         bool: False if authentication fails
 
+    Raises:
+        LoginThrottled: If the username or client IP made too many attempts
+
     Side Effects:
         Updates failed_attempts counter and last_login timestamp
     """
+    check_login_allowed(username, client_ip)
     user = db.query(User).filter(User.username == username).first()
     if not user:
         return False
-    if not verify_password(password, user.password_hash):
+    if not verify_password_pooled(password, user.password_hash):
         # Increment failed login attempts
         user.failed_attempts += 1
         db.commit()
@@ -96,6 +194,44 @@ def authenticate_user(db: Session, username: str, password: str):
     return user
 
 
+async def authenticate_user_async(db: AsyncSession, username: str, password: str, client_ip: Optional[str] = None):
+    """Authenticate a user with username and password on an async session.
+
+    Args:
+        db: Async database session
+        username: User's username
+        password: User's plain text password
+        client_ip: Optional address of the client, used for throttling
+
+    Returns:
+        User: The authenticated user object if successful
+        bool: False if authentication fails
+
+    Raises:
+        LoginThrottled: If the username or client IP made too many attempts
+
+    Side Effects:
+        Updates failed_attempts counter and last_login timestamp
+    """
+    check_login_allowed(username, client_ip)
+    user = (await db.execute(select(User).where(User.username == username))).scalars().first()
+    if not user:
+        return False
+    if not await verify_password_async(password, user.password_hash):
+        # Increment failed login attempts
+        user.failed_attempts += 1
+        await db.commit()
+        return False
+    # Check if user is active
+    if not user.is_active:
+        return False
+    # Reset failed attempts and update last login
+    user.failed_attempts = 0
+    user.last_login = datetime.utcnow()
+    await db.commit()
+    return user
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     """Create a JWT access token with expiration.
 
@@ -116,15 +252,15 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     return encoded_jwt
 
 
-async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+async def get_current_user(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_async_db)):
     """Retrieve and validate the current user from JWT token.
 
     Args:
         token: JWT token from Authorization header
-        db: Database session
+        db: Async database session
 
     Returns:
-        User: The authenticated user
+        User: The authenticated user (possibly a cached, read-only instance)
 
     Raises:
         HTTPException: 401 if invalid credentials or inactive user
@@ -143,9 +279,14 @@ async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = De
     except JWTError:
         raise credentials_exception
     
-    user = db.query(User).filter(User.username == token_data.username).first()
+    # Skip the users table while the principal for this token is cached
+    token_expiry = payload.get("exp")
+    user = get_cached_principal(token_data.username, token_expiry)
     if user is None:
-        raise credentials_exception
+        user = (await db.execute(select(User).where(User.username == token_data.username))).scalars().first()
+        if user is None:
+            raise credentials_exception
+        cache_principal(token_data.username, token_expiry, user)
     if not user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
     return user
@@ -213,8 +354,11 @@ def create_audit_log(db: Session, user_id: str, action: str, entity_type: str,
                     user_agent: str = None):
     """Create an audit log entry for security tracking.
 
+    The record is spooled to disk and inserted by the audit sink in a later
+    batch, so the caller does not pay for a second commit.
+
     Args:
-        db: Database session
+        db: Database session of the caller (its transaction is not used)
         user_id: ID of user performing the action
         action: Type of action performed
         entity_type: Type of entity affected
@@ -224,19 +368,47 @@ def create_audit_log(db: Session, user_id: str, action: str, entity_type: str,
         user_agent: Optional user agent string
 
     Returns:
-        AuditLog: The created audit log entry
+        AuditLog: The audit log entry (transient until its batch is flushed)
     """
-    from app.db.models import AuditLog
-    
-    audit_log = AuditLog(
-        user_id=user_id,
-        action=action,
-        entity_type=entity_type,
-        entity_id=entity_id,
-        details=details,
-        ip_address=ip_address,
-        user_agent=user_agent
-    )
-    db.add(audit_log)
-    db.commit()
-    return audit_log
+    return AuditLog(**record_audit({
+        "user_id": user_id,
+        "action": action,
+        "entity_type": entity_type,
+        "entity_id": entity_id,
+        "details": details,
+        "ip_address": ip_address,
+        "user_agent": user_agent,
+    }))
+
+
+async def create_audit_log_async(db: AsyncSession, user_id: str, action: str, entity_type: str,
+                                 entity_id: str, details: dict = None, ip_address: str = None,
+                                 user_agent: str = None):
+    """Create an audit log entry from an async handler.
+
+    The record is spooled to disk on a worker thread (the spool write may
+    fsync) and inserted by the audit sink in a later batch; the event loop
+    waits for neither.
+
+    Args:
+        db: Async database session of the caller (its transaction is not used)
+        user_id: ID of user performing the action
+        action: Type of action performed
+        entity_type: Type of entity affected
+        entity_id: ID of entity affected
+        details: Optional additional details as dict
+        ip_address: Optional IP address of requester
+        user_agent: Optional user agent string
+
+    Returns:
+        AuditLog: The audit log entry (transient until its batch is flushed)
+    """
+    return AuditLog(**await asyncio.to_thread(record_audit, {
+        "user_id": user_id,
+        "action": action,
+        "entity_type": entity_type,
+        "entity_id": entity_id,
+        "details": details,
+        "ip_address": ip_address,
+        "user_agent": user_agent,
+    }))
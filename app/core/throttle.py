@@ -0,0 +1,114 @@
+import math
+import os
+import threading
+import time
+from typing import Optional
+from dotenv import load_dotenv
+
+"""Token-bucket throttling of login attempts.
+
+This module provides:
+- A thread-safe token bucket keyed by arbitrary strings
+- Per-username and per-client-IP login throttles checked before any
+  password hashing work is done
+"""
+
+# Load environment variables
+load_dotenv()
+
+LOGIN_USER_BURST = int(os.getenv("LOGIN_USER_BURST", "5"))
+"""Login attempts a single username may make in a burst."""
+
+LOGIN_USER_REFILL_SECONDS = float(os.getenv("LOGIN_USER_REFILL_SECONDS", "12"))
+"""Seconds until a username regains one attempt (default: 5 per minute)."""
+
+LOGIN_IP_BURST = int(os.getenv("LOGIN_IP_BURST", "50"))
+"""Login attempts a single client IP may make in a burst (covers shared NAT / kiosks)."""
+
+LOGIN_IP_REFILL_SECONDS = float(os.getenv("LOGIN_IP_REFILL_SECONDS", "1"))
+"""Seconds until a client IP regains one attempt."""
+
+
+class LoginThrottled(Exception):
+    """Raised when a login attempt is rejected by the throttle.
+
+    Attributes:
+        retry_after: Seconds until the next attempt will be accepted
+    """
+
+    def __init__(self, retry_after: float):
+        super().__init__(f"Too many login attempts, retry in {math.ceil(retry_after)} seconds")
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """Thread-safe token buckets keyed by string.
+
+    Each key starts with `capacity` tokens and regains one token every
+    `refill_seconds`. Full buckets are dropped periodically to bound memory.
+    """
+
+    PRUNE_THRESHOLD = 10000
+    """Number of tracked keys above which full buckets are dropped."""
+
+    def __init__(self, capacity: int, refill_seconds: float):
+        self.capacity = capacity
+        self.refill_seconds = refill_seconds
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def _level(self, key: str, now: float) -> float:
+        """Return the refilled token count of a key (caller holds the lock)."""
+        tokens, updated_at = self._buckets.get(key, (self.capacity, now))
+        return min(self.capacity, tokens + (now - updated_at) / self.refill_seconds)
+
+    def retry_after(self, key: str) -> float:
+        """Return seconds until the key has a token (0 if one is available)."""
+        with self._lock:
+            tokens = self._level(key, time.monotonic())
+        return 0.0 if tokens >= 1 else (1 - tokens) * self.refill_seconds
+
+    def consume(self, key: str) -> bool:
+        """Take one token for a key.
+
+        Args:
+            key: Bucket key
+
+        Returns:
+            bool: True if a token was available, False if the key is throttled
+        """
+        now = time.monotonic()
+        with self._lock:
+            tokens = self._level(key, now)
+            if tokens < 1:
+                return False
+            self._buckets[key] = (tokens - 1, now)
+            if len(self._buckets) > self.PRUNE_THRESHOLD:
+                self._prune(now)
+            return True
+
+    def _prune(self, now: float):
+        """Drop keys whose bucket has refilled completely (caller holds the lock)."""
+        for key in [key for key in self._buckets if self._level(key, now) >= self.capacity]:
+            del self._buckets[key]
+
+
+_user_buckets = TokenBucket(LOGIN_USER_BURST, LOGIN_USER_REFILL_SECONDS)
+_ip_buckets = TokenBucket(LOGIN_IP_BURST, LOGIN_IP_REFILL_SECONDS)
+
+
+def check_login_allowed(username: str, client_ip: Optional[str] = None):
+    """Consume one login attempt for a username and (optionally) a client IP.
+
+    Args:
+        username: Username being logged in
+        client_ip: Address of the client, if known
+
+    Raises:
+        LoginThrottled: If either the username or the IP has no attempts left
+    """
+    if client_ip and not _ip_buckets.consume(client_ip):
+        raise LoginThrottled(_ip_buckets.retry_after(client_ip))
+    user_key = (username or "").lower()
+    if not _user_buckets.consume(user_key):
+        raise LoginThrottled(_user_buckets.retry_after(user_key))
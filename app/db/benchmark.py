@@ -0,0 +1,174 @@
+import argparse
+import os
+import tempfile
+import threading
+import time
+import uuid
+from datetime import date, datetime
+from sqlalchemy import create_engine, func, insert, select
+
+from app.db.database import Base, create_db_engine
+from app.db.models import LIVE_ENTRY_CONDITION, LogbookEntry, StatusEnum
+
+"""Concurrency benchmark for the SQLite engine profile.
+
+Runs reader threads executing an aggregate query while writer threads insert
+entries in short transactions, on a scratch database seeded for the run:
+- "default": the previous engine (rollback journal, default pragmas, one
+  shared pool for reads and writes)
+- "profile": create_db_engine's WAL profile with the read-only pool and the
+  single writer connection
+
+For each reader count it prints read throughput, write throughput, failed
+operations and whether every acknowledged write is present afterwards.
+
+Usage:
+    python -m app.db.benchmark --rows 20000 --readers 1 2 4 8 --writers 2 --seconds 5
+"""
+
+STATUSES = list(StatusEnum)
+
+
+def _entry_row(index: int, user_id, now: datetime) -> dict:
+    """Build the column values of one synthetic logbook entry."""
+    return {
+        "id": uuid.uuid4(),
+        "user_id": user_id,
+        "start_date": date.today(),
+        "responsible_person": f"technician {index % 25}",
+        "location_id": 1 + index % 10,
+        "device": f"device {index % 200}",
+        "task": f"task {index % 12}",
+        "call_description": "Benchmark entry",
+        "status": STATUSES[index % len(STATUSES)],
+        "downtime_hours": (index % 9) / 2,
+        "created_at": now,
+        "updated_at": now,
+        "is_deleted": False,
+    }
+
+
+def seed(write_engine, rows: int):
+    """Create the schema and insert the initial entries."""
+    Base.metadata.create_all(write_engine)
+    user_id = uuid.uuid4()
+    now = datetime.now()
+    with write_engine.begin() as connection:
+        for start in range(0, rows, 1000):
+            connection.execute(
+                insert(LogbookEntry),
+                [_entry_row(i, user_id, now) for i in range(start, min(start + 1000, rows))],
+            )
+
+
+def _count_entries(connection) -> int:
+    """Count the stored entries."""
+    return connection.execute(select(func.count(LogbookEntry.id))).scalar()
+
+
+def run_mixed_load(read_engine, write_engine, readers: int, writers: int, seconds: float) -> dict:
+    """Run readers and writers concurrently for a fixed time.
+
+    Args:
+        read_engine: Engine the readers use
+        write_engine: Engine the writers use
+        readers: Number of reader threads
+        writers: Number of writer threads
+        seconds: Duration of the run
+
+    Returns:
+        dict: Reads and writes per second, failures and write verification
+    """
+    statement = select(LogbookEntry.status, func.count(LogbookEntry.id), func.avg(LogbookEntry.downtime_hours)).where(
+        LIVE_ENTRY_CONDITION
+    ).group_by(LogbookEntry.status)
+
+    with write_engine.connect() as connection:
+        initial_count = _count_entries(connection)
+
+    deadline = time.perf_counter() + seconds
+    lock = threading.Lock()
+    totals = {"reads": 0, "writes": 0, "failures": 0}
+    user_id = uuid.uuid4()
+
+    def read_loop():
+        reads = failures = 0
+        while time.perf_counter() < deadline:
+            try:
+                with read_engine.connect() as connection:
+                    connection.execute(statement).all()
+                reads += 1
+            except Exception:
+                failures += 1
+        with lock:
+            totals["reads"] += reads
+            totals["failures"] += failures
+
+    def write_loop(worker: int):
+        writes = failures = 0
+        while time.perf_counter() < deadline:
+            try:
+                with write_engine.begin() as connection:
+                    connection.execute(insert(LogbookEntry), [_entry_row(worker, user_id, datetime.now())])
+                writes += 1
+            except Exception:
+                failures += 1
+        with lock:
+            totals["writes"] += writes
+            totals["failures"] += failures
+
+    threads = [threading.Thread(target=read_loop) for _ in range(readers)]
+    threads += [threading.Thread(target=write_loop, args=(worker,)) for worker in range(writers)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    with write_engine.connect() as connection:
+        final_count = _count_entries(connection)
+    return {
+        "reads_per_second": totals["reads"] / elapsed,
+        "writes_per_second": totals["writes"] / elapsed,
+        "failures": totals["failures"],
+        "writes_verified": final_count - initial_count == totals["writes"],
+    }
+
+
+def build_engines(mode: str, url: str) -> tuple:
+    """Create the (read engine, write engine) pair of a benchmark mode."""
+    if mode == "profile":
+        return create_db_engine(url, read_only=True), create_db_engine(url)
+    default_engine = create_engine(url, connect_args={"check_same_thread": False})
+    return default_engine, default_engine
+
+
+def main(rows: int, reader_counts: list, writers: int, seconds: float):
+    """Benchmark both modes on scratch databases and print the results."""
+    print(f"{rows} seeded entries, {writers} writer threads, {seconds:g}s per run, {os.cpu_count()} CPUs")
+    with tempfile.TemporaryDirectory(prefix="logbook_sqlite_benchmark_") as work_dir:
+        for mode in ("default", "profile"):
+            url = f"sqlite:///{os.path.join(work_dir, mode + '.db')}"
+            read_engine, write_engine = build_engines(mode, url)
+            seed(write_engine, rows)
+            for readers in reader_counts:
+                result = run_mixed_load(read_engine, write_engine, readers, writers, seconds)
+                print(
+                    f"{mode:<8} readers {readers:>2}   "
+                    f"{result['reads_per_second']:8.1f} reads/s   {result['writes_per_second']:8.1f} writes/s   "
+                    f"failures {result['failures']:>4}   writes verified {result['writes_verified']}"
+                )
+            read_engine.dispose()
+            write_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark concurrent SQLite reads and writes")
+    parser.add_argument("--rows", type=int, default=20000, help="Entries seeded before the runs")
+    parser.add_argument("--readers", type=int, nargs="+", default=[1, 2, 4, 8], help="Reader thread counts")
+    parser.add_argument("--writers", type=int, default=2, help="Writer threads")
+    parser.add_argument("--seconds", type=float, default=5, help="Duration of each run")
+    args = parser.parse_args()
+
+    main(args.rows, args.readers, args.writers, args.seconds)
@@ -1,6 +1,9 @@
-from sqlalchemy import create_engine
+from sqlalchemy import DateTime, String, create_engine, event, func, type_coerce, update
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.sql.dml import UpdateBase
 import os
 from dotenv import load_dotenv
 
@@ -8,7 +11,10 @@ from dotenv import load_dotenv
 
 This module provides:
 - Database engine configuration
-- Session factory creation
+- A SQLite profile: WAL journaling and tuned pragmas on every connection,
+  a pool of read-only connections and a single writer connection
+- Session factory creation, routing reads and writes to those engines
+- Async engine and session factory for the FastAPI routers
 - Base class for SQLAlchemy models
 - Database session dependency injection
 """
@@ -20,22 +26,228 @@ load_dotenv()
 # Changed from PostgreSQL to SQLite for easier local development
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./preventplus.db")
 
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+"""How long a SQLite statement waits for a lock before failing with "database is locked"."""
+
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+"""Bytes of the database file memory-mapped per connection (default: 256MB)."""
+
+SQLITE_CACHE_SIZE_KB = int(os.getenv("SQLITE_CACHE_SIZE_KB", "65536"))
+"""Page cache per connection in KiB (default: 64MB)."""
+
+SQLITE_READ_POOL_SIZE = int(os.getenv("SQLITE_READ_POOL_SIZE", "5"))
+"""Read-only connections kept open (up to 10 more are opened under load)."""
+
+SQLITE_WRITE_TIMEOUT = float(os.getenv("SQLITE_WRITE_TIMEOUT", "30"))
+"""Seconds a session waits for the writer connection before raising TimeoutError."""
+
+
+def _is_sqlite_file(url: str) -> bool:
+    """Whether a URL points to an on-disk SQLite database (not :memory:)."""
+    parsed = make_url(url)
+    return parsed.get_backend_name() == "sqlite" and parsed.database not in (None, "", ":memory:")
+
+
+def _configure_sqlite_connection(dbapi_connection, read_only: bool = False):
+    """Apply the production pragmas to a new SQLite connection.
+
+    Args:
+        dbapi_connection: Raw DBAPI connection
+        read_only: Reject writes on this connection (PRAGMA query_only)
+    """
+    cursor = dbapi_connection.cursor()
+    try:
+        if not read_only:
+            # Persistent in the database file; readers then never block the writer
+            cursor.execute("PRAGMA journal_mode=WAL")
+        # Durable at every checkpoint; commits in WAL mode no longer fsync
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}")
+        cursor.execute(f"PRAGMA mmap_size={SQLITE_MMAP_SIZE}")
+        cursor.execute(f"PRAGMA cache_size=-{SQLITE_CACHE_SIZE_KB}")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        if read_only:
+            cursor.execute("PRAGMA query_only=ON")
+    finally:
+        cursor.close()
+
+
+def create_db_engine(url: str, read_only: bool = False):
+    """Create an engine, applying the SQLite profile to on-disk SQLite databases.
+
+    A SQLite engine for writing holds a single connection, so writers queue in
+    the pool instead of failing on SQLite's database lock. A read-only engine
+    pools several connections that read concurrently under WAL.
+
+    Args:
+        url: SQLAlchemy database URL
+        read_only: Create the read-only pool instead of the writer
+
+    Returns:
+        Engine: The configured engine
+    """
+    if not _is_sqlite_file(url):
+        connect_args = {"check_same_thread": False} if make_url(url).get_backend_name() == "sqlite" else {}
+        return create_engine(url, connect_args=connect_args)
+
+    connect_args = {"check_same_thread": False, "timeout": SQLITE_BUSY_TIMEOUT_MS / 1000}
+    if read_only:
+        new_engine = create_engine(url, connect_args=connect_args, pool_size=SQLITE_READ_POOL_SIZE, max_overflow=10)
+    else:
+        new_engine = create_engine(
+            url, connect_args=connect_args, pool_size=1, max_overflow=0, pool_timeout=SQLITE_WRITE_TIMEOUT
+        )
+
+    @event.listens_for(new_engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        _configure_sqlite_connection(dbapi_connection, read_only=read_only)
+
+    return new_engine
+
+
 # Create SQLAlchemy engine
-engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
+engine = create_db_engine(DATABASE_URL)
 """SQLAlchemy engine instance for database connectivity.
 
 Configured with:
 - DATABASE_URL from environment variables (defaults to SQLite)
 - check_same_thread=False for SQLite compatibility
+- For SQLite files: WAL and the pragmas above, and a single serialized
+  connection used for every write
 """
+
+read_engine = create_db_engine(DATABASE_URL, read_only=True) if _is_sqlite_file(DATABASE_URL) else engine
+"""Engine for reads: a pool of read-only connections for SQLite files, else the main engine."""
+
+
+_read_engines = {engine: read_engine} if read_engine is not engine else {}
+"""{writer engine: read-only engine} pairs RoutingSession routes between."""
+
+
+class RoutingSession(Session):
+    """Session sending reads to a read-only engine and writes to its writer engine.
+
+    A transaction switches to the writer at its first flush or DML statement
+    and stays there until it ends, so it reads its own uncommitted changes.
+    Sessions bound to the main engine read through read_engine; the async
+    sessions (through their sync session) read through async_read_engine.
+    Sessions bound to any other engine are not routed.
+
+    The writer is a single connection: a thread must not open a second
+    writing session while its first one still has an open write transaction.
+    """
+
+    def use_writer(self):
+        """Run the current (or next) transaction on the writer from its first statement."""
+        self.info["writing"] = True
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        reader = _read_engines.get(self.bind)
+        if reader is None:
+            return super().get_bind(mapper=mapper, clause=clause, **kwargs)
+        if self._flushing or isinstance(clause, UpdateBase) or self.info.get("writing"):
+            self.info["writing"] = True
+            return self.bind
+        return reader
+
+
+@event.listens_for(RoutingSession, "after_transaction_end")
+def _release_writer(session, transaction):
+    """Route the session's next transaction to the readers again."""
+    if transaction.parent is None:
+        session.info.pop("writing", None)
+
+
 # Create session factory
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+SessionLocal = sessionmaker(class_=RoutingSession, autocommit=False, autoflush=False, bind=engine)
 """Session factory for creating database sessions.
 
 Configured with:
 - autocommit=False for explicit transaction control
 - autoflush=False to prevent automatic flushes
-- Bound to the configured engine
+- Bound to the configured engine (reads use read_engine, see RoutingSession)
+"""
+
+
+def _async_database_url(url: str) -> str:
+    """Map a synchronous database URL to the matching asyncio driver.
+
+    Args:
+        url: SQLAlchemy database URL (e.g. 'sqlite:///./preventplus.db')
+
+    Returns:
+        str: The URL using aiosqlite (SQLite) or asyncpg (PostgreSQL)
+    """
+    scheme, separator, rest = url.partition("://")
+    backend = scheme.split("+")[0]
+    async_drivers = {"sqlite": "sqlite+aiosqlite", "postgresql": "postgresql+asyncpg", "postgres": "postgresql+asyncpg"}
+    return async_drivers.get(backend, scheme) + separator + rest
+
+
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL", _async_database_url(DATABASE_URL))
+
+
+def create_async_db_engine(url: str, read_only: bool = False):
+    """Create an async engine, applying the SQLite profile to on-disk SQLite databases.
+
+    Pools like create_db_engine: a single writer connection, or a pool of
+    read-only connections.
+
+    Args:
+        url: SQLAlchemy async database URL
+        read_only: Create the read-only pool instead of the writer
+
+    Returns:
+        AsyncEngine: The configured engine
+
+    Raises:
+        ImportError: If the async driver is not installed
+    """
+    if not _is_sqlite_file(url):
+        return create_async_engine(url)
+
+    if read_only:
+        new_engine = create_async_engine(url, pool_size=SQLITE_READ_POOL_SIZE, max_overflow=10)
+    else:
+        new_engine = create_async_engine(url, pool_size=1, max_overflow=0, pool_timeout=SQLITE_WRITE_TIMEOUT)
+
+    @event.listens_for(new_engine.sync_engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        _configure_sqlite_connection(dbapi_connection, read_only=read_only)
+
+    return new_engine
+
+
+# Create async engines and session factory (optional: needs aiosqlite or asyncpg)
+try:
+    async_engine = create_async_db_engine(ASYNC_DATABASE_URL)
+except ImportError:
+    async_engine = None
+"""SQLAlchemy AsyncEngine used by the FastAPI routers, or None without an async driver.
+
+For SQLite files it is the async sessions' single writer connection.
+"""
+
+if async_engine is not None and _is_sqlite_file(ASYNC_DATABASE_URL):
+    async_read_engine = create_async_db_engine(ASYNC_DATABASE_URL, read_only=True)
+    _read_engines[async_engine.sync_engine] = async_read_engine.sync_engine
+else:
+    async_read_engine = async_engine
+"""Async engine for reads: a pool of read-only connections for SQLite files, else async_engine."""
+
+AsyncSessionLocal = async_sessionmaker(
+    async_engine,
+    # Reuse SessionLocal's session class so flush event hooks registered on it also run here
+    sync_session_class=SessionLocal.class_,
+    autoflush=False,
+    expire_on_commit=False,
+) if async_engine is not None else None
+"""Async session factory.
+
+Configured with:
+- autoflush=False, matching SessionLocal
+- expire_on_commit=False so committed objects can be serialized without lazy IO
+- Session event hooks and read/write routing shared with SessionLocal
 """
 # Create base class for models
 Base = declarative_base()
@@ -62,3 +274,64 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    """Dependency generator for async database sessions.
+
+    Yields:
+        AsyncSession: An async database session instance
+
+    Raises:
+        RuntimeError: If no async driver (aiosqlite / asyncpg) is installed
+
+    Usage:
+        db: AsyncSession = Depends(get_async_db)
+    """
+    if AsyncSessionLocal is None:
+        raise RuntimeError("Async database access requires aiosqlite (SQLite) or asyncpg (PostgreSQL)")
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def normalize_sqlite_timestamps(bind, table):
+    """Give SQLite timestamps stored without fractional seconds a zero fraction.
+
+    CURRENT_TIMESTAMP (func.now()) stores 'YYYY-MM-DD HH:MM:SS', while bound
+    datetimes read 'YYYY-MM-DD HH:MM:SS.ffffff'. SQLite compares them as text,
+    so a keyset cursor taken from such a row sorts after the row itself and
+    the same page is returned again. Does nothing on other databases.
+
+    Args:
+        bind: Engine to use
+        table: Table whose DateTime columns are rewritten
+
+    Returns:
+        int: Number of values rewritten
+    """
+    if bind.dialect.name != "sqlite":
+        return 0
+    rewritten = 0
+    with bind.begin() as connection:
+        for column in table.columns:
+            if isinstance(column.type, DateTime):
+                result = connection.execute(
+                    update(table).where(func.length(column) == 19).values({column: type_coerce(column, String) + ".000000"})
+                )
+                rewritten += result.rowcount
+    return rewritten
+
+
+def create_missing_indexes(bind=None):
+    """Create indexes declared on models that are missing from existing tables.
+
+    Base.metadata.create_all only creates indexes together with new tables,
+    so indexes added to an existing model are created here instead.
+
+    Args:
+        bind: Engine to use (defaults to the application engine)
+    """
+    bind = bind or engine
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=bind, checkfirst=True)
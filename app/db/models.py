@@ -1,6 +1,6 @@
 import uuid
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Text, Float, Boolean, DateTime, ForeignKey, Enum, Date, JSON
+from sqlalchemy import Column, Integer, String, Text, Float, Boolean, DateTime, ForeignKey, Enum, Date, JSON, Index, or_
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -82,7 +82,8 @@ class User(Base):
     locations = relationship("Location", back_populates="created_by")
     categories = relationship("Category", back_populates="created_by")
     settings = relationship("Setting", back_populates="updated_by")
-    audit_logs = relationship("AuditLog", back_populates="user")
+    # Audit records outlive their user and are stored in read-only partitions
+    audit_logs = relationship("AuditLog", back_populates="user", passive_deletes="all")
 
 
 class LogbookEntry(Base):
@@ -111,6 +112,12 @@ class LogbookEntry(Base):
     """
 
     __tablename__ = "logbook_entries"
+    __table_args__ = (
+        # Keyset pagination seeks on (created_at, id), optionally scoped to one user or status
+        Index("ix_logbook_entries_created_at_id", "created_at", "id"),
+        Index("ix_logbook_entries_user_created_at_id", "user_id", "created_at", "id"),
+        Index("ix_logbook_entries_status_created_at_id", "status", "created_at", "id"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
@@ -127,8 +134,10 @@ class LogbookEntry(Base):
     downtime_hours = Column(Float)
     category_id = Column(Integer, ForeignKey("categories.id"))
     priority = Column(Enum(PriorityEnum), default=PriorityEnum.MEDIUM)
-    created_at = Column(DateTime, default=func.now())
-    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+    # Python timestamps: SQLite's CURRENT_TIMESTAMP drops the fractional seconds
+    # that bound datetimes carry, which breaks text comparisons in keyset pagination
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     completed_by_id = Column(UUID(as_uuid=True), ForeignKey("users.id"))
     is_deleted = Column(Boolean, default=False)
 
@@ -140,6 +149,39 @@ class LogbookEntry(Base):
     attachments = relationship("Attachment", back_populates="entry")
 
 
+LIVE_ENTRY_CONDITION = or_(LogbookEntry.is_deleted == False, LogbookEntry.is_deleted == None)
+"""Filter selecting logbook entries that are not soft deleted.
+
+Also used as the predicate of the partial indexes below; SQLite and PostgreSQL
+both use those indexes for queries filtering on either this condition or
+LogbookEntry.is_deleted == False.
+"""
+
+
+def _live_entry_index(name, *columns):
+    """Declare an index on logbook_entries restricted to non-deleted rows.
+
+    Backends without partial index support create a regular index instead.
+    """
+    return Index(
+        name,
+        *columns,
+        sqlite_where=LIVE_ENTRY_CONDITION,
+        postgresql_where=LIVE_ENTRY_CONDITION,
+    )
+
+
+# Filters and groupings used by the entry API, dashboard and report charts
+_live_entry_index("ix_logbook_entries_live_start_date", LogbookEntry.start_date)
+_live_entry_index("ix_logbook_entries_live_location_created_at", LogbookEntry.location_id, LogbookEntry.created_at)
+_live_entry_index("ix_logbook_entries_live_device", LogbookEntry.device)
+# Report filters on task or technician, optionally with a created_at range (also serves grouping by task)
+_live_entry_index("ix_logbook_entries_live_task_created_at", LogbookEntry.task, LogbookEntry.created_at)
+_live_entry_index(
+    "ix_logbook_entries_live_responsible_created_at", LogbookEntry.responsible_person, LogbookEntry.created_at
+)
+
+
 class Attachment(Base):
     """Attachment model for logbook entry files.
 
@@ -268,6 +310,10 @@ class Setting(Base):
 class AuditLog(Base):
     """Audit log model for tracking system actions.
 
+    audit_logs is a view over monthly partition tables (see
+    app.services.audit_partition_service); records are inserted through the
+    audit sink, not through the ORM.
+
     Attributes:
         id: UUID primary key
         user_id: Acting user reference
@@ -403,3 +449,94 @@ class ReportSchedule(Base):
     # Relationships
     report = relationship("Report", back_populates="schedules")
     created_by = relationship("User")
+
+
+class LogbookDailyRollup(Base):
+    """Daily rollup of non-deleted logbook entries for dashboard statistics.
+
+    Maintained incrementally by flush hooks in app.services.rollup_service.
+    Key columns use 0 / '' instead of NULL so they can form the primary key.
+
+    Attributes:
+        day: Entry creation date
+        location_id: Location reference
+        category_id: Category reference (0 when uncategorized)
+        status: Entry status value
+        priority: Entry priority value ('' when unset)
+        entry_count: Number of entries
+        downtime_hours: Summed downtime hours
+        resolved_count: Number of entries with a resolution time
+        resolution_minutes: Summed resolution time in minutes
+    """
+
+    __tablename__ = "logbook_daily_rollup"
+
+    day = Column(Date, primary_key=True)
+    location_id = Column(Integer, primary_key=True)
+    category_id = Column(Integer, primary_key=True, default=0)
+    status = Column(String(20), primary_key=True)
+    priority = Column(String(20), primary_key=True, default="")
+    entry_count = Column(Integer, nullable=False, default=0)
+    downtime_hours = Column(Float, nullable=False, default=0)
+    resolved_count = Column(Integer, nullable=False, default=0)
+    resolution_minutes = Column(Float, nullable=False, default=0)
+
+
+class DataVersion(Base):
+    """Change counter of a table, bumped by every flush that writes its rows.
+
+    Maintained by flush hooks in app.services.artifact_service, whose report
+    cache keys include it.
+
+    Attributes:
+        table_name: Counted table
+        version: Number of committed flushes that changed the table
+    """
+
+    __tablename__ = "data_versions"
+
+    table_name = Column(String(100), primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+
+
+class Job(Base):
+    """Background job record for long-running UI operations.
+
+    Written by app.services.job_service so finished artifacts can be found
+    again after a restart.
+
+    Attributes:
+        id: UUID primary key
+        kind: Job type (e.g. export_pdf, generate_report)
+        status: queued, running, completed, failed or cancelled
+        progress_done: Units of work done
+        progress_total: Units of work in total (if known)
+        message: Last progress or completion message
+        result_path: Path of the produced artifact, if any
+        error: Error message of a failed job
+        created_by_id: Submitting user reference
+        created_at: Submission timestamp
+        started_at: Start timestamp
+        finished_at: Completion timestamp
+    """
+
+    __tablename__ = "jobs"
+    __table_args__ = (
+        Index("ix_jobs_created_by_created_at", "created_by_id", "created_at"),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    kind = Column(String(50), nullable=False)
+    status = Column(String(20), nullable=False, default="queued")
+    progress_done = Column(Integer, default=0)
+    progress_total = Column(Integer)
+    message = Column(Text)
+    result_path = Column(String(255))
+    error = Column(Text)
+    created_by_id = Column(UUID(as_uuid=True), ForeignKey("users.id"))
+    created_at = Column(DateTime, default=func.now())
+    started_at = Column(DateTime)
+    finished_at = Column(DateTime)
+
+    # Relationships
+    created_by = relationship("User")
@@ -1,4 +1,4 @@
-from typing import Optional, List
+from typing import Any, Optional, List
 from uuid import UUID
 from datetime import date, datetime
 from pydantic import BaseModel, Field
@@ -162,6 +162,60 @@ class LogbookEntry(LogbookEntryBase):
         orm_mode = True
 
 
+class LogbookEntryPage(BaseModel):
+    """Schema for one page of a cursor-paginated entry listing.
+
+    Fields:
+        items: Entries on this page, newest first
+        next_cursor: Opaque cursor for the next page (None on the last page)
+    """
+    items: List[LogbookEntry]
+    next_cursor: Optional[str] = None
+
+
+class FieldChange(BaseModel):
+    """Schema for one changed field of a history event.
+
+    Fields:
+        field: Name of the changed entry field
+        old: Previous value (None if empty or not recorded)
+        new: New value
+    """
+    field: str
+    old: Optional[Any] = None
+    new: Optional[Any] = None
+
+
+class EntryHistoryEvent(BaseModel):
+    """Schema for one event of an entry's change history.
+
+    Fields:
+        id: Audit log record ID
+        action: Performed action (create, update, status_update, delete, attachment_added)
+        created_at: Event timestamp
+        user_id: Acting user ID
+        user_name: Full name of the acting user (None if the user was deleted)
+        changes: Field-level changes made by the event
+    """
+    id: UUID
+    action: str
+    created_at: datetime
+    user_id: UUID
+    user_name: Optional[str] = None
+    changes: List[FieldChange] = []
+
+
+class EntryHistoryPage(BaseModel):
+    """Schema for one page of an entry's change history.
+
+    Fields:
+        items: Events on this page, newest first
+        next_cursor: Opaque cursor for the next page (None on the last page)
+    """
+    items: List[EntryHistoryEvent]
+    next_cursor: Optional[str] = None
+
+
 class LogbookEntryDetail(LogbookEntry):
     """Extended logbook entry schema with related data.
 
@@ -0,0 +1,277 @@
+import hashlib
+import json
+import os
+import shutil
+import threading
+from datetime import date, datetime
+from pathlib import Path
+from dotenv import load_dotenv
+from sqlalchemy import event, func, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.db.models import LIVE_ENTRY_CONDITION, Category, DataVersion, Location, LogbookEntry
+
+"""Content-addressed cache of generated report files.
+
+This module provides:
+- Cache keys hashed from the normalized report parameters, the output format,
+  the change counters of the tables a report reads and a fingerprint of the
+  matching rows and the locations and categories they reference (max
+  updated_at and row count of each)
+- Flush hooks bumping the change counter (data_versions) of every versioned
+  table a transaction writes
+- Reuse of a cached file when nothing in the report's range has changed
+- LRU eviction (by last use) under a configurable disk budget
+
+The change counters catch edits made within the timestamp resolution (one
+second for CURRENT_TIMESTAMP on SQLite). The fingerprint still catches bulk
+query.update()/query.delete() calls, which bypass the flush hooks; row counts
+are part of it because hard deletes do not leave an updated_at behind.
+
+Usage:
+    python -m app.services.artifact_service stats
+    python -m app.services.artifact_service clear
+"""
+
+# Load environment variables
+load_dotenv()
+
+REPORT_CACHE_DIR = os.getenv("REPORT_CACHE_DIR", "./static/report_cache")
+"""Directory holding cached report files."""
+
+REPORT_CACHE_MAX_BYTES = int(os.getenv("REPORT_CACHE_MAX_BYTES", str(500 * 1024 * 1024)))
+"""Disk budget of the cache (default: 500MB)."""
+
+VERSIONED_MODELS = (LogbookEntry, Location, Category)
+"""Models whose tables' change counters are part of every cache key."""
+
+_lock = threading.Lock()
+
+
+def normalize_parameters(parameters: dict = None) -> dict:
+    """Normalize report parameters so equivalent filter sets hash equally.
+
+    Drops unset values and converts dates to ISO strings.
+
+    Args:
+        parameters: Report filter parameters
+
+    Returns:
+        dict: Normalized parameters
+    """
+    normalized = {}
+    for key, value in (parameters or {}).items():
+        if value is None or value == "" or value == []:
+            continue
+        if isinstance(value, (date, datetime)):
+            value = value.isoformat()
+        elif isinstance(value, str):
+            value = value.strip()
+        normalized[str(key)] = value
+    return normalized
+
+
+def bump_data_versions(connection, table_names):
+    """Increment the change counters of tables in the current transaction.
+
+    Args:
+        connection: Connection bound to the writing transaction
+        table_names: Names of the changed tables
+    """
+    insert = postgresql.insert if connection.dialect.name == "postgresql" else sqlite.insert
+    statement = insert(DataVersion).values([{"table_name": name, "version": 1} for name in sorted(table_names)])
+    connection.execute(statement.on_conflict_do_update(
+        index_elements=[DataVersion.table_name],
+        set_={"version": DataVersion.version + 1},
+    ))
+
+
+def data_versions(session) -> dict:
+    """Read the change counters of the versioned tables.
+
+    Args:
+        session: Database session
+
+    Returns:
+        dict: {table name: version}; tables never written are missing
+    """
+    names = [model.__tablename__ for model in VERSIONED_MODELS]
+    statement = select(DataVersion.table_name, DataVersion.version).where(DataVersion.table_name.in_(names))
+    return dict(session.execute(statement).all())
+
+
+@event.listens_for(Session, "after_flush")
+def _bump_versions_on_flush(session, flush_context):
+    """Bump the change counters of the versioned tables a flush wrote."""
+    table_names = {
+        instance.__tablename__
+        for instance in (*session.new, *session.dirty, *session.deleted)
+        if isinstance(instance, VERSIONED_MODELS)
+    }
+    if table_names:
+        bump_data_versions(session.connection(), table_names)
+
+
+def artifact_key(session, parameters: dict, file_format: str, filters=None) -> str:
+    """Compute the cache key of a report.
+
+    Args:
+        session: Database session
+        parameters: Report filter parameters (describing filters)
+        file_format: Output format, e.g. "pdf"
+        filters: Optional list of extra SQLAlchemy filter expressions selecting the report's rows
+
+    Returns:
+        str: Hex digest identifying the report content
+    """
+    statement = (
+        select(
+            func.max(LogbookEntry.updated_at),
+            func.count(LogbookEntry.id),
+            func.max(Location.updated_at),
+            func.count(func.distinct(Location.id)),
+            func.max(Category.updated_at),
+            func.count(func.distinct(Category.id)),
+        )
+        .select_from(LogbookEntry)
+        .outerjoin(Location, LogbookEntry.location_id == Location.id)
+        .outerjoin(Category, LogbookEntry.category_id == Category.id)
+        .where(LIVE_ENTRY_CONDITION)
+    )
+    for condition in filters or []:
+        statement = statement.where(condition)
+    fingerprint = session.execute(statement).one()
+
+    payload = json.dumps(
+        {
+            "parameters": normalize_parameters(parameters),
+            "format": file_format.lower(),
+            "versions": data_versions(session),
+            "fingerprint": [value.isoformat() if isinstance(value, datetime) else value for value in fingerprint],
+        },
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _artifact_path(key: str, file_format: str) -> str:
+    """Return the cache path of an artifact."""
+    return os.path.join(REPORT_CACHE_DIR, f"{key}.{file_format.lower()}")
+
+
+def cached_report(session, file_path: str, file_format: str, render, parameters: dict = None, filters=None) -> bool:
+    """Write a report to a path, reusing a cached file when the content is unchanged.
+
+    Args:
+        session: Database session
+        file_path: Destination path
+        file_format: Output format, used as the cached file's extension
+        render: Callable(path) writing the report to a path (called on a miss)
+        parameters: Report filter parameters (part of the key)
+        filters: Optional list of extra SQLAlchemy filter expressions selecting the report's rows
+
+    Returns:
+        bool: True if the report came from the cache
+    """
+    key = artifact_key(session, parameters, file_format, filters)
+    cache_path = _artifact_path(key, file_format)
+    same_file = os.path.abspath(file_path) == os.path.abspath(cache_path)
+
+    with _lock:
+        hit = os.path.exists(cache_path)
+        if hit:
+            # Mark as recently used for the LRU eviction
+            os.utime(cache_path)
+            if not same_file:
+                shutil.copyfile(cache_path, file_path)
+    if hit:
+        return True
+
+    Path(REPORT_CACHE_DIR).mkdir(parents=True, exist_ok=True)
+    # Render next to the cache entry, keeping the extension some writers expect
+    partial_path = os.path.join(REPORT_CACHE_DIR, f"{key}.{threading.get_ident()}.part.{file_format.lower()}")
+    try:
+        render(partial_path)
+        with _lock:
+            os.replace(partial_path, cache_path)
+            if not same_file:
+                shutil.copyfile(cache_path, file_path)
+    finally:
+        if os.path.exists(partial_path):
+            os.remove(partial_path)
+    evict()
+    return False
+
+
+def _cached_files() -> list:
+    """List cached files as (last use, size, path), least recently used first."""
+    if not os.path.isdir(REPORT_CACHE_DIR):
+        return []
+    files = []
+    for entry in os.scandir(REPORT_CACHE_DIR):
+        if entry.is_file() and ".part." not in entry.name:
+            stat = entry.stat()
+            files.append((stat.st_mtime, stat.st_size, entry.path))
+    return sorted(files)
+
+
+def evict(max_bytes: int = None) -> int:
+    """Remove least recently used artifacts until the cache fits its budget.
+
+    Args:
+        max_bytes: Disk budget (default: REPORT_CACHE_MAX_BYTES)
+
+    Returns:
+        int: Number of files removed
+    """
+    max_bytes = REPORT_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+    removed = 0
+    with _lock:
+        files = _cached_files()
+        total = sum(size for _, size, _ in files)
+        for _, size, path in files:
+            if total <= max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError as ex:
+                print(f"Error evicting cached report {path}: {ex}")
+                continue
+            total -= size
+            removed += 1
+    return removed
+
+
+def cache_stats() -> dict:
+    """Summarize the cache contents.
+
+    Returns:
+        dict: File count, total bytes and budget
+    """
+    files = _cached_files()
+    return {
+        "files": len(files),
+        "bytes": sum(size for _, size, _ in files),
+        "max_bytes": REPORT_CACHE_MAX_BYTES,
+    }
+
+
+if __name__ == "__main__":
+    """Command line entry point for report cache maintenance.
+
+    Usage:
+        python -m app.services.artifact_service stats
+        python -m app.services.artifact_service clear
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Inspect or clear the report artifact cache")
+    parser.add_argument("command", choices=["stats", "clear"], help="Cache command to run")
+    args = parser.parse_args()
+
+    if args.command == "clear":
+        print(f"Removed {evict(0)} cached reports")
+    stats = cache_stats()
+    print(f"{stats['files']} cached reports, {stats['bytes'] / 1048576:.1f} of {stats['max_bytes'] / 1048576:.0f} MB")
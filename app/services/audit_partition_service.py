@@ -0,0 +1,536 @@
+import gzip
+import json
+import os
+import re
+import threading
+import uuid
+from datetime import date, datetime, time
+from pathlib import Path
+from dotenv import load_dotenv
+from sqlalchemy import Column, Index, MetaData, Table, bindparam, column, false, func, insert, inspect, select, text, union_all
+
+from app.db.database import engine
+from app.db.models import AuditLog
+
+"""Monthly partitions of the audit log.
+
+This module provides:
+- One audit_logs_YYYY_MM table per month, indexed on created_at,
+  (entity_type, entity_id, created_at) and (user_id, created_at)
+- The audit_logs view (UNION ALL of the partitions) that the AuditLog model
+  reads, rebuilt whenever a partition is added or dropped
+- Routing of inserted rows to the partition of their created_at month
+- Queries that only read the partitions overlapping a time range
+- Keyset-paginated timelines of one entity, read through each partition's
+  (entity_type, entity_id, created_at) index
+- Retention: months older than AUDIT_RETENTION_MONTHS are compacted into
+  gzip-compressed JSONL archives in AUDIT_ARCHIVE_DIR and their tables dropped
+
+An audit_logs table from before partitioning (or one created by
+Base.metadata.create_all) is moved into partitions the first time the
+partitions are used.
+
+Usage:
+    python -m app.services.audit_partition_service list
+    python -m app.services.audit_partition_service compact [--retention-months 12]
+"""
+
+# Load environment variables
+load_dotenv()
+
+AUDIT_ARCHIVE_DIR = os.getenv("AUDIT_ARCHIVE_DIR", "./static/audit_archive")
+"""Directory holding the compressed archives of compacted months."""
+
+AUDIT_RETENTION_MONTHS = int(os.getenv("AUDIT_RETENTION_MONTHS", "12"))
+"""Months kept in the database, including the current one (0 keeps every month)."""
+
+VIEW_NAME = AuditLog.__tablename__
+_LEGACY_NAME = f"{VIEW_NAME}_legacy"
+_PARTITION_PATTERN = re.compile(rf"^{VIEW_NAME}_(\d{{4}})_(\d{{2}})$")
+_CHUNK = 500
+"""Ids looked up per statement when skipping stored rows."""
+
+_metadata = MetaData()
+_lock = threading.Lock()
+_ready = set()
+"""URLs of the databases whose partitions and view have been set up by this process."""
+
+_timeline_statements = {}
+"""{(partitioned months, seeks past a cursor): entity timeline statement}"""
+
+
+def audit_row_to_json(row: dict) -> str:
+    """Serialize an audit log row as one JSONL line (spool and archive format)."""
+    values = dict(row)
+    values["id"] = str(values["id"])
+    values["user_id"] = str(values["user_id"])
+    values["created_at"] = values["created_at"].isoformat()
+    return json.dumps(values, default=str)
+
+
+def audit_row_from_json(line: str) -> dict:
+    """Parse a JSONL line back into audit log column values."""
+    values = json.loads(line)
+    values["id"] = uuid.UUID(values["id"])
+    values["user_id"] = uuid.UUID(values["user_id"])
+    values["created_at"] = datetime.fromisoformat(values["created_at"])
+    return values
+
+
+def month_start(value) -> date:
+    """First day of the month of a date or datetime."""
+    return date(value.year, value.month, 1)
+
+
+def _add_months(month: date, months: int) -> date:
+    """First day of the month `months` after (or before) a month."""
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _as_datetime(value) -> datetime:
+    """Midnight of a date, or a datetime unchanged (None stays None)."""
+    if value is None or isinstance(value, datetime):
+        return value
+    return datetime.combine(value, time.min)
+
+
+def _overlaps(month: date, start: datetime = None, end: datetime = None) -> bool:
+    """Whether a month intersects the range [start, end)."""
+    return (start is None or _as_datetime(_add_months(month, 1)) > start) and (
+        end is None or _as_datetime(month) < end
+    )
+
+
+def partition_name(month: date) -> str:
+    """Table name of a month's partition."""
+    return f"{VIEW_NAME}_{month:%Y_%m}"
+
+
+def partition_table(month: date) -> Table:
+    """Table of a month's partition, with the audit log columns and indexes.
+
+    Partitions have no foreign key to users, so records outlive deleted users.
+    """
+    name = partition_name(month)
+    table = _metadata.tables.get(name)
+    if table is None:
+        columns = [
+            Column(column.name, column.type, primary_key=column.primary_key, nullable=column.nullable)
+            for column in AuditLog.__table__.columns
+        ]
+        table = Table(
+            name, _metadata, *columns,
+            Index(f"ix_{name}_created_at", "created_at"),
+            Index(f"ix_{name}_entity", "entity_type", "entity_id", "created_at"),
+            Index(f"ix_{name}_user", "user_id", "created_at"),
+        )
+    return table
+
+
+def archive_path(month: date, archive_dir: str = None) -> Path:
+    """Path of a month's compressed archive."""
+    return Path(archive_dir or AUDIT_ARCHIVE_DIR) / f"{partition_name(month)}.jsonl.gz"
+
+
+def list_partitions(connection) -> list:
+    """List the months that have a partition, oldest first.
+
+    Args:
+        connection: Database connection
+
+    Returns:
+        list: First day of each partitioned month
+    """
+    months = []
+    for name in inspect(connection).get_table_names():
+        match = _PARTITION_PATTERN.match(name)
+        if match:
+            months.append(date(int(match.group(1)), int(match.group(2)), 1))
+    return sorted(months)
+
+
+def _rebuild_view(connection):
+    """Recreate the audit_logs view over the existing partitions."""
+    months = list_partitions(connection)
+    if not months:
+        month = month_start(datetime.now())
+        partition_table(month).create(connection, checkfirst=True)
+        months = [month]
+    statement = union_all(*[select(*partition_table(month).c) for month in months])
+    sql = str(statement.compile(dialect=connection.dialect, compile_kwargs={"literal_binds": True}))
+    connection.execute(text(f"DROP VIEW IF EXISTS {VIEW_NAME}"))
+    connection.execute(text(f"CREATE VIEW {VIEW_NAME} AS {sql}"))
+
+
+def _migrate_legacy_table(connection):
+    """Move the rows of an audit_logs table into monthly partitions and drop it."""
+    connection.execute(text(f"ALTER TABLE {VIEW_NAME} RENAME TO {_LEGACY_NAME}"))
+    legacy = Table(_LEGACY_NAME, MetaData(), *[Column(c.name, c.type) for c in AuditLog.__table__.columns])
+    now = datetime.now()
+    first, last = connection.execute(select(func.min(legacy.c.created_at), func.max(legacy.c.created_at))).one()
+    month = month_start(first or now)
+    last_month = month_start(max(last or now, now))
+    while month <= last_month:
+        condition = [
+            legacy.c.created_at >= _as_datetime(month),
+            legacy.c.created_at < _as_datetime(_add_months(month, 1)),
+        ]
+        if month == month_start(now):
+            # Rows without a timestamp are kept in the current month
+            condition = [(legacy.c.created_at == None) | (condition[0] & condition[1])]
+            columns = [func.coalesce(legacy.c.created_at, now) if c.name == "created_at" else c for c in legacy.c]
+        elif connection.execute(select(legacy.c.id).where(*condition).limit(1)).first() is None:
+            month = _add_months(month, 1)
+            continue
+        else:
+            columns = list(legacy.c)
+        target = partition_table(month)
+        target.create(connection, checkfirst=True)
+        connection.execute(insert(target).from_select([c.name for c in legacy.c], select(*columns).where(*condition)))
+        month = _add_months(month, 1)
+    legacy.drop(connection)
+
+
+def _ensure(connection, force: bool = False):
+    """Set up the partitions and the view on first use for a database (caller holds the lock)."""
+    url = str(connection.engine.url)
+    if url in _ready and not force:
+        return
+    inspector = inspect(connection)
+    if VIEW_NAME in inspector.get_table_names():
+        _migrate_legacy_table(connection)
+        _rebuild_view(connection)
+    elif VIEW_NAME not in inspector.get_view_names():
+        _rebuild_view(connection)
+    _ready.add(url)
+
+
+def ensure_audit_partitions(bind=None):
+    """Create the audit_logs view over the partitions, migrating an old audit_logs table.
+
+    Args:
+        bind: Engine to use (defaults to the application engine)
+    """
+    bind = bind or engine
+    # Take the (single writer) connection before the lock, as inserts do
+    with bind.begin() as connection, _lock:
+        _ensure(connection, force=True)
+
+
+def _partition_for(connection, month: date) -> Table:
+    """Return a month's partition, creating it (and rebuilding the view) if needed.
+
+    Existence is checked on every call because another process may have
+    compacted the month since.
+    """
+    table = partition_table(month)
+    with _lock:
+        _ensure(connection)
+        if not connection.dialect.has_table(connection, table.name):
+            table.create(connection)
+            _rebuild_view(connection)
+    return table
+
+
+def insert_audit_rows(connection, rows: list, skip_existing: bool = False) -> int:
+    """Insert audit log rows into the partitions of their months.
+
+    Each partition receives its rows in one executemany.
+
+    Args:
+        connection: Connection of the caller's transaction
+        rows: Row dicts with id, user_id, created_at and the other AuditLog columns
+        skip_existing: Skip rows whose id is already stored (for replays and retries)
+
+    Returns:
+        int: Number of rows inserted
+    """
+    by_month = {}
+    for row in rows:
+        by_month.setdefault(month_start(row["created_at"]), []).append(row)
+
+    inserted = 0
+    for month, month_rows in sorted(by_month.items()):
+        table = _partition_for(connection, month)
+        if skip_existing:
+            missing = []
+            for start in range(0, len(month_rows), _CHUNK):
+                chunk = month_rows[start:start + _CHUNK]
+                stored = set(connection.execute(
+                    select(table.c.id).where(table.c.id.in_([row["id"] for row in chunk]))
+                ).scalars())
+                missing.extend(row for row in chunk if row["id"] not in stored)
+            month_rows = missing
+        if month_rows:
+            connection.execute(insert(table), month_rows)
+            inserted += len(month_rows)
+    return inserted
+
+
+def audit_log_query(connection, start: datetime = None, end: datetime = None, user_id=None,
+                    entity_type: str = None, entity_id: str = None, action: str = None):
+    """Build a select over the partitions overlapping a time range.
+
+    Partitions outside [start, end) are not read at all; the filters are
+    applied inside each partition so they can use its indexes. The result
+    has the AuditLog columns, so callers can add ordering, keyset conditions
+    and limits on `statement.selected_columns`.
+
+    Args:
+        connection: Database connection (used to list the partitions)
+        start: Optional inclusive lower bound on created_at
+        end: Optional exclusive upper bound on created_at
+        user_id: Optional acting user
+        entity_type: Optional entity type
+        entity_id: Optional entity ID
+        action: Optional action
+
+    Returns:
+        Select: Statement selecting the matching audit log rows
+    """
+    start, end = _as_datetime(start), _as_datetime(end)
+    selects = []
+    for month in list_partitions(connection):
+        if not _overlaps(month, start, end):
+            continue
+        table = partition_table(month)
+        conditions = []
+        if start is not None:
+            conditions.append(table.c.created_at >= start)
+        if end is not None:
+            conditions.append(table.c.created_at < end)
+        if user_id is not None:
+            conditions.append(table.c.user_id == user_id)
+        if entity_type is not None:
+            conditions.append(table.c.entity_type == entity_type)
+        if entity_id is not None:
+            conditions.append(table.c.entity_id == str(entity_id))
+        if action is not None:
+            conditions.append(table.c.action == action)
+        selects.append(select(*table.c).where(*conditions))
+
+    if not selects:
+        return select(*AuditLog.__table__.c).where(false())
+    partitions = selects[0] if len(selects) == 1 else union_all(*selects)
+    return select(partitions.subquery(VIEW_NAME))
+
+
+def read_archive(month: date, archive_dir: str = None):
+    """Yield the rows of a month's archive.
+
+    Args:
+        month: Archived month
+        archive_dir: Archive directory (default: AUDIT_ARCHIVE_DIR)
+
+    Yields:
+        dict: Audit log row
+    """
+    path = archive_path(month, archive_dir)
+    if not path.exists():
+        return
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield audit_row_from_json(line)
+
+
+def _timeline_statement(months: list, seek: bool):
+    """Build (once per partition set) the SQL of an entity timeline page.
+
+    Each partition contributes at most one page of rows, read in index order;
+    the partial pages are then merged. Rows are ordered and seeked like
+    app.utils.pagination.apply_keyset: (created_at, id) descending.
+    """
+    key = (tuple(months), seek)
+    statement = _timeline_statements.get(key)
+    if statement is not None:
+        return statement
+
+    names = ", ".join(c.name for c in AuditLog.__table__.columns)
+    condition = "entity_type = :entity_type AND entity_id = :entity_id"
+    if seek:
+        condition += " AND (created_at < :cursor_created_at OR (created_at = :cursor_created_at AND id < :cursor_id))"
+    order = "ORDER BY created_at DESC, id DESC LIMIT :limit"
+    branches = " UNION ALL ".join(
+        f"SELECT * FROM (SELECT {names} FROM {name} WHERE {condition} {order}) AS p{index}"
+        for index, name in enumerate(partition_name(month) for month in months)
+    )
+    table = AuditLog.__table__
+    statement = text(f"SELECT {names} FROM ({branches}) AS {VIEW_NAME} {order}")
+    if seek:
+        statement = statement.bindparams(
+            bindparam("cursor_created_at", type_=table.c.created_at.type),
+            bindparam("cursor_id", type_=table.c.id.type),
+        )
+    statement = statement.columns(*[column(c.name, c.type) for c in table.columns])
+    with _lock:
+        _timeline_statements[key] = statement
+    return statement
+
+
+def entity_timeline(connection, entity_type: str, entity_id, position=None, limit: int = 50) -> list:
+    """Fetch one page of an entity's audit log records, newest first.
+
+    The hot path of history lookups: its SQL is built once per partition set,
+    and each partition is searched through its (entity_type, entity_id,
+    created_at) index, so the cost does not grow with the size of the log.
+
+    Args:
+        connection: Database connection
+        entity_type: Audited entity type
+        entity_id: Audited entity ID
+        position: Optional (created_at, id) keyset position of the previous page's last row
+        limit: Maximum number of rows
+
+    Returns:
+        list: Rows with the AuditLog columns
+    """
+    months = list_partitions(connection)
+    if not months:
+        return []
+    params = {"entity_type": entity_type, "entity_id": str(entity_id), "limit": limit}
+    if position is not None:
+        params["cursor_created_at"], params["cursor_id"] = position
+    return connection.execute(_timeline_statement(months, position is not None), params).all()
+
+
+def query_audit_logs(bind=None, start: datetime = None, end: datetime = None, limit: int = None,
+                     include_archived: bool = False, **filters) -> list:
+    """Fetch audit log rows in a time range, newest first.
+
+    Args:
+        bind: Engine to use (defaults to the application engine)
+        start: Optional inclusive lower bound on created_at
+        end: Optional exclusive upper bound on created_at
+        limit: Optional maximum number of rows
+        include_archived: Also read the archives of compacted months in the range
+        **filters: user_id, entity_type, entity_id and/or action
+
+    Returns:
+        list: Row dicts
+    """
+    bind = bind or engine
+    start, end = _as_datetime(start), _as_datetime(end)
+    with bind.connect() as connection:
+        statement = audit_log_query(connection, start, end, **filters)
+        columns = statement.selected_columns
+        statement = statement.order_by(columns.created_at.desc(), columns.id.desc())
+        if limit is not None and not include_archived:
+            statement = statement.limit(limit)
+        rows = [dict(row) for row in connection.execute(statement).mappings()]
+        partitioned = set(list_partitions(connection))
+
+    if include_archived:
+        for month in archived_months():
+            if month in partitioned or not _overlaps(month, start, end):
+                continue
+            rows.extend(row for row in read_archive(month) if _matches(row, start, end, filters))
+        rows.sort(key=lambda row: (row["created_at"], str(row["id"])), reverse=True)
+        if limit is not None:
+            rows = rows[:limit]
+    return rows
+
+
+def _matches(row: dict, start: datetime, end: datetime, filters: dict) -> bool:
+    """Apply the query_audit_logs range and filters to an archived row."""
+    if (start is not None and row["created_at"] < start) or (end is not None and row["created_at"] >= end):
+        return False
+    for name, value in filters.items():
+        if value is not None and str(row.get(name)) != str(value):
+            return False
+    return True
+
+
+def archived_months(archive_dir: str = None) -> list:
+    """List the months that have an archive, oldest first."""
+    directory = Path(archive_dir or AUDIT_ARCHIVE_DIR)
+    if not directory.is_dir():
+        return []
+    months = []
+    for path in directory.glob(f"{VIEW_NAME}_*.jsonl.gz"):
+        match = _PARTITION_PATTERN.match(path.name[:-len(".jsonl.gz")])
+        if match:
+            months.append(date(int(match.group(1)), int(match.group(2)), 1))
+    return sorted(months)
+
+
+def compact_audit_partitions(bind=None, retention_months: int = None, archive_dir: str = None) -> list:
+    """Archive the months past retention and drop their partitions.
+
+    Rows are written to a gzip-compressed JSONL archive (merged with an
+    existing archive of the month, e.g. after late records were replayed),
+    and the partition is dropped in the same transaction that read it. The
+    current month is never compacted.
+
+    Args:
+        bind: Engine to use (defaults to the application engine)
+        retention_months: Months kept (default: AUDIT_RETENTION_MONTHS; 0 keeps every month)
+        archive_dir: Archive directory (default: AUDIT_ARCHIVE_DIR)
+
+    Returns:
+        list: (month, number of rows archived) per compacted month
+    """
+    bind = bind or engine
+    retention_months = AUDIT_RETENTION_MONTHS if retention_months is None else retention_months
+    if retention_months <= 0:
+        return []
+    cutoff = _add_months(month_start(datetime.now()), -(retention_months - 1))
+    ensure_audit_partitions(bind)
+
+    compacted = []
+    with bind.connect() as connection:
+        months = [month for month in list_partitions(connection) if month < cutoff]
+    for month in months:
+        table = partition_table(month)
+        path = archive_path(month, archive_dir)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_suffix(".tmp")
+        with bind.begin() as connection, _lock:
+            archived = 0
+            seen = set()
+            with gzip.open(temp_path, "wt", encoding="utf-8") as f:
+                for row in read_archive(month, archive_dir):
+                    seen.add(row["id"])
+                    f.write(audit_row_to_json(row) + "\n")
+                result = connection.execute(select(*table.c).order_by(table.c.created_at, table.c.id))
+                for row in result.mappings():
+                    if row["id"] in seen:
+                        continue
+                    f.write(audit_row_to_json(row) + "\n")
+                    archived += 1
+            os.replace(temp_path, path)
+            table.drop(connection)
+            _rebuild_view(connection)
+        compacted.append((month, archived))
+    return compacted
+
+
+if __name__ == "__main__":
+    """Command line entry point for audit log partition maintenance.
+
+    Usage:
+        python -m app.services.audit_partition_service list
+        python -m app.services.audit_partition_service compact [--retention-months 12]
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Manage the monthly audit log partitions")
+    parser.add_argument("command", choices=["list", "compact"], help="Command to run")
+    parser.add_argument("--retention-months", type=int, default=None,
+                        help=f"Months kept in the database (default: {AUDIT_RETENTION_MONTHS})")
+    args = parser.parse_args()
+
+    if args.command == "list":
+        ensure_audit_partitions()
+        with engine.connect() as connection:
+            for month in list_partitions(connection):
+                table = partition_table(month)
+                count = connection.execute(select(func.count()).select_from(table)).scalar()
+                print(f"{table.name:<22} {count:>9} rows")
+        for month in archived_months():
+            path = archive_path(month)
+            print(f"{path.name:<32} {path.stat().st_size:>9} bytes (archived)")
+    else:
+        for month, archived in compact_audit_partitions(retention_months=args.retention_months):
+            print(f"Archived {archived} records of {month:%Y-%m} to {archive_path(month)}")
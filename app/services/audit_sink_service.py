@@ -0,0 +1,429 @@
+import atexit
+import os
+import threading
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+from dotenv import load_dotenv
+
+from app.db.database import engine
+from app.services.audit_partition_service import audit_row_from_json, audit_row_to_json, insert_audit_rows
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+"""Batched write-behind sink for audit log records.
+
+This module provides:
+- An in-memory queue of AuditLog rows, inserted into their monthly
+  partitions with one executemany per partition and batch once
+  AUDIT_FLUSH_BATCH records are pending or AUDIT_FLUSH_INTERVAL_MS has
+  passed since the first of them
+- A durable append-only JSONL spool: every record is written to the current
+  spool segment before it is queued, and a segment is deleted only after its
+  batch has committed
+- Replay of spool segments left behind by a crash or a failed flush, skipping
+  records that are already stored
+
+Each record gets its id and created_at when it is recorded, so replaying a
+segment whose batch did commit inserts nothing twice. Recording writes to
+the spool file and blocks; async callers run it on a worker thread.
+
+A sink holds an exclusive lock (flock, or msvcrt.locking on Windows) on each
+of its segments from creation until the segment is deleted. Replays skip
+locked segments, so any number of processes (app instances, the API server,
+CLI runs) can share one spool directory and replay it on startup.
+
+Usage:
+    python -m app.services.audit_sink_service replay
+    python -m app.services.audit_sink_service status
+"""
+
+# Load environment variables
+load_dotenv()
+
+AUDIT_SPOOL_DIR = os.getenv("AUDIT_SPOOL_DIR", "./static/audit_spool")
+"""Directory holding the JSONL spool segments."""
+
+AUDIT_FLUSH_BATCH = int(os.getenv("AUDIT_FLUSH_BATCH", "500"))
+"""Number of pending records that triggers a flush."""
+
+AUDIT_FLUSH_INTERVAL_MS = float(os.getenv("AUDIT_FLUSH_INTERVAL_MS", "1000"))
+"""Longest time a record waits in memory before it is flushed."""
+
+AUDIT_SPOOL_FSYNC = os.getenv("AUDIT_SPOOL_FSYNC", "false").lower() == "true"
+"""fsync every spooled record (survives power loss, not only a process crash)."""
+
+
+def _try_lock(file) -> bool:
+    """Take the exclusive lock of an open spool segment without waiting.
+
+    Args:
+        file: Open segment file
+
+    Returns:
+        bool: True if the lock was taken, False if another file handle holds it
+    """
+    try:
+        if fcntl is not None:
+            fcntl.flock(file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            position = file.tell()
+            file.seek(0)
+            msvcrt.locking(file.fileno(), msvcrt.LK_NBLCK, 1)
+            file.seek(position)
+    except OSError:
+        return False
+    return True
+
+
+def _still_linked(path: Path, file) -> bool:
+    """Whether a path still names the open file (a replay may have deleted it)."""
+    try:
+        return os.path.samestat(os.stat(path), os.fstat(file.fileno()))
+    except OSError:
+        return False
+
+
+def _remove_segment(path: Path, file):
+    """Delete a locked segment whose records are stored, then release it."""
+    if fcntl is not None:
+        # Unlink before unlocking, so no other process can take the segment in between
+        path.unlink(missing_ok=True)
+        file.close()
+        return
+    # Windows cannot delete an open file; a replay taking the segment in between
+    # finds its records stored and deletes it itself
+    file.close()
+    try:
+        path.unlink(missing_ok=True)
+    except PermissionError:
+        pass
+
+
+def _read_lines(lines) -> tuple:
+    """Parse spooled JSONL lines, skipping lines cut short by a crash."""
+    rows = []
+    unreadable = 0
+    for line in lines:
+        if not line.strip():
+            continue
+        try:
+            rows.append(audit_row_from_json(line))
+        except (ValueError, KeyError, TypeError):
+            unreadable += 1
+    return rows, unreadable
+
+
+def read_segment(path: Path) -> tuple:
+    """Read the records of one spool segment.
+
+    A line cut short by a crash is skipped.
+
+    Args:
+        path: Segment file
+
+    Returns:
+        tuple: (list of row dicts, number of unreadable lines)
+    """
+    with open(path, encoding="utf-8") as f:
+        return _read_lines(f)
+
+
+class AuditSink:
+    """Write-behind queue flushing audit log records to the database in batches."""
+
+    def __init__(self, bind=engine, spool_dir: str = None, batch_size: int = None, interval_ms: float = None):
+        """Initialize the sink; the flusher thread starts with the first record.
+
+        Args:
+            bind: Engine the batches are inserted through
+            spool_dir: Spool directory (default: AUDIT_SPOOL_DIR)
+            batch_size: Pending records triggering a flush (default: AUDIT_FLUSH_BATCH)
+            interval_ms: Maximum wait before a flush (default: AUDIT_FLUSH_INTERVAL_MS)
+        """
+        self.bind = bind
+        self.spool_dir = Path(spool_dir or AUDIT_SPOOL_DIR)
+        self.batch_size = batch_size or AUDIT_FLUSH_BATCH
+        self.interval = (AUDIT_FLUSH_INTERVAL_MS if interval_ms is None else interval_ms) / 1000
+        self._condition = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._rows = []
+        self._first_pending_at = None
+        self._segment_path = None
+        self._segment_file = None
+        self._unflushed = []
+        """[(segment path, file, rows, retry)] finished segments whose batch is not committed yet."""
+        self._thread = None
+        self._stopping = False
+
+    @property
+    def active_segment(self):
+        """Path of the segment currently being appended to, or None."""
+        return self._segment_path
+
+    def record(self, values: dict) -> dict:
+        """Spool an audit log record and queue it for the next batch.
+
+        Args:
+            values: AuditLog column values (user_id, action, entity_type,
+                entity_id, details, ip_address, user_agent)
+
+        Returns:
+            dict: The queued row, including its id and created_at
+        """
+        row = dict(values)
+        row["id"] = row.get("id") or uuid.uuid4()
+        row["user_id"] = row["user_id"] if isinstance(row["user_id"], uuid.UUID) else uuid.UUID(str(row["user_id"]))
+        row["created_at"] = row.get("created_at") or datetime.now()
+        line = audit_row_to_json(row) + "\n"
+        # Queue exactly what was spooled, with details reduced to JSON values (e.g. dates to strings)
+        row = audit_row_from_json(line)
+
+        with self._condition:
+            if self._segment_file is None:
+                self._open_segment()
+            self._segment_file.write(line)
+            self._segment_file.flush()
+            if AUDIT_SPOOL_FSYNC:
+                os.fsync(self._segment_file.fileno())
+            if not self._rows:
+                self._first_pending_at = time.monotonic()
+            self._rows.append(row)
+            if self._thread is None:
+                self._stopping = False
+                self._thread = threading.Thread(target=self._run, name="audit-sink", daemon=True)
+                self._thread.start()
+            if len(self._rows) >= self.batch_size:
+                self._condition.notify_all()
+        return row
+
+    def _open_segment(self):
+        """Start a new, locked spool segment (caller holds the condition)."""
+        self.spool_dir.mkdir(parents=True, exist_ok=True)
+        while True:
+            name = f"audit-{datetime.now():%Y%m%d%H%M%S%f}-{os.getpid()}.jsonl"
+            path = self.spool_dir / name
+            segment_file = open(path, "a", encoding="utf-8")
+            # A replay in another process may take or delete the new, empty file first
+            if _try_lock(segment_file) and _still_linked(path, segment_file):
+                break
+            segment_file.close()
+        self._segment_path = path
+        self._segment_file = segment_file
+
+    def flush(self) -> int:
+        """Insert the pending records now.
+
+        Segments of earlier failed flushes are retried first. A segment that
+        cannot be inserted stays on disk for the next flush or a replay.
+
+        Returns:
+            int: Number of records inserted
+        """
+        with self._flush_lock:
+            with self._condition:
+                rows, self._rows = self._rows, []
+                self._first_pending_at = None
+                if self._segment_file is not None:
+                    # Stays open, and locked, until its batch has committed
+                    self._unflushed.append((self._segment_path, self._segment_file, rows, False))
+                    self._segment_file = self._segment_path = None
+
+            inserted = 0
+            remaining = []
+            for path, segment_file, segment_rows, retry in self._unflushed:
+                try:
+                    with self.bind.begin() as connection:
+                        # A failed batch may have committed before its error surfaced
+                        inserted += insert_audit_rows(connection, segment_rows, skip_existing=retry)
+                except Exception as ex:
+                    print(f"Error flushing {len(segment_rows)} audit log records (kept in {path}): {ex}")
+                    remaining.append((path, segment_file, segment_rows, True))
+                    continue
+                try:
+                    _remove_segment(path, segment_file)
+                except OSError as ex:
+                    print(f"Error removing audit spool segment {path}: {ex}")
+            self._unflushed = remaining
+            return inserted
+
+    def _run(self):
+        """Flush whenever the batch is full or its oldest record is due."""
+        while True:
+            with self._condition:
+                while not self._stopping:
+                    if len(self._rows) >= self.batch_size:
+                        break
+                    if self._rows:
+                        remaining = self._first_pending_at + self.interval - time.monotonic()
+                        if remaining <= 0:
+                            break
+                        self._condition.wait(remaining)
+                    else:
+                        self._condition.wait()
+                stopping = self._stopping
+            self.flush()
+            if stopping:
+                return
+
+    def stop(self):
+        """Flush the pending records and stop the flusher thread."""
+        with self._condition:
+            thread, self._thread = self._thread, None
+            self._stopping = True
+            self._condition.notify_all()
+        if thread is not None:
+            thread.join()
+        else:
+            self.flush()
+
+
+_audit_sink = AuditSink()
+
+
+def record_audit(values: dict) -> dict:
+    """Queue an audit log record on the application's sink.
+
+    Args:
+        values: AuditLog column values
+
+    Returns:
+        dict: The queued row, including its id and created_at
+    """
+    return _audit_sink.record(values)
+
+
+def flush_audit_log() -> int:
+    """Insert the records queued on the application's sink now.
+
+    Returns:
+        int: Number of records inserted
+    """
+    return _audit_sink.flush()
+
+
+def stop_audit_sink():
+    """Flush the queued records and stop the application's flusher thread."""
+    _audit_sink.stop()
+
+
+atexit.register(stop_audit_sink)
+
+
+def spool_segments(spool_dir: str = None) -> list:
+    """List the spool segments in a spool directory, oldest first.
+
+    The segment the application's sink is currently appending to is excluded;
+    segments other sinks still own are listed (see replay_spool).
+
+    Args:
+        spool_dir: Spool directory (default: AUDIT_SPOOL_DIR)
+
+    Returns:
+        list: Segment paths
+    """
+    directory = Path(spool_dir or AUDIT_SPOOL_DIR)
+    if not directory.is_dir():
+        return []
+    active = _audit_sink.active_segment
+    return [path for path in sorted(directory.glob("audit-*.jsonl")) if path != active]
+
+
+def replay_spool(bind=engine, spool_dir: str = None) -> dict:
+    """Load spooled audit log records into the database.
+
+    Only segments no live sink holds locked are loaded: those left by a
+    crashed process. Records already stored (matched by id) are skipped. A
+    segment is deleted once its records are committed; one that fails stays
+    for the next replay. Safe to run while other processes use the spool.
+
+    Args:
+        bind: Engine to insert through
+        spool_dir: Spool directory (default: AUDIT_SPOOL_DIR)
+
+    Returns:
+        dict: Segments loaded, in use and failed, records inserted, skipped and unreadable
+    """
+    result = {"segments": 0, "in_use": 0, "failed": 0, "inserted": 0, "skipped": 0, "unreadable": 0}
+    for path in spool_segments(spool_dir):
+        try:
+            segment_file = open(path, encoding="utf-8")
+        except FileNotFoundError:
+            # Deleted by its sink or another replay since it was listed
+            continue
+        if not _try_lock(segment_file) or not _still_linked(path, segment_file):
+            segment_file.close()
+            result["in_use"] += 1
+            continue
+        try:
+            rows, unreadable = _read_lines(segment_file)
+            with bind.begin() as connection:
+                inserted = insert_audit_rows(connection, rows, skip_existing=True)
+            _remove_segment(path, segment_file)
+        except Exception as ex:
+            segment_file.close()
+            print(f"Error replaying audit spool segment {path}: {ex}")
+            result["failed"] += 1
+            continue
+        result["segments"] += 1
+        result["inserted"] += inserted
+        result["skipped"] += len(rows) - inserted
+        result["unreadable"] += unreadable
+    return result
+
+
+def spool_status(spool_dir: str = None) -> dict:
+    """Count the spool segments waiting to be replayed.
+
+    Args:
+        spool_dir: Spool directory (default: AUDIT_SPOOL_DIR)
+
+    Returns:
+        dict: Segments and records waiting, and segments still owned by a live sink
+    """
+    result = {"segments": 0, "records": 0, "in_use": 0}
+    for path in spool_segments(spool_dir):
+        try:
+            with open(path, encoding="utf-8") as segment_file:
+                if not _try_lock(segment_file):
+                    result["in_use"] += 1
+                    continue
+                result["segments"] += 1
+                result["records"] += len(_read_lines(segment_file)[0])
+        except FileNotFoundError:
+            continue
+    return result
+
+
+if __name__ == "__main__":
+    """Command line entry point for audit spool maintenance.
+
+    Usage:
+        python -m app.services.audit_sink_service replay
+        python -m app.services.audit_sink_service status
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Manage the audit log spool")
+    parser.add_argument("command", choices=["replay", "status"], help="Command to run")
+    parser.add_argument("--spool-dir", default=None, help=f"Spool directory (default: {AUDIT_SPOOL_DIR})")
+    args = parser.parse_args()
+
+    if args.command == "replay":
+        result = replay_spool(spool_dir=args.spool_dir)
+        print(
+            f"Replayed {result['segments']} segments: {result['inserted']} records inserted, "
+            f"{result['skipped']} already stored, {result['unreadable']} unreadable lines, "
+            f"{result['failed']} segments failed, {result['in_use']} in use by running processes"
+        )
+    else:
+        status = spool_status(args.spool_dir)
+        print(
+            f"{status['segments']} spool segments, {status['records']} records waiting to be loaded, "
+            f"{status['in_use']} segments in use by running processes"
+        )
@@ -0,0 +1,140 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dotenv import load_dotenv
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.db.models import LogbookEntry
+
+"""Stale-while-revalidate cache of chart data.
+
+This module provides:
+- A per-chart result cache that returns the last good result immediately
+- Loads of uncached charts on a worker pool, so callers can render a
+  placeholder and receive the data through a callback
+- Background refreshes (one per chart at a time) once a result is older
+  than CHART_CACHE_TTL_SECONDS or has been invalidated
+- Invalidation when a transaction changing LogbookEntry rows commits
+
+A failed refresh keeps serving the previous result. Only a chart that was
+never loaded successfully reports the error to the caller.
+"""
+
+# Load environment variables
+load_dotenv()
+
+CHART_CACHE_TTL_SECONDS = float(os.getenv("CHART_CACHE_TTL_SECONDS", "300"))
+"""Age after which a cached chart result is refreshed in the background."""
+
+CHART_WORKERS = int(os.getenv("CHART_WORKERS", "4"))
+"""Number of chart queries run concurrently."""
+
+_lock = threading.Lock()
+_results = {}
+"""{chart key: (value, loaded at, generation)}"""
+
+_refreshing = {}
+"""{chart key: [(on_loaded, on_error) callbacks]} for loads in flight."""
+
+_generation = 0
+"""Incremented by invalidate(); results from older generations are stale."""
+
+_executor = ThreadPoolExecutor(max_workers=CHART_WORKERS, thread_name_prefix="chart-refresh")
+
+
+def _schedule(key, loader, generation: int, on_loaded=None, on_error=None):
+    """Queue a load of one chart, joining a load already in flight (caller holds the lock)."""
+    callbacks = _refreshing.get(key)
+    if callbacks is None:
+        callbacks = _refreshing[key] = []
+        _executor.submit(_refresh, key, loader, generation)
+    if on_loaded or on_error:
+        callbacks.append((on_loaded, on_error))
+
+
+def request_chart_data(key, loader, on_loaded, on_error=None) -> tuple:
+    """Return a chart's cached data, or load it on the worker pool.
+
+    A chart that is not cached yet does not block the caller: on_loaded (or
+    on_error) is called from a worker thread once the data is loaded.
+
+    Args:
+        key: Hashable chart key (title plus any filters)
+        loader: Callable returning fresh chart data
+        on_loaded: Callback(value) called when a load or background refresh finishes
+        on_error: Optional callback(exception) called if the first load fails
+
+    Returns:
+        tuple: (True, cached value) or (False, None) if a load was queued
+    """
+    with _lock:
+        cached = _results.get(key)
+        generation = _generation
+        if cached is None:
+            _schedule(key, loader, generation, on_loaded, on_error)
+            return False, None
+        value, loaded_at, loaded_generation = cached
+        if loaded_generation != generation or time.monotonic() - loaded_at >= CHART_CACHE_TTL_SECONDS:
+            # Keep showing the cached value if the refresh fails
+            _schedule(key, loader, generation, on_loaded)
+        return True, value
+
+
+def _refresh(key, loader, generation: int):
+    """Load one chart and notify the waiting callbacks."""
+    try:
+        value = loader()
+    except Exception as ex:
+        print(f"Error loading chart data for {key}: {ex}")
+        with _lock:
+            callbacks = _refreshing.pop(key, [])
+        for _, on_error in callbacks:
+            if not on_error:
+                continue
+            try:
+                on_error(ex)
+            except Exception as callback_ex:
+                print(f"Error reporting chart failure for {key}: {callback_ex}")
+        return
+
+    with _lock:
+        _results[key] = (value, time.monotonic(), generation)
+        callbacks = _refreshing.pop(key, [])
+    for on_loaded, _ in callbacks:
+        if not on_loaded:
+            continue
+        try:
+            on_loaded(value)
+        except Exception as ex:
+            print(f"Error applying chart data for {key}: {ex}")
+
+
+def invalidate():
+    """Mark every cached chart result as stale."""
+    global _generation
+    with _lock:
+        _generation += 1
+
+
+@event.listens_for(Session, "after_flush")
+def _track_entry_changes(session, flush_context):
+    """Remember that the transaction wrote LogbookEntry rows."""
+    for instance in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(instance, LogbookEntry):
+            session.info["chart_data_changed"] = True
+            return
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_on_commit(session):
+    """Invalidate chart results once LogbookEntry changes are committed."""
+    if session.info.pop("chart_data_changed", False):
+        invalidate()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_entry_changes(session):
+    """Forget LogbookEntry changes of a rolled back transaction."""
+    session.info.pop("chart_data_changed", None)
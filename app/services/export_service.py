@@ -0,0 +1,293 @@
+import csv
+import io
+from contextlib import contextmanager
+from sqlalchemy import case, func, select
+
+from app.db.database import SessionLocal
+from app.db.models import LIVE_ENTRY_CONDITION, Location, LogbookEntry, StatusEnum
+
+"""Streaming export of logbook entries.
+
+This module provides:
+- A Core select of only the exported columns (no ORM objects, no unused text columns)
+- Row iteration in fixed-size batches via yield_per (server-side cursors where supported)
+- Incremental CSV encoding with progress callbacks, usable both for files
+  written by the UI and for HTTP streaming responses
+- Excel workbooks written with openpyxl's write_only mode (entries, status
+  summary and per-location summary sheets)
+- Read snapshots for exports made of several queries
+
+Memory use depends on the batch size, not on the number of exported rows.
+"""
+
+EXPORT_BATCH_SIZE = 1000
+"""Rows fetched from the database per batch."""
+
+EXPORT_COLUMNS = (
+    ("ID", LogbookEntry.id),
+    ("Task", LogbookEntry.task),
+    ("Call Description", LogbookEntry.call_description),
+    ("Solution", LogbookEntry.solution_description),
+    ("Status", LogbookEntry.status),
+    ("Location", LogbookEntry.device),
+    ("Created At", LogbookEntry.created_at),
+)
+"""(CSV header, column) pairs in export order."""
+
+
+def export_statement(filters=None):
+    """Build the select statement for exported entries.
+
+    Args:
+        filters: Optional list of extra SQLAlchemy filter expressions
+
+    Returns:
+        Select: Statement over the exported columns, oldest entries first
+    """
+    statement = select(*(column for _, column in EXPORT_COLUMNS)).where(LIVE_ENTRY_CONDITION)
+    for condition in filters or []:
+        statement = statement.where(condition)
+    return statement.order_by(LogbookEntry.created_at, LogbookEntry.id)
+
+
+@contextmanager
+def read_snapshot(session):
+    """Open a connection on which every read sees the same snapshot.
+
+    Each statement of a session otherwise sees the latest commit (pysqlite
+    starts no transaction for SELECTs, PostgreSQL reads at READ COMMITTED), so
+    a count and the rows read after it can disagree. The connection can be
+    passed wherever the export functions take a session.
+
+    Args:
+        session: Database session whose read bind is used
+
+    Yields:
+        Connection: Connection inside a single read transaction
+    """
+    with session.get_bind().connect() as connection:
+        if connection.dialect.name == "sqlite":
+            connection.exec_driver_sql("BEGIN")
+        else:
+            connection.execution_options(isolation_level="REPEATABLE READ")
+        yield connection
+
+
+def count_export_rows(session, filters=None) -> int:
+    """Count the entries an export with the same filters would write.
+
+    Args:
+        session: Database session
+        filters: Optional list of extra SQLAlchemy filter expressions
+
+    Returns:
+        int: Number of rows
+    """
+    statement = select(func.count(LogbookEntry.id)).where(LIVE_ENTRY_CONDITION)
+    for condition in filters or []:
+        statement = statement.where(condition)
+    return session.execute(statement).scalar() or 0
+
+
+def _format_row(row) -> list:
+    """Convert a result row to CSV cell values."""
+    entry_id, task, call_description, solution, status, device, created_at = row
+    return [
+        str(entry_id),
+        task or "",
+        call_description or "",
+        solution or "",
+        status.value if status else "",
+        device or "",
+        created_at.strftime("%Y-%m-%d") if created_at else "",
+    ]
+
+
+def iter_export_batches(session, filters=None, batch_size: int = EXPORT_BATCH_SIZE):
+    """Yield exported rows in batches without loading the whole result.
+
+    Args:
+        session: Database session
+        filters: Optional list of extra SQLAlchemy filter expressions
+        batch_size: Rows fetched per batch
+
+    Yields:
+        list: Up to batch_size formatted rows
+    """
+    result = session.execute(export_statement(filters).execution_options(yield_per=batch_size))
+    for partition in result.partitions():
+        yield [_format_row(row) for row in partition]
+
+
+def iter_csv(session, filters=None, batch_size: int = EXPORT_BATCH_SIZE, progress=None):
+    """Yield an entries CSV document as text chunks.
+
+    Args:
+        session: Database session
+        filters: Optional list of extra SQLAlchemy filter expressions
+        batch_size: Rows fetched and encoded per chunk
+        progress: Optional callback(rows_written, total_rows) called after each chunk
+
+    Yields:
+        str: The header line, then one chunk of CSV lines per batch
+    """
+    total = count_export_rows(session, filters) if progress else None
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    writer.writerow([header for header, _ in EXPORT_COLUMNS])
+    yield buffer.getvalue()
+
+    written = 0
+    for batch in iter_export_batches(session, filters, batch_size):
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(batch)
+        written += len(batch)
+        yield buffer.getvalue()
+        if progress:
+            progress(written, total)
+
+
+def write_csv(file_path: str, session, filters=None, progress=None):
+    """Stream an entries CSV export to a file.
+
+    Args:
+        file_path: Destination path
+        session: Database session
+        filters: Optional list of extra SQLAlchemy filter expressions
+        progress: Optional callback(rows_written, total_rows)
+    """
+    with open(file_path, "w", newline="", encoding="utf-8") as csvfile:
+        for chunk in iter_csv(session, filters, progress=progress):
+            csvfile.write(chunk)
+
+
+def stream_csv(filters=None, batch_size: int = EXPORT_BATCH_SIZE):
+    """Yield an entries CSV document using a session owned by the generator.
+
+    Suitable as the body iterator of an HTTP streaming response, which
+    outlives the request's own database session.
+
+    Args:
+        filters: Optional list of extra SQLAlchemy filter expressions
+        batch_size: Rows fetched and encoded per chunk
+
+    Yields:
+        str: CSV text chunks
+    """
+    with SessionLocal() as session:
+        yield from iter_csv(session, filters, batch_size)
+
+
+def status_summary(session, filters=None) -> list:
+    """Count exported entries per status.
+
+    Args:
+        session: Database session
+        filters: Optional list of extra SQLAlchemy filter expressions
+
+    Returns:
+        list: (status value, count) tuples, most frequent first
+    """
+    statement = select(LogbookEntry.status, func.count(LogbookEntry.id)).where(LIVE_ENTRY_CONDITION)
+    for condition in filters or []:
+        statement = statement.where(condition)
+    statement = statement.group_by(LogbookEntry.status).order_by(func.count(LogbookEntry.id).desc())
+    return [(status.value if status else "", count) for status, count in session.execute(statement)]
+
+
+def location_summary(session, filters=None) -> list:
+    """Aggregate exported entries per location in one grouped query.
+
+    Args:
+        session: Database session
+        filters: Optional list of extra SQLAlchemy filter expressions
+
+    Returns:
+        list: (location name, total, one count per StatusEnum member, downtime hours) tuples
+    """
+    statement = select(
+        Location.name,
+        func.count(LogbookEntry.id),
+        *(func.sum(case((LogbookEntry.status == status, 1), else_=0)) for status in StatusEnum),
+        func.sum(LogbookEntry.downtime_hours),
+    ).select_from(LogbookEntry).outerjoin(Location, LogbookEntry.location_id == Location.id).where(
+        LIVE_ENTRY_CONDITION
+    )
+    for condition in filters or []:
+        statement = statement.where(condition)
+    statement = statement.group_by(Location.name).order_by(Location.name)
+    return [
+        (name or "Unknown", total, *(int(count or 0) for count in counts), round(downtime or 0.0, 2))
+        for name, total, *counts, downtime in session.execute(statement)
+    ]
+
+
+def write_excel(file_path: str, session, filters=None, progress=None):
+    """Stream an entries workbook to a file using openpyxl's write_only mode.
+
+    Entry rows go from the database cursor straight to the worksheet XML; no
+    worksheet is held in memory.
+
+    Args:
+        file_path: Destination .xlsx path
+        session: Database session
+        filters: Optional list of extra SQLAlchemy filter expressions
+        progress: Optional callback(rows_written, total_rows) called after each batch
+    """
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+    from openpyxl.styles import Font
+
+    workbook = Workbook(write_only=True)
+
+    def header_row(sheet, values, size=None):
+        cells = []
+        for value in values:
+            cell = WriteOnlyCell(sheet, value=value)
+            cell.font = Font(bold=True, size=size)
+            cells.append(cell)
+        return cells
+
+    def clean(value):
+        # Control characters are not allowed in worksheet XML
+        return ILLEGAL_CHARACTERS_RE.sub("", value) if isinstance(value, str) else value
+
+    # Entries sheet; column widths must be set before the first row is written
+    entries_sheet = workbook.create_sheet("Logbook Entries")
+    for letter, width in zip("ABCDEFG", (38, 20, 50, 50, 12, 20, 12)):
+        entries_sheet.column_dimensions[letter].width = width
+    entries_sheet.append(header_row(entries_sheet, [header for header, _ in EXPORT_COLUMNS]))
+
+    total = count_export_rows(session, filters) if progress else None
+    written = 0
+    for batch in iter_export_batches(session, filters):
+        for row in batch:
+            entries_sheet.append([clean(value) for value in row])
+        written += len(batch)
+        if progress:
+            progress(written, total)
+
+    # Status summary sheet
+    status_sheet = workbook.create_sheet("Status Summary")
+    status_sheet.column_dimensions["A"].width = 20
+    status_sheet.column_dimensions["B"].width = 12
+    status_sheet.append(header_row(status_sheet, ["Status Summary"], size=14))
+    status_sheet.append(header_row(status_sheet, ["Status", "Count"]))
+    for row in status_summary(session, filters):
+        status_sheet.append(list(row))
+
+    # Per-location summary sheet
+    location_sheet = workbook.create_sheet("Location Summary")
+    location_sheet.column_dimensions["A"].width = 30
+    location_sheet.append(header_row(location_sheet, ["Location Summary"], size=14))
+    location_sheet.append(header_row(
+        location_sheet,
+        ["Location", "Total"] + [status.value.capitalize() for status in StatusEnum] + ["Downtime Hours"],
+    ))
+    for row in location_summary(session, filters):
+        location_sheet.append([clean(value) for value in row])
+
+    workbook.save(file_path)
@@ -0,0 +1,166 @@
+from sqlalchemy import bindparam, select
+
+from app.db.models import User
+from app.services.audit_partition_service import entity_timeline
+from app.utils.pagination import split_page
+
+"""Change history of audited entities.
+
+This module provides:
+- Timelines of one entity's audit log records, newest first, with keyset
+  pagination on (created_at, id)
+- Field-level changes derived from the records' details
+- The acting user's name on every event
+
+Each monthly audit log partition is searched through its
+(entity_type, entity_id, created_at) index, so a page costs one index seek
+per partition regardless of the size of the audit log. Records reach the
+audit log through the write-behind audit sink, so the newest events may
+appear up to AUDIT_FLUSH_INTERVAL_MS late.
+
+Usage:
+    python -m app.services.history_service benchmark [--rows 1000000] [--months 12]
+"""
+
+ENTRY_ENTITY_TYPE = "logbook_entry"
+"""Entity type of the audit records of logbook entries."""
+
+HISTORY_PAGE_SIZE = 50
+"""Default number of events per page."""
+
+_user_names = select(User.id, User.full_name).where(User.id.in_(bindparam("user_ids", expanding=True)))
+
+
+def field_changes(details) -> list:
+    """Turn an audit record's details into field-level changes.
+
+    Updates store {field: {"old": value, "new": value}}. Status updates, and
+    updates recorded before previous values were kept, store {field: new value};
+    their previous value is reported as None, and fields set to None are
+    skipped.
+
+    Args:
+        details: The record's details JSON
+
+    Returns:
+        list: Dicts with field, old and new
+    """
+    if not isinstance(details, dict):
+        return []
+    changes = []
+    for field, value in details.items():
+        if isinstance(value, dict) and set(value) == {"old", "new"}:
+            changes.append({"field": field, "old": value["old"], "new": value["new"]})
+        elif value is not None:
+            changes.append({"field": field, "old": None, "new": value})
+    return changes
+
+
+def entity_history(session, entity_type: str, entity_id, position=None, limit: int = HISTORY_PAGE_SIZE) -> tuple:
+    """Load one page of an entity's change timeline.
+
+    Works on a sync session; API handlers call it through AsyncSession.run_sync.
+
+    Args:
+        session: Database session
+        entity_type: Audited entity type (e.g. ENTRY_ENTITY_TYPE)
+        entity_id: Audited entity ID
+        position: Optional (created_at, id) keyset position of the previous page's last event
+        limit: Maximum number of events
+
+    Returns:
+        tuple: (events, next_cursor); each event is a dict with id, action,
+            created_at, user_id, user_name and changes
+    """
+    connection = session.connection()
+    rows, next_cursor = split_page(
+        entity_timeline(connection, entity_type, entity_id, position, limit + 1), "created_at", limit
+    )
+
+    user_ids = list({row.user_id for row in rows})
+    names = dict(connection.execute(_user_names, {"user_ids": user_ids}).all()) if user_ids else {}
+    events = [
+        {
+            "id": row.id,
+            "action": row.action,
+            "created_at": row.created_at,
+            "user_id": row.user_id,
+            "user_name": names.get(row.user_id),
+            "changes": field_changes(row.details),
+        }
+        for row in rows
+    ]
+    return events, next_cursor
+
+
+def _benchmark(rows: int, months: int, lookups: int):
+    """Time history lookups on a scratch database with a large partitioned audit log."""
+    import os
+    import random
+    import tempfile
+    import time
+    import uuid
+    from datetime import datetime, timedelta
+    from sqlalchemy.orm import sessionmaker
+    from app.db.database import Base, create_db_engine
+    from app.services.audit_partition_service import ensure_audit_partitions, insert_audit_rows
+
+    entities = max(rows // 20, 1)
+    user_id = uuid.uuid4()
+    now = datetime.now()
+    span = timedelta(days=30 * months)
+
+    with tempfile.TemporaryDirectory(prefix="logbook_history_") as work_dir:
+        bench_engine = create_db_engine(f"sqlite:///{os.path.join(work_dir, 'benchmark.db')}")
+        Base.metadata.create_all(bench_engine)
+        ensure_audit_partitions(bench_engine)
+        started = time.perf_counter()
+        for start in range(0, rows, 50000):
+            batch = [
+                {
+                    "id": uuid.uuid4(), "user_id": user_id, "action": "update", "entity_type": ENTRY_ENTITY_TYPE,
+                    "entity_id": str(random.randrange(entities)), "details": {"status": {"old": "open", "new": "closed"}},
+                    "ip_address": None, "user_agent": None, "created_at": now - span * random.random(),
+                }
+                for _ in range(start, min(start + 50000, rows))
+            ]
+            with bench_engine.begin() as connection:
+                insert_audit_rows(connection, batch)
+        print(f"Seeded {rows} audit records for {entities} entities over {months} months "
+              f"in {time.perf_counter() - started:.1f}s")
+
+        factory = sessionmaker(bind=bench_engine)
+        with factory() as session:
+            connection = session.connection()
+            for label, lookup in (
+                ("index lookups", lambda entity_id: entity_timeline(connection, ENTRY_ENTITY_TYPE, entity_id, limit=20)),
+                ("timeline pages", lambda entity_id: entity_history(session, ENTRY_ENTITY_TYPE, entity_id, limit=20)),
+            ):
+                timings = []
+                for _ in range(lookups):
+                    entity_id = random.randrange(entities)
+                    started = time.perf_counter()
+                    lookup(entity_id)
+                    timings.append(time.perf_counter() - started)
+                timings.sort()
+                print(f"{lookups} {label}: median {timings[len(timings) // 2] * 1000:.2f} ms, "
+                      f"p95 {timings[int(len(timings) * 0.95)] * 1000:.2f} ms")
+        bench_engine.dispose()
+
+
+if __name__ == "__main__":
+    """Command line entry point for the history lookup benchmark.
+
+    Usage:
+        python -m app.services.history_service benchmark [--rows 1000000] [--months 12]
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark entity history lookups")
+    parser.add_argument("command", choices=["benchmark"], help="Command to run")
+    parser.add_argument("--rows", type=int, default=1000000, help="Audit records seeded")
+    parser.add_argument("--months", type=int, default=12, help="Months (partitions) the records span")
+    parser.add_argument("--lookups", type=int, default=500, help="Timelines loaded")
+    args = parser.parse_args()
+
+    _benchmark(args.rows, args.months, args.lookups)
@@ -0,0 +1,158 @@
+import uuid
+from datetime import date, timedelta
+from sqlalchemy import func
+
+from app.db.models import LIVE_ENTRY_CONDITION, LogbookEntry, StatusEnum
+from app.services.timeseries_service import bucket_expression
+from app.utils.pagination import apply_keyset
+
+"""Index advisor for the logbook's hot queries.
+
+This module provides:
+- A catalogue of the queries the dashboard, reports and entry API run most often
+- EXPLAIN QUERY PLAN (SQLite) / EXPLAIN (PostgreSQL) over each of them
+- A report of the queries that still scan the whole logbook_entries table
+
+Usage:
+    python -m app.services.index_service advise
+"""
+
+
+def hot_queries(session) -> dict:
+    """Build the project's hot logbook queries with representative parameters.
+
+    Args:
+        session: Database session
+
+    Returns:
+        dict: {query name: Query}
+    """
+    dialect_name = session.get_bind().dialect.name
+    month_ago = date.today() - timedelta(days=30)
+    entries = session.query(LogbookEntry)
+    live_entries = entries.filter(LogbookEntry.is_deleted == False)
+    month = bucket_expression(LogbookEntry.created_at, "month", dialect_name)
+
+    return {
+        "dashboard recent entries": live_entries.order_by(LogbookEntry.created_at.desc()).limit(5),
+        "recent activity page": apply_keyset(entries, LogbookEntry.created_at, LogbookEntry.id).limit(51),
+        "recent activity page by status": apply_keyset(
+            entries.filter(LogbookEntry.status == StatusEnum.OPEN), LogbookEntry.created_at, LogbookEntry.id
+        ).limit(51),
+        "api entries for technician": apply_keyset(
+            live_entries.filter(LogbookEntry.user_id == uuid.uuid4()), LogbookEntry.created_at, LogbookEntry.id
+        ).limit(101),
+        "api entries by start date": apply_keyset(
+            live_entries.filter(LogbookEntry.start_date >= month_ago, LogbookEntry.start_date <= date.today()),
+            LogbookEntry.created_at, LogbookEntry.id
+        ).limit(101),
+        "api entries by location": apply_keyset(
+            live_entries.filter(LogbookEntry.location_id == 1), LogbookEntry.created_at, LogbookEntry.id
+        ).limit(101),
+        "report statistics for period": session.query(func.count(LogbookEntry.id)).filter(
+            LIVE_ENTRY_CONDITION, LogbookEntry.created_at >= month_ago
+        ),
+        "monthly trends by status": session.query(month, LogbookEntry.status, func.count(LogbookEntry.id)).filter(
+            LIVE_ENTRY_CONDITION, LogbookEntry.created_at >= month_ago
+        ).group_by(month, LogbookEntry.status),
+        "issues by category": session.query(LogbookEntry.task, func.count(LogbookEntry.id)).filter(
+            LIVE_ENTRY_CONDITION
+        ).group_by(LogbookEntry.task),
+        "issues by location": session.query(LogbookEntry.device, func.count(LogbookEntry.id)).filter(
+            LIVE_ENTRY_CONDITION
+        ).group_by(LogbookEntry.device),
+        "completed entries for resolution times": entries.filter(
+            LogbookEntry.status == StatusEnum.COMPLETED, LIVE_ENTRY_CONDITION
+        ),
+        "issues by location for task in period": session.query(LogbookEntry.device, func.count(LogbookEntry.id)).filter(
+            LIVE_ENTRY_CONDITION, LogbookEntry.task == "Onderhoud", LogbookEntry.created_at >= month_ago
+        ).group_by(LogbookEntry.device),
+        "report statistics for technician": session.query(func.count(LogbookEntry.id)).filter(
+            LIVE_ENTRY_CONDITION, LogbookEntry.responsible_person == "technician"
+        ),
+    }
+
+
+def explain(session, query) -> list:
+    """Return the backend's query plan for a query.
+
+    Args:
+        session: Database session
+        query: SQLAlchemy Query or select statement
+
+    Returns:
+        list: One string per plan line
+    """
+    statement = getattr(query, "statement", query)
+    dialect = session.get_bind().dialect
+    # Inline the parameters so the plan reflects the values and no result typing applies
+    sql = str(statement.compile(dialect=dialect, compile_kwargs={"literal_binds": True}))
+    if dialect.name == "sqlite":
+        rows = session.connection().exec_driver_sql("EXPLAIN QUERY PLAN " + sql).fetchall()
+        # (id, parent, notused, detail)
+        return [row[-1] for row in rows]
+    rows = session.connection().exec_driver_sql("EXPLAIN " + sql).fetchall()
+    return [row[0] for row in rows]
+
+
+def scans_full_table(plan: list, table_name: str = "logbook_entries") -> bool:
+    """Check whether a plan reads a table without using any index.
+
+    Args:
+        plan: Plan lines returned by explain
+        table_name: Table to look for
+
+    Returns:
+        bool: True if the table is scanned sequentially
+    """
+    for line in plan:
+        # SQLite reports 'SCAN <table>' ('SCAN TABLE <table>' before 3.36) without an index clause
+        if line.startswith(("SCAN " + table_name, "SCAN TABLE " + table_name)) and "INDEX" not in line:
+            return True
+        if f"Seq Scan on {table_name}" in line:
+            return True
+    return False
+
+
+def advise(session) -> dict:
+    """Explain every hot query.
+
+    Args:
+        session: Database session
+
+    Returns:
+        dict: {query name: (plan lines, scans full table)}
+    """
+    results = {}
+    for name, query in hot_queries(session).items():
+        plan = explain(session, query)
+        results[name] = (plan, scans_full_table(plan))
+    return results
+
+
+if __name__ == "__main__":
+    """Command line entry point for the index advisor.
+
+    Usage:
+        python -m app.services.index_service advise [--verbose]
+    """
+    import argparse
+    from app.db.database import SessionLocal, engine
+
+    parser = argparse.ArgumentParser(description="Report logbook hot queries that scan the full table")
+    parser.add_argument("command", choices=["advise"], help="Advisor command to run")
+    parser.add_argument("--verbose", action="store_true", help="Print the plan of every query")
+    args = parser.parse_args()
+
+    with SessionLocal() as session:
+        results = advise(session)
+
+    full_scans = [name for name, (plan, full_scan) in results.items() if full_scan]
+    for name, (plan, full_scan) in results.items():
+        print(f"{'FULL SCAN' if full_scan else 'indexed':>9}  {name}")
+        if args.verbose or full_scan:
+            for line in plan:
+                print(f"           {line}")
+    print(f"{len(full_scans)} of {len(results)} hot queries scan the full logbook_entries table")
+    if full_scans and engine.dialect.name == "postgresql":
+        print("PostgreSQL prefers sequential scans on small tables; run ANALYZE and re-check on production data")
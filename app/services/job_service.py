@@ -0,0 +1,292 @@
+import argparse
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from dotenv import load_dotenv
+
+from app.db.database import SessionLocal
+from app.db.models import Job
+
+"""In-process background jobs for long-running UI operations.
+
+This module provides:
+- A bounded worker pool running jobs outside Flet event handlers
+- Job IDs, cancellation (queued jobs are dropped, running jobs stop at their
+  next progress report) and progress reporting
+- Job events pushed to the submitting session through page.pubsub
+- A persisted jobs table, so finished artifacts are still listed after a restart
+
+Job targets are called with a JobContext and may return a completion message.
+
+Usage:
+    python -m app.services.job_service list [--limit 20]
+"""
+
+# Load environment variables
+load_dotenv()
+
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
+"""Number of jobs run concurrently; further jobs wait in the queue."""
+
+PROGRESS_PERSIST_SECONDS = 1.0
+"""Minimum interval between progress writes to the jobs table."""
+
+FINISHED_STATUSES = ("completed", "failed", "cancelled")
+
+_executor = ThreadPoolExecutor(max_workers=JOB_WORKERS, thread_name_prefix="job")
+_lock = threading.Lock()
+_active = {}
+"""{job id: (JobContext, Future)} for queued and running jobs."""
+
+
+class JobCancelled(Exception):
+    """Raised inside a job when cancellation was requested."""
+
+
+def job_topic(page, channel: str) -> str:
+    """Return the pubsub topic carrying job events for a page's session.
+
+    Flet keeps one handler per session and topic, so each view listens on
+    its own channel.
+
+    Args:
+        page: Flet page
+        channel: Name of the listening view
+
+    Returns:
+        str: Topic name
+    """
+    return f"jobs/{page.session_id}/{channel}"
+
+
+def _update_job(job_id: uuid.UUID, **values):
+    """Write job columns in a short transaction of its own."""
+    with SessionLocal() as session:
+        session.query(Job).filter(Job.id == job_id).update(values, synchronize_session=False)
+        session.commit()
+
+
+class JobContext:
+    """Handle passed to a running job target.
+
+    Attributes:
+        job_id: Job ID
+        kind: Job type
+        result_path: Path of the artifact the job produces, if any
+    """
+
+    def __init__(self, job_id: uuid.UUID, kind: str, page=None, channel: str = None, result_path: str = None):
+        self.job_id = job_id
+        self.kind = kind
+        self.page = page
+        self.channel = channel
+        self.result_path = result_path
+        self._cancel_event = threading.Event()
+        self._persisted_at = 0.0
+        self._last_progress = {}
+
+    @property
+    def cancelled(self) -> bool:
+        """Whether cancellation was requested."""
+        return self._cancel_event.is_set()
+
+    def check_cancelled(self):
+        """Stop the job if cancellation was requested.
+
+        Raises:
+            JobCancelled: If the job was cancelled
+        """
+        if self._cancel_event.is_set():
+            raise JobCancelled()
+
+    def progress(self, done: int, total: int = None, message: str = None):
+        """Report progress; usable directly as an export progress callback.
+
+        Args:
+            done: Units of work done
+            total: Units of work in total, if known
+            message: Optional status text
+
+        Raises:
+            JobCancelled: If the job was cancelled
+        """
+        self.check_cancelled()
+        self.publish("running", done=done, total=total, message=message)
+        self._last_progress = {"progress_done": done, "progress_total": total}
+        now = time.monotonic()
+        if now - self._persisted_at >= PROGRESS_PERSIST_SECONDS:
+            self._persisted_at = now
+            _update_job(self.job_id, progress_done=done, progress_total=total, message=message)
+
+    def publish(self, status: str, **event):
+        """Send a job event to the submitting session, if any."""
+        if self.page is None or self.channel is None:
+            return
+        event.update(job_id=str(self.job_id), kind=self.kind, status=status, result_path=self.result_path)
+        try:
+            self.page.pubsub.send_all_on_topic(job_topic(self.page, self.channel), event)
+        except Exception as ex:
+            # The session may have been closed while the job was running
+            print(f"Error publishing job event: {ex}")
+
+
+def _run_job(context: JobContext, target, args, kwargs):
+    """Run a job target and record its outcome."""
+    try:
+        context.check_cancelled()
+        _update_job(context.job_id, status="running", started_at=datetime.now())
+        context.publish("running", done=0, total=None)
+        message = target(context, *args, **kwargs)
+    except JobCancelled:
+        _discard_artifact(context)
+        _update_job(context.job_id, status="cancelled", finished_at=datetime.now())
+        context.publish("cancelled")
+    except Exception as ex:
+        print(f"Error in background job {context.kind}: {ex}")
+        _discard_artifact(context)
+        _update_job(context.job_id, status="failed", error=str(ex), finished_at=datetime.now())
+        context.publish("failed", error=str(ex))
+    else:
+        _update_job(
+            context.job_id, status="completed", message=message, finished_at=datetime.now(), **context._last_progress
+        )
+        context.publish("completed", message=message)
+    finally:
+        with _lock:
+            _active.pop(context.job_id, None)
+
+
+def _discard_artifact(context: JobContext):
+    """Remove a partially written artifact of an unsuccessful job."""
+    if context.result_path and os.path.exists(context.result_path):
+        try:
+            os.remove(context.result_path)
+        except OSError as ex:
+            print(f"Error removing partial artifact {context.result_path}: {ex}")
+
+
+def submit_job(kind: str, target, *args, page=None, channel: str = None, user_id=None, result_path: str = None,
+               **kwargs) -> str:
+    """Queue a job on the worker pool.
+
+    Args:
+        kind: Job type recorded in the jobs table
+        target: Callable(context, *args, **kwargs) doing the work
+        page: Flet page whose session receives the job events
+        channel: Channel of the job_topic the events are sent on
+        user_id: Submitting user
+        result_path: Path of the artifact the job produces, if any
+
+    Returns:
+        str: Job ID
+    """
+    job_id = uuid.uuid4()
+    with SessionLocal() as session:
+        session.add(Job(
+            id=job_id,
+            kind=kind,
+            status="queued",
+            result_path=result_path,
+            created_by_id=uuid.UUID(str(user_id)) if user_id else None,
+        ))
+        session.commit()
+
+    context = JobContext(job_id, kind, page=page, channel=channel, result_path=result_path)
+    context.publish("queued")
+    with _lock:
+        _active[job_id] = (context, _executor.submit(_run_job, context, target, args, kwargs))
+    return str(job_id)
+
+
+def cancel_job(job_id) -> bool:
+    """Request cancellation of a queued or running job.
+
+    Args:
+        job_id: Job ID
+
+    Returns:
+        bool: True if the job was still active
+    """
+    job_id = uuid.UUID(str(job_id))
+    with _lock:
+        active = _active.get(job_id)
+    if active is None:
+        return False
+    context, future = active
+    context._cancel_event.set()
+    if future.cancel():
+        # Never started: record the cancellation here
+        with _lock:
+            _active.pop(job_id, None)
+        _update_job(job_id, status="cancelled", finished_at=datetime.now())
+        context.publish("cancelled")
+    return True
+
+
+def get_job(job_id):
+    """Load a job record.
+
+    Args:
+        job_id: Job ID
+
+    Returns:
+        Job: Detached job record, or None
+    """
+    with SessionLocal() as session:
+        job = session.get(Job, uuid.UUID(str(job_id)))
+        if job is not None:
+            session.expunge(job)
+        return job
+
+
+def list_jobs(user_id=None, limit: int = 20) -> list:
+    """List recent jobs, newest first.
+
+    Args:
+        user_id: Only list jobs submitted by this user
+        limit: Maximum number of jobs
+
+    Returns:
+        list: Detached Job records
+    """
+    with SessionLocal() as session:
+        query = session.query(Job)
+        if user_id is not None:
+            query = query.filter(Job.created_by_id == user_id)
+        jobs = query.order_by(Job.created_at.desc()).limit(limit).all()
+        session.expunge_all()
+        return jobs
+
+
+def recover_interrupted_jobs(session) -> int:
+    """Mark jobs left queued or running by a previous process as failed.
+
+    Args:
+        session: Database session
+
+    Returns:
+        int: Number of jobs marked
+    """
+    count = session.query(Job).filter(Job.status.in_(("queued", "running"))).update(
+        {"status": "failed", "error": "Interrupted by application restart", "finished_at": datetime.now()},
+        synchronize_session=False,
+    )
+    session.commit()
+    return count
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Inspect background jobs")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    list_parser = subparsers.add_parser("list", help="List recent jobs")
+    list_parser.add_argument("--limit", type=int, default=20, help="Maximum number of jobs")
+    args = parser.parse_args()
+
+    for job in list_jobs(limit=args.limit):
+        print(
+            f"{job.id}  {job.kind:<16} {job.status:<10} "
+            f"{job.created_at:%Y-%m-%d %H:%M}  {job.result_path or job.error or ''}"
+        )
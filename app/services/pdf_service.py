@@ -0,0 +1,249 @@
+import math
+import multiprocessing
+import os
+import tempfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import datetime
+
+from app.services.export_service import count_export_rows, iter_export_batches, read_snapshot, status_summary
+
+"""Chunked, multi-process PDF rendering of logbook reports.
+
+This module provides:
+- Fixed-layout entry pages (constant row heights, so every page holds exactly
+  ROWS_PER_PAGE rows and page numbers are known before rendering)
+- Rendering of page-sized chunks in a process pool, each chunk into its own
+  part file, with a bounded number of chunks in flight
+- Merging of the parts and a final summary page into one document with a
+  consistent header and "Page N of M" footers
+- Progress callbacks while pages are rendered
+
+Requires reportlab for rendering and pypdf for merging the parts.
+"""
+
+PDF_WORKERS = int(os.getenv("PDF_WORKERS", str(os.cpu_count() or 1)))
+"""Number of rendering processes."""
+
+PAGES_PER_CHUNK = 25
+"""Entry pages rendered per process task."""
+
+PAGE_SIZE = (612.0, 792.0)
+"""US letter in points (same as reportlab.lib.pagesizes.letter)."""
+
+MARGIN = 40
+HEADER_HEIGHT = 60
+FOOTER_HEIGHT = 30
+HEADER_ROW_HEIGHT = 20
+ROW_HEIGHT = 30
+
+ROWS_PER_PAGE = int(
+    (PAGE_SIZE[1] - 2 * MARGIN - HEADER_HEIGHT - FOOTER_HEIGHT - HEADER_ROW_HEIGHT) // ROW_HEIGHT
+)
+"""Entry rows that fit on one page."""
+
+TABLE_HEADERS = ["ID", "Task", "Call Description", "Solution", "Status", "Location", "Created At"]
+COLUMN_PROPORTIONS = [0.12, 0.12, 0.20, 0.20, 0.12, 0.12, 0.12]
+
+
+def _truncate_row(row: list) -> list:
+    """Shorten long cells so each row fits its fixed height."""
+    cells = list(row)
+    if len(cells[0]) > 10:
+        cells[0] = cells[0][:8] + "..."
+    for i in (2, 3):
+        if len(cells[i]) > 30:
+            cells[i] = cells[i][:30] + "..."
+    return cells
+
+
+def _draw_frame(canvas, page_number: int, total_pages: int, generated_at: str):
+    """Draw the header and footer shared by every page."""
+    width, height = PAGE_SIZE
+    canvas.setFont("Helvetica-Bold", 16)
+    canvas.drawString(MARGIN, height - MARGIN - 18, "LogBook Report")
+    canvas.setFont("Helvetica", 9)
+    canvas.drawString(MARGIN, height - MARGIN - 36, f"Generated on: {generated_at}")
+    canvas.drawRightString(width - MARGIN, MARGIN - 10, f"Page {page_number} of {total_pages}")
+
+
+def _entries_table(rows: list):
+    """Build the styled table for one page of entries."""
+    from reportlab.lib import colors
+    from reportlab.platypus import Table, TableStyle
+
+    usable_width = PAGE_SIZE[0] - 2 * MARGIN
+    table = Table(
+        [TABLE_HEADERS] + rows,
+        colWidths=[usable_width * p for p in COLUMN_PROPORTIONS],
+        rowHeights=[HEADER_ROW_HEIGHT] + [ROW_HEIGHT] * len(rows),
+    )
+    table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.orange),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 8),
+        ('FONTSIZE', (0, 1), (-1, -1), 6),
+        ('TOPPADDING', (0, 0), (-1, -1), 1),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 1),
+        ('LEFTPADDING', (0, 0), (-1, -1), 2),
+        ('RIGHTPADDING', (0, 0), (-1, -1), 2),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black),
+    ]))
+    return table
+
+
+def _draw_table(canvas, table):
+    """Draw a table directly below the page header."""
+    width = PAGE_SIZE[0] - 2 * MARGIN
+    _, table_height = table.wrapOn(canvas, width, PAGE_SIZE[1])
+    table.drawOn(canvas, MARGIN, PAGE_SIZE[1] - MARGIN - HEADER_HEIGHT - table_height)
+
+
+def render_chunk(part_path: str, rows: list, first_page: int, total_pages: int, generated_at: str) -> int:
+    """Render a chunk of entry rows into a standalone PDF part.
+
+    Runs in a worker process; takes only picklable arguments.
+
+    Args:
+        part_path: Output path of the part
+        rows: Formatted entry rows (at most PAGES_PER_CHUNK * ROWS_PER_PAGE)
+        first_page: Page number of the chunk's first page in the final document
+        total_pages: Page count of the final document
+        generated_at: Timestamp printed in every header
+
+    Returns:
+        int: Number of pages rendered
+    """
+    from reportlab.pdfgen.canvas import Canvas
+
+    canvas = Canvas(part_path, pagesize=PAGE_SIZE)
+    pages = 0
+    for start in range(0, len(rows), ROWS_PER_PAGE):
+        _draw_frame(canvas, first_page + pages, total_pages, generated_at)
+        _draw_table(canvas, _entries_table([_truncate_row(row) for row in rows[start:start + ROWS_PER_PAGE]]))
+        canvas.showPage()
+        pages += 1
+    canvas.save()
+    return pages
+
+
+def render_summary(part_path: str, total_entries: int, status_counts: list, page_number: int, generated_at: str):
+    """Render the summary statistics page.
+
+    Args:
+        part_path: Output path of the part
+        total_entries: Number of exported entries
+        status_counts: (status, count) tuples
+        page_number: Page number of the summary (the last page)
+        generated_at: Timestamp printed in the header
+    """
+    from reportlab.lib import colors
+    from reportlab.pdfgen.canvas import Canvas
+    from reportlab.platypus import Table, TableStyle
+
+    canvas = Canvas(part_path, pagesize=PAGE_SIZE)
+    _draw_frame(canvas, page_number, page_number, generated_at)
+    canvas.setFont("Helvetica-Bold", 13)
+    canvas.drawString(MARGIN, PAGE_SIZE[1] - MARGIN - HEADER_HEIGHT, "Summary Statistics")
+
+    status_table = Table(
+        [["Status", "Count"]] + [[status or "Unknown", str(count)] for status, count in status_counts]
+        + [["Total", str(total_entries)]],
+        colWidths=[100, 60],
+    )
+    status_table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.orange),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 10),
+        ('FONTSIZE', (0, 1), (-1, -1), 9),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black),
+    ]))
+    width = PAGE_SIZE[0] - 2 * MARGIN
+    _, table_height = status_table.wrapOn(canvas, width, PAGE_SIZE[1])
+    status_table.drawOn(canvas, MARGIN, PAGE_SIZE[1] - MARGIN - HEADER_HEIGHT - 20 - table_height)
+    canvas.showPage()
+    canvas.save()
+
+
+def _iter_chunks(session, filters, chunk_rows: int):
+    """Regroup the export's database batches into rendering chunks."""
+    chunk = []
+    for batch in iter_export_batches(session, filters):
+        for row in batch:
+            chunk.append(row)
+            if len(chunk) == chunk_rows:
+                yield chunk
+                chunk = []
+    if chunk:
+        yield chunk
+
+
+def write_pdf(file_path: str, session, filters=None, progress=None, workers: int = None):
+    """Render an entries report PDF using a process pool.
+
+    The page count, the entry rows and the summary are read in one read
+    transaction (see read_snapshot), so they agree even while entries are
+    written. Workers are spawned rather than forked, as the application has
+    other threads running that a forked child would inherit mid-operation.
+
+    Args:
+        file_path: Destination path
+        session: Database session
+        filters: Optional list of extra SQLAlchemy filter expressions
+        progress: Optional callback(pages_done, total_pages) called as parts finish
+        workers: Number of rendering processes (default: PDF_WORKERS)
+    """
+    from pypdf import PdfWriter
+
+    generated_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    chunk_rows = ROWS_PER_PAGE * PAGES_PER_CHUNK
+    workers = workers or PDF_WORKERS
+
+    with tempfile.TemporaryDirectory(prefix="logbook_pdf_") as work_dir, read_snapshot(session) as connection:
+        total_entries = count_export_rows(connection, filters)
+        entry_pages = math.ceil(total_entries / ROWS_PER_PAGE)
+        total_pages = entry_pages + 1
+        part_paths = []
+        pages_done = 0
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+            pending = set()
+            for index, chunk in enumerate(_iter_chunks(connection, filters, chunk_rows)):
+                # Bound the chunks held in memory while workers catch up
+                if len(pending) >= workers * 2:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        pages_done += future.result()
+                        if progress:
+                            progress(pages_done, total_pages)
+                part_path = os.path.join(work_dir, f"part_{index:06d}.pdf")
+                part_paths.append(part_path)
+                first_page = index * PAGES_PER_CHUNK + 1
+                pending.add(executor.submit(render_chunk, part_path, chunk, first_page, total_pages, generated_at))
+
+            for future in wait(pending).done:
+                pages_done += future.result()
+                if progress:
+                    progress(pages_done, total_pages)
+
+        summary_path = os.path.join(work_dir, "summary.pdf")
+        render_summary(summary_path, total_entries, status_summary(connection, filters), total_pages, generated_at)
+        part_paths.append(summary_path)
+
+        writer = PdfWriter()
+        for part_path in part_paths:
+            writer.append(part_path)
+        with open(file_path, "wb") as output:
+            writer.write(output)
+        writer.close()
+
+    if progress:
+        progress(total_pages, total_pages)
@@ -0,0 +1,135 @@
+from datetime import date, datetime, timedelta
+
+from app.db.models import LIVE_ENTRY_CONDITION, LogbookEntry, StatusEnum
+
+"""Report filters compiled into SQL predicates.
+
+This module provides:
+- ReportFilter, built from the reports view's filter selection
+- One list of SQLAlchemy predicates per filter, passed as the `filters`
+  argument of the stats, timeseries and chart queries
+- A hashable key identifying the filter in the chart cache
+
+Date bounds compile to half-open created_at ranges and the other criteria to
+equality tests, so each predicate can use the logbook_entries indexes.
+"""
+
+ALL_VALUES = "all"
+"""Dropdown value selecting every task, technician or status."""
+
+DATE_FORMAT = "%Y-%m-%d"
+
+
+class ReportFilter:
+    """Filter selection applied to every report aggregate.
+
+    Attributes:
+        start_date: First day included, or None
+        end_date: Last day included, or None
+        task: Task name, or None for all tasks
+        technician: Responsible person, or None for all technicians
+        status: StatusEnum, or None for all statuses
+    """
+
+    def __init__(self, start_date: date = None, end_date: date = None, task: str = None, technician: str = None,
+                 status: StatusEnum = None):
+        self.start_date = start_date
+        self.end_date = end_date
+        self.task = task
+        self.technician = technician
+        self.status = status
+        self._predicates = self._compile()
+
+    @classmethod
+    def from_filter_data(cls, filter_data: dict = None) -> "ReportFilter":
+        """Build a filter from the values collected by ReportFilters.apply_filters.
+
+        Args:
+            filter_data: Dictionary with start_date/end_date ("YYYY-MM-DD"), task,
+                technician and status; "all" or empty values do not filter
+
+        Returns:
+            ReportFilter: The filter
+
+        Raises:
+            ValueError: If a date or status value is invalid
+        """
+        filter_data = filter_data or {}
+
+        def selected(name):
+            value = filter_data.get(name)
+            return None if value in (None, "", ALL_VALUES) else value
+
+        start_date = selected("start_date")
+        end_date = selected("end_date")
+        status = selected("status")
+        return cls(
+            start_date=datetime.strptime(start_date, DATE_FORMAT).date() if start_date else None,
+            end_date=datetime.strptime(end_date, DATE_FORMAT).date() if end_date else None,
+            task=selected("task"),
+            technician=selected("technician"),
+            status=StatusEnum(status) if status else None,
+        )
+
+    def _compile(self) -> tuple:
+        """Translate the selection into SQL predicates."""
+        predicates = []
+        if self.start_date is not None:
+            predicates.append(LogbookEntry.created_at >= datetime.combine(self.start_date, datetime.min.time()))
+        if self.end_date is not None:
+            # Half-open upper bound so the whole end day is included
+            predicates.append(
+                LogbookEntry.created_at < datetime.combine(self.end_date + timedelta(days=1), datetime.min.time())
+            )
+        if self.task is not None:
+            predicates.append(LogbookEntry.task == self.task)
+        if self.technician is not None:
+            predicates.append(LogbookEntry.responsible_person == self.technician)
+        if self.status is not None:
+            predicates.append(LogbookEntry.status == self.status)
+        return tuple(predicates)
+
+    @property
+    def predicates(self) -> list:
+        """SQL predicates to pass as the filters argument of aggregate queries."""
+        return list(self._predicates)
+
+    @property
+    def is_empty(self) -> bool:
+        """Whether the filter selects every entry."""
+        return not self._predicates
+
+    @property
+    def dates_only(self) -> bool:
+        """Whether only the date range is restricted (answerable from the daily rollup)."""
+        return self.task is None and self.technician is None and self.status is None
+
+    @property
+    def key(self) -> tuple:
+        """Hashable identity of the filter, used in cache keys."""
+        return (
+            self.start_date.isoformat() if self.start_date else None,
+            self.end_date.isoformat() if self.end_date else None,
+            self.task,
+            self.technician,
+            self.status.value if self.status else None,
+        )
+
+    def __repr__(self) -> str:
+        return f"ReportFilter{self.key}"
+
+
+def technician_names(session, limit: int = 200) -> list:
+    """List the responsible persons of non-deleted entries for the technician filter.
+
+    Args:
+        session: Database session
+        limit: Maximum number of names
+
+    Returns:
+        list: Names in alphabetical order
+    """
+    rows = session.query(LogbookEntry.responsible_person).filter(
+        LIVE_ENTRY_CONDITION, LogbookEntry.responsible_person != None
+    ).group_by(LogbookEntry.responsible_person).order_by(LogbookEntry.responsible_person).limit(limit)
+    return [name for name, in rows]
@@ -0,0 +1,261 @@
+from datetime import date
+from sqlalchemy import event, func, or_, select
+from sqlalchemy.dialects import postgresql, sqlite
+
+from app.db.database import SessionLocal
+from app.db.models import LogbookDailyRollup, LogbookEntry, StatusEnum
+from app.services.stats_service import build_stats, resolution_hours_expression
+from app.services.timeseries_service import bucket_expression
+
+"""Incrementally maintained daily rollup of logbook entries.
+
+This module provides:
+- Flush hooks keeping logbook_daily_rollup in sync with inserts, updates,
+  soft deletes and hard deletes of LogbookEntry rows
+- A full rebuild of the rollup from logbook_entries
+- Dashboard statistics read from the rollup instead of the entries table
+
+Bulk query.update()/query.delete() calls bypass the flush hooks; run
+`python -m app.services.rollup_service rebuild` after such maintenance.
+"""
+
+ROLLUP_KEY = ("day", "location_id", "category_id", "status", "priority")
+"""Primary key columns of the rollup table."""
+
+ROLLUP_MEASURES = ("entry_count", "downtime_hours", "resolved_count", "resolution_minutes")
+"""Additive measure columns of the rollup table."""
+
+_ENTRY_COLUMNS = (
+    LogbookEntry.created_at,
+    LogbookEntry.location_id,
+    LogbookEntry.category_id,
+    LogbookEntry.status,
+    LogbookEntry.priority,
+    LogbookEntry.downtime_hours,
+    LogbookEntry.resolution_time,
+)
+
+_ID_CHUNK_SIZE = 500
+"""Maximum number of ids per IN clause (stays below SQLite's variable limit)."""
+
+
+def _rollup_key(created_at, location_id, category_id, status, priority):
+    """Map entry attributes to a rollup primary key tuple."""
+    day = created_at.date() if created_at else date.today()
+    return (
+        day,
+        location_id,
+        category_id or 0,
+        status.value if status else "",
+        priority.value if priority else "",
+    )
+
+
+def _add_contribution(totals: dict, key, measures, sign: int = 1):
+    """Accumulate signed measures for a rollup key."""
+    current = totals.setdefault(key, [0, 0.0, 0, 0.0])
+    for i, value in enumerate(measures):
+        current[i] += sign * value
+
+
+def _collect_contributions(connection, entry_ids) -> dict:
+    """Read the current rollup contribution of a set of entries.
+
+    Args:
+        connection: Connection bound to the flushing transaction
+        entry_ids: Ids of the entries to read
+
+    Returns:
+        dict: {rollup key: [entry_count, downtime_hours, resolved_count, resolution_minutes]}
+    """
+    totals = {}
+    entry_ids = list(entry_ids)
+    for i in range(0, len(entry_ids), _ID_CHUNK_SIZE):
+        rows = connection.execute(
+            select(*_ENTRY_COLUMNS).where(
+                LogbookEntry.id.in_(entry_ids[i:i + _ID_CHUNK_SIZE]),
+                or_(LogbookEntry.is_deleted == False, LogbookEntry.is_deleted == None)
+            )
+        )
+        for created_at, location_id, category_id, status, priority, downtime, resolution_time in rows:
+            key = _rollup_key(created_at, location_id, category_id, status, priority)
+            resolved = 1 if resolution_time else 0
+            minutes = resolution_time.hour * 60 + resolution_time.minute if resolution_time else 0
+            _add_contribution(totals, key, (1, downtime or 0.0, resolved, minutes))
+    return totals
+
+
+def _upsert_statement(dialect_name: str):
+    """Return the dialect-specific INSERT construct supporting ON CONFLICT."""
+    if dialect_name == "postgresql":
+        return postgresql.insert(LogbookDailyRollup)
+    return sqlite.insert(LogbookDailyRollup)
+
+
+def apply_deltas(connection, deltas: dict):
+    """Add signed measure deltas to the rollup table.
+
+    Args:
+        connection: Connection bound to the current transaction
+        deltas: {rollup key: [entry_count, downtime_hours, resolved_count, resolution_minutes]}
+    """
+    rows = [
+        dict(zip(ROLLUP_KEY + ROLLUP_MEASURES, tuple(key) + tuple(measures)))
+        for key, measures in deltas.items()
+        if any(measures)
+    ]
+    if not rows:
+        return
+
+    stmt = _upsert_statement(connection.dialect.name).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=list(ROLLUP_KEY),
+        set_={
+            name: getattr(LogbookDailyRollup, name) + getattr(stmt.excluded, name)
+            for name in ROLLUP_MEASURES
+        },
+    )
+    connection.execute(stmt)
+
+
+@event.listens_for(SessionLocal, "before_flush")
+def _capture_previous_contributions(session, flush_context, instances):
+    """Record the pre-flush rollup contribution of changed and deleted entries."""
+    entry_ids = [
+        obj.id for obj in session.dirty | session.deleted
+        if isinstance(obj, LogbookEntry) and obj.id is not None
+    ]
+    if entry_ids:
+        previous = session.info.setdefault("rollup_previous", {})
+        for key, measures in _collect_contributions(session.connection(), entry_ids).items():
+            _add_contribution(previous, key, measures)
+
+
+@event.listens_for(SessionLocal, "after_flush")
+def _apply_rollup_changes(session, flush_context):
+    """Apply the difference between post-flush and pre-flush contributions."""
+    previous = session.info.pop("rollup_previous", {})
+    entry_ids = [
+        obj.id for obj in session.new | session.dirty
+        if isinstance(obj, LogbookEntry) and obj.id is not None
+    ]
+    if not entry_ids and not previous:
+        return
+
+    deltas = _collect_contributions(session.connection(), entry_ids)
+    for key, measures in previous.items():
+        _add_contribution(deltas, key, measures, sign=-1)
+    apply_deltas(session.connection(), deltas)
+
+
+@event.listens_for(SessionLocal, "after_rollback")
+def _discard_previous_contributions(session):
+    """Drop captured contributions when a flush is rolled back."""
+    session.info.pop("rollup_previous", None)
+
+
+def rebuild_rollup(session):
+    """Recompute the whole rollup table from logbook_entries.
+
+    Args:
+        session: Database session; the caller is responsible for committing
+    """
+    dialect_name = session.get_bind().dialect.name
+    day = bucket_expression(LogbookEntry.created_at, "day", dialect_name)
+    minutes = resolution_hours_expression(dialect_name) * 60
+
+    grouped = session.query(
+        day,
+        LogbookEntry.location_id,
+        LogbookEntry.category_id,
+        LogbookEntry.status,
+        LogbookEntry.priority,
+        func.count(LogbookEntry.id),
+        func.sum(LogbookEntry.downtime_hours),
+        func.count(LogbookEntry.resolution_time),
+        func.sum(minutes),
+    ).filter(
+        or_(LogbookEntry.is_deleted == False, LogbookEntry.is_deleted == None)
+    ).group_by(
+        day,
+        LogbookEntry.location_id,
+        LogbookEntry.category_id,
+        LogbookEntry.status,
+        LogbookEntry.priority,
+    ).all()
+
+    # Rows sharing a key after NULL mapping (e.g. NULL and 0 category) are merged here
+    totals = {}
+    for day_key, location_id, category_id, status, priority, count, downtime, resolved, resolved_minutes in grouped:
+        key = (date.fromisoformat(day_key), location_id, category_id or 0,
+               status.value if status else "", priority.value if priority else "")
+        _add_contribution(totals, key, (count, downtime or 0.0, resolved, resolved_minutes or 0.0))
+
+    session.query(LogbookDailyRollup).delete()
+    apply_deltas(session.connection(), totals)
+
+
+def ensure_rollup(session):
+    """Build the rollup if it is empty while entries exist (e.g. after upgrading).
+
+    Args:
+        session: Database session
+    """
+    if session.query(LogbookDailyRollup.day).first() is None and session.query(LogbookEntry.id).first() is not None:
+        rebuild_rollup(session)
+        session.commit()
+
+
+def get_rollup_stats(session, start_day=None, end_day=None) -> dict:
+    """Compute dashboard statistics from the rollup table.
+
+    Args:
+        session: Database session
+        start_day: Optional first day to include
+        end_day: Optional last day to include
+
+    Returns:
+        dict: Same structure as stats_service.get_entry_stats
+    """
+    query = session.query(
+        LogbookDailyRollup.status,
+        func.sum(LogbookDailyRollup.entry_count),
+        func.sum(LogbookDailyRollup.resolved_count),
+        func.sum(LogbookDailyRollup.resolution_minutes),
+    )
+    if start_day is not None:
+        query = query.filter(LogbookDailyRollup.day >= start_day)
+    if end_day is not None:
+        query = query.filter(LogbookDailyRollup.day <= end_day)
+
+    total = 0
+    counts = {}
+    averages = {}
+    for status_value, count, resolved, minutes in query.group_by(LogbookDailyRollup.status).all():
+        if not status_value:
+            total += count or 0
+            continue
+        status = StatusEnum(status_value)
+        counts[status] = int(count or 0)
+        averages[status] = (minutes or 0) / resolved / 60 if resolved else 0.0
+        total += counts[status]
+    return build_stats(total, counts, averages)
+
+
+if __name__ == "__main__":
+    """Command line entry point for rollup maintenance.
+
+    Usage:
+        python -m app.services.rollup_service rebuild
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Maintain the logbook daily rollup table")
+    parser.add_argument("command", choices=["rebuild"], help="Maintenance command to run")
+    args = parser.parse_args()
+
+    with SessionLocal() as session:
+        rebuild_rollup(session)
+        session.commit()
+        row_count = session.query(func.count()).select_from(LogbookDailyRollup).scalar()
+    print(f"Rebuilt logbook_daily_rollup with {row_count} rows")
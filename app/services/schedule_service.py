@@ -0,0 +1,421 @@
+import calendar
+import heapq
+import os
+import smtplib
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from email.message import EmailMessage
+from dotenv import load_dotenv
+from sqlalchemy import select, update
+
+from app.db.database import SessionLocal
+from app.db.models import LogbookEntry, Report, ReportSchedule
+
+"""Execution of scheduled reports.
+
+This module provides:
+- next_run computation for daily, weekly and monthly schedules
+- A scheduler thread keeping a min-heap of next_run times, sleeping until the
+  earliest schedule is due (or a schedule changes) instead of polling the table
+- Rendering of due reports on a bounded worker pool and delivery over SMTP
+- An atomic compare-and-set of next_run, so only one of several app processes
+  sends a given run
+
+Report types map to export formats: summary -> PDF, detailed -> Excel,
+custom -> CSV. Times are local wall-clock times.
+
+To try delivery locally, run a debugging SMTP server and point SMTP_HOST /
+SMTP_PORT at it:
+    python -m smtpd -n -c DebuggingServer localhost:1025   (Python < 3.12)
+    python -m aiosmtpd -n -l localhost:1025
+
+Usage:
+    python -m app.services.schedule_service run
+    python -m app.services.schedule_service list
+"""
+
+# Load environment variables
+load_dotenv()
+
+SMTP_HOST = os.getenv("SMTP_HOST", "localhost")
+SMTP_PORT = int(os.getenv("SMTP_PORT", "25"))
+SMTP_USERNAME = os.getenv("SMTP_USERNAME")
+SMTP_PASSWORD = os.getenv("SMTP_PASSWORD")
+SMTP_USE_TLS = os.getenv("SMTP_USE_TLS", "false").lower() == "true"
+SMTP_FROM = os.getenv("SMTP_FROM", "preventplus@localhost")
+
+SCHEDULER_WORKERS = int(os.getenv("SCHEDULER_WORKERS", "2"))
+"""Number of reports rendered and sent concurrently."""
+
+SCHEDULER_RESYNC_SECONDS = float(os.getenv("SCHEDULER_RESYNC_SECONDS", "900"))
+"""Interval for reloading schedules changed by other processes."""
+
+DEFAULT_TIME_OF_DAY = "07:00"
+
+REPORT_FORMATS = {
+    "summary": ("PDF", ".pdf", "application/pdf"),
+    "detailed": ("Excel", ".xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+    "custom": ("CSV", ".csv", "text/csv"),
+}
+"""{report type: (file type, file extension, MIME type)}"""
+
+
+def _add_months(moment: datetime, months: int, day: int) -> datetime:
+    """Move a datetime by whole months, clamping the day to the month length."""
+    month_index = moment.month - 1 + months
+    year, month = moment.year + month_index // 12, month_index % 12 + 1
+    return moment.replace(year=year, month=month, day=min(day, calendar.monthrange(year, month)[1]))
+
+
+def compute_next_run(schedule: ReportSchedule, after: datetime) -> datetime:
+    """Compute the first run of a schedule strictly after a point in time.
+
+    Args:
+        schedule: Report schedule
+        after: Reference time
+
+    Returns:
+        datetime: Next run time
+
+    Raises:
+        ValueError: If the frequency is unknown
+    """
+    hour, minute = (int(part) for part in (schedule.time_of_day or DEFAULT_TIME_OF_DAY).split(":"))
+    candidate = after.replace(hour=hour, minute=minute, second=0, microsecond=0)
+
+    if schedule.frequency == "daily":
+        if candidate <= after:
+            candidate += timedelta(days=1)
+    elif schedule.frequency == "weekly":
+        # day_of_week uses Monday=0, like datetime.weekday()
+        candidate += timedelta(days=((schedule.day_of_week or 0) - candidate.weekday()) % 7)
+        if candidate <= after:
+            candidate += timedelta(days=7)
+    elif schedule.frequency == "monthly":
+        day = schedule.day_of_month or 1
+        candidate = _add_months(candidate, 0, day)
+        if candidate <= after:
+            candidate = _add_months(candidate, 1, day)
+    else:
+        raise ValueError(f"Unknown schedule frequency: {schedule.frequency}")
+    return candidate
+
+
+def report_period(schedule: ReportSchedule, due: datetime) -> tuple:
+    """Return the entry creation period covered by a scheduled run.
+
+    Args:
+        schedule: Report schedule
+        due: Time the run was due
+
+    Returns:
+        tuple: (start, end) datetimes; start is the previous run
+    """
+    if schedule.last_run:
+        return schedule.last_run, due
+    if schedule.frequency == "monthly":
+        return _add_months(due, -1, due.day), due
+    return due - timedelta(days=7 if schedule.frequency == "weekly" else 1), due
+
+
+def claim_run(session, schedule_id: int, due: datetime, next_run: datetime) -> bool:
+    """Atomically advance a schedule past a due run.
+
+    The update only matches while next_run still equals the due time, so of
+    several processes racing for the same run exactly one succeeds.
+
+    Args:
+        session: Database session
+        schedule_id: Schedule ID
+        due: next_run value the caller found due
+        next_run: Following run time
+
+    Returns:
+        bool: True if this caller owns the run
+    """
+    result = session.execute(
+        update(ReportSchedule)
+        .where(ReportSchedule.id == schedule_id, ReportSchedule.next_run == due, ReportSchedule.is_active == True)
+        .values(next_run=next_run, last_run=due)
+    )
+    session.commit()
+    return result.rowcount == 1
+
+
+def render_report(session, report_type: str, start: datetime, end: datetime, file_path: str):
+    """Render the entries created in a period to a report file.
+
+    Identical reports (e.g. the same period for several schedules) are served
+    from the report artifact cache.
+
+    Args:
+        session: Database session
+        report_type: summary, detailed or custom
+        start: Period start (inclusive)
+        end: Period end (exclusive)
+        file_path: Destination path
+    """
+    from app.services.artifact_service import cached_report
+    from app.services.export_service import write_csv, write_excel
+    from app.services.pdf_service import write_pdf
+
+    filters = [LogbookEntry.created_at >= start, LogbookEntry.created_at < end]
+    file_type, extension, _ = REPORT_FORMATS.get(report_type, REPORT_FORMATS["summary"])
+    writer = {"PDF": write_pdf, "Excel": write_excel}.get(file_type, write_csv)
+    cached_report(
+        session,
+        file_path,
+        extension.lstrip("."),
+        lambda path: writer(path, session, filters),
+        parameters={"start_date": start, "end_date": end},
+        filters=filters,
+    )
+
+
+def send_report(recipients: list, subject: str, body: str, file_path: str, filename: str, mime_type: str):
+    """Email a report file as an attachment.
+
+    Args:
+        recipients: Recipient addresses
+        subject: Message subject
+        body: Plain-text message body
+        file_path: Path of the attachment
+        filename: Attachment file name
+        mime_type: Attachment MIME type
+    """
+    message = EmailMessage()
+    message["From"] = SMTP_FROM
+    message["To"] = ", ".join(recipients)
+    message["Subject"] = subject
+    message.set_content(body)
+    maintype, subtype = mime_type.split("/", 1)
+    with open(file_path, "rb") as attachment:
+        message.add_attachment(attachment.read(), maintype=maintype, subtype=subtype, filename=filename)
+
+    with smtplib.SMTP(SMTP_HOST, SMTP_PORT, timeout=30) as smtp:
+        if SMTP_USE_TLS:
+            smtp.starttls()
+        if SMTP_USERNAME:
+            smtp.login(SMTP_USERNAME, SMTP_PASSWORD or "")
+        smtp.send_message(message)
+
+
+def execute_run(schedule_id: int, start: datetime, end: datetime):
+    """Render and send one claimed scheduled run.
+
+    Args:
+        schedule_id: Schedule ID
+        start: Start of the reported period
+        end: End of the reported period (the time the run was due)
+    """
+    with SessionLocal() as session:
+        schedule = session.get(ReportSchedule, schedule_id)
+        report = session.get(Report, schedule.report_id)
+        report_type = (report.parameters or {}).get("report_type", "summary")
+        file_type, extension, mime_type = REPORT_FORMATS.get(report_type, REPORT_FORMATS["summary"])
+        recipients = list(schedule.recipients or [])
+
+        with tempfile.TemporaryDirectory(prefix="logbook_schedule_") as work_dir:
+            filename = f"{report.name} {end:%Y-%m-%d}{extension}".replace("/", "-")
+            file_path = os.path.join(work_dir, filename)
+            render_report(session, report_type, start, end, file_path)
+            send_report(
+                recipients,
+                subject=f"{report.name} ({start:%Y-%m-%d} to {end:%Y-%m-%d})",
+                body=f"Attached is the {schedule.frequency} {file_type} report for entries created "
+                     f"between {start:%Y-%m-%d %H:%M} and {end:%Y-%m-%d %H:%M}.",
+                file_path=file_path,
+                filename=filename,
+                mime_type=mime_type,
+            )
+    print(f"Scheduled report {schedule_id} sent to {len(recipients)} recipient(s)")
+
+
+class ReportScheduler:
+    """Scheduler thread running due report schedules.
+
+    Holds a min-heap of (next_run, schedule id). The thread sleeps until the
+    earliest entry is due, a schedule is changed through notify(), or the
+    periodic resync picks up schedules changed by other processes. Heap
+    entries may be stale; claim_run() rejects them and the current row is
+    pushed back instead.
+    """
+
+    def __init__(self, workers: int = SCHEDULER_WORKERS):
+        self._heap = []
+        self._condition = threading.Condition()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="report-schedule")
+        self._thread = None
+        self._stopped = False
+        self._resync_at = None
+
+    def start(self):
+        """Load the active schedules and start the scheduler thread."""
+        self.resync()
+        self._thread = threading.Thread(target=self._run, name="report-scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the scheduler thread and wait for running reports."""
+        with self._condition:
+            self._stopped = True
+            self._condition.notify()
+        if self._thread:
+            self._thread.join()
+        self._executor.shutdown(wait=True)
+
+    def resync(self):
+        """Rebuild the heap from the active schedules in the database.
+
+        Schedules without a next_run get one, set only if still unset.
+        """
+        now = datetime.now()
+        entries = []
+        with SessionLocal() as session:
+            for schedule in session.scalars(select(ReportSchedule).where(ReportSchedule.is_active == True)):
+                if schedule.next_run is None:
+                    session.execute(
+                        update(ReportSchedule)
+                        .where(ReportSchedule.id == schedule.id, ReportSchedule.next_run == None)
+                        .values(next_run=compute_next_run(schedule, now))
+                    )
+                    session.commit()
+                    session.refresh(schedule)
+                entries.append((schedule.next_run, schedule.id))
+        heapq.heapify(entries)
+        with self._condition:
+            self._heap = entries
+            self._resync_at = now + timedelta(seconds=SCHEDULER_RESYNC_SECONDS)
+            self._condition.notify()
+
+    def notify(self, schedule_id: int):
+        """Reload one schedule after it was created or changed in this process.
+
+        Args:
+            schedule_id: Schedule ID
+        """
+        with SessionLocal() as session:
+            schedule = session.get(ReportSchedule, schedule_id)
+            if schedule is None or not schedule.is_active or schedule.next_run is None:
+                return
+            entry = (schedule.next_run, schedule.id)
+        with self._condition:
+            heapq.heappush(self._heap, entry)
+            self._condition.notify()
+
+    def _run(self):
+        """Scheduler loop: sleep until the earliest run is due, then dispatch it."""
+        while True:
+            with self._condition:
+                while not self._stopped:
+                    now = datetime.now()
+                    wake_at = self._resync_at
+                    if self._heap and self._heap[0][0] < wake_at:
+                        wake_at = self._heap[0][0]
+                    if wake_at <= now:
+                        break
+                    self._condition.wait((wake_at - now).total_seconds())
+                if self._stopped:
+                    return
+                due_entry = heapq.heappop(self._heap) if self._heap and self._heap[0][0] <= now else None
+
+            try:
+                if due_entry is None:
+                    self.resync()
+                else:
+                    self._dispatch(*due_entry)
+            except Exception as ex:
+                print(f"Error in report scheduler: {ex}")
+
+    def _dispatch(self, due: datetime, schedule_id: int):
+        """Claim a due run and hand it to the worker pool."""
+        now = datetime.now()
+        with SessionLocal() as session:
+            schedule = session.get(ReportSchedule, schedule_id)
+            if schedule is None or not schedule.is_active:
+                return
+            if schedule.next_run != due:
+                # Stale heap entry: the schedule was changed or run elsewhere
+                if schedule.next_run is not None:
+                    with self._condition:
+                        heapq.heappush(self._heap, (schedule.next_run, schedule_id))
+                return
+            start, end = report_period(schedule, due)
+            # Runs missed while no process was up are sent once, not replayed
+            next_run = compute_next_run(schedule, max(now, due))
+            claimed = claim_run(session, schedule_id, due, next_run)
+
+        with self._condition:
+            heapq.heappush(self._heap, (next_run, schedule_id))
+        if claimed:
+            self._executor.submit(self._execute, schedule_id, start, end)
+
+    @staticmethod
+    def _execute(schedule_id: int, start: datetime, end: datetime):
+        """Run one report on the worker pool, logging failures."""
+        try:
+            execute_run(schedule_id, start, end)
+        except Exception as ex:
+            print(f"Error sending scheduled report {schedule_id}: {ex}")
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def start_scheduler() -> ReportScheduler:
+    """Start this process's report scheduler (once).
+
+    Returns:
+        ReportScheduler: The running scheduler
+    """
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = ReportScheduler()
+            _scheduler.start()
+        return _scheduler
+
+
+def notify_schedule_changed(schedule_id: int):
+    """Tell the running scheduler, if any, that a schedule was created or changed.
+
+    Args:
+        schedule_id: Schedule ID
+    """
+    if _scheduler is not None:
+        _scheduler.notify(schedule_id)
+
+
+if __name__ == "__main__":
+    """Command line entry point for the report scheduler.
+
+    Usage:
+        python -m app.services.schedule_service run
+        python -m app.services.schedule_service list
+    """
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Run or inspect scheduled reports")
+    parser.add_argument("command", choices=["run", "list"], help="Scheduler command to run")
+    args = parser.parse_args()
+
+    if args.command == "list":
+        with SessionLocal() as session:
+            for schedule in session.scalars(select(ReportSchedule).order_by(ReportSchedule.next_run)):
+                print(
+                    f"{schedule.id:>5}  {schedule.frequency:<8} {'active' if schedule.is_active else 'paused':<7}"
+                    f"  next {schedule.next_run or '-'}  last {schedule.last_run or '-'}"
+                    f"  {', '.join(schedule.recipients or [])}"
+                )
+    else:
+        scheduler = start_scheduler()
+        print(f"Report scheduler running (SMTP {SMTP_HOST}:{SMTP_PORT}); press Ctrl+C to stop")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            scheduler.stop()
@@ -0,0 +1,168 @@
+import re
+from sqlalchemy import func, inspect, literal_column, or_, select, text
+from sqlalchemy.sql import column, table
+
+from app.db.models import LogbookEntry
+
+"""Full-text search over logbook entry text columns.
+
+This module provides:
+- An SQLite FTS5 index (external content table kept in sync by triggers)
+- A PostgreSQL tsvector GIN expression index as the equivalent on that backend
+- Query helpers that restrict and rank LogbookEntry queries by relevance,
+  falling back to ILIKE when no index is available
+
+The FTS5 index references logbook_entries by rowid. VACUUM may renumber
+rowids of tables without an INTEGER PRIMARY KEY, so run
+`python -m app.services.search_service rebuild` after vacuuming.
+"""
+
+SEARCH_COLUMNS = ("call_description", "solution_description", "device", "task", "responsible_person")
+"""LogbookEntry columns covered by the full-text index."""
+
+FTS_TABLE = "logbook_entries_fts"
+"""Name of the SQLite FTS5 virtual table."""
+
+PG_SEARCH_INDEX = "ix_logbook_entries_search"
+"""Name of the PostgreSQL GIN index."""
+
+PG_TSVECTOR_SQL = "to_tsvector('simple', {})".format(
+    " || ' ' || ".join(f"coalesce({name}, '')" for name in SEARCH_COLUMNS)
+)
+"""Indexed tsvector expression; queries must use exactly this expression to hit the index."""
+
+_fts_table = table(FTS_TABLE, column("rowid"))
+_index_available = {}
+
+
+def _sqlite_ddl():
+    """Return the statements creating the FTS5 table and its sync triggers."""
+    columns = ", ".join(SEARCH_COLUMNS)
+    new_values = ", ".join(f"new.{name}" for name in SEARCH_COLUMNS)
+    old_values = ", ".join(f"old.{name}" for name in SEARCH_COLUMNS)
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+        f"{columns}, content='logbook_entries', content_rowid='rowid')",
+        f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON logbook_entries BEGIN "
+        f"INSERT INTO {FTS_TABLE}(rowid, {columns}) VALUES (new.rowid, {new_values}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON logbook_entries BEGIN "
+        f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {columns}) VALUES ('delete', old.rowid, {old_values}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF {columns} ON logbook_entries BEGIN "
+        f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {columns}) VALUES ('delete', old.rowid, {old_values}); "
+        f"INSERT INTO {FTS_TABLE}(rowid, {columns}) VALUES (new.rowid, {new_values}); END",
+    ]
+
+
+def ensure_search_index(engine):
+    """Create the full-text index for the engine's backend if it does not exist.
+
+    Args:
+        engine: SQLAlchemy engine (SQLite or PostgreSQL)
+    """
+    dialect_name = engine.dialect.name
+    with engine.begin() as connection:
+        if dialect_name == "sqlite":
+            created = not inspect(connection).has_table(FTS_TABLE)
+            for statement in _sqlite_ddl():
+                connection.execute(text(statement))
+            if created:
+                # Index rows that existed before the table was created
+                connection.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"))
+        elif dialect_name == "postgresql":
+            connection.execute(text(
+                f"CREATE INDEX IF NOT EXISTS {PG_SEARCH_INDEX} ON logbook_entries USING GIN ({PG_TSVECTOR_SQL})"
+            ))
+    _index_available.pop(engine.url, None)
+
+
+def rebuild_search_index(engine):
+    """Recompute the SQLite FTS5 index from logbook_entries.
+
+    Args:
+        engine: SQLAlchemy engine
+    """
+    ensure_search_index(engine)
+    if engine.dialect.name == "sqlite":
+        with engine.begin() as connection:
+            connection.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"))
+
+
+def _has_search_index(session) -> bool:
+    """Check (once per database) whether the full-text index exists."""
+    bind = session.get_bind()
+    if bind.url not in _index_available:
+        if bind.dialect.name == "sqlite":
+            _index_available[bind.url] = inspect(bind).has_table(FTS_TABLE)
+        elif bind.dialect.name == "postgresql":
+            indexes = inspect(bind).get_indexes("logbook_entries")
+            _index_available[bind.url] = any(index["name"] == PG_SEARCH_INDEX for index in indexes)
+        else:
+            _index_available[bind.url] = False
+    return _index_available[bind.url]
+
+
+def _search_terms(search_text: str):
+    """Split user input into word tokens, dropping query-syntax characters."""
+    return re.findall(r"\w+", search_text or "")
+
+
+def apply_text_search(query, session, search_text: str, rank: bool = False):
+    """Restrict a LogbookEntry query to entries matching the search text.
+
+    Every word must match (as a prefix, for type-ahead search) in any of the
+    SEARCH_COLUMNS.
+
+    Args:
+        query: LogbookEntry query to restrict
+        session: Database session the query runs on
+        search_text: Free text typed by the user
+        rank: If True, order by relevance (bm25 / ts_rank) before any later ordering
+
+    Returns:
+        Query: The restricted (and optionally ranked) query
+    """
+    terms = _search_terms(search_text)
+    if not terms:
+        return query
+
+    if not _has_search_index(session):
+        # No index on this backend: fall back to substring matching
+        search_term = f"%{search_text}%"
+        return query.filter(or_(*(getattr(LogbookEntry, name).ilike(search_term) for name in SEARCH_COLUMNS)))
+
+    entry_rowid = literal_column("logbook_entries.rowid")
+    if session.get_bind().dialect.name == "sqlite":
+        match_query = " ".join(f'"{term}"*' for term in terms)
+        matches = select(
+            _fts_table.c.rowid.label("fts_rowid"),
+            func.bm25(literal_column(FTS_TABLE)).label("rank")
+        ).select_from(_fts_table).where(literal_column(FTS_TABLE).op("MATCH")(match_query))
+        if not rank:
+            return query.filter(entry_rowid.in_(select(matches.subquery().c.fts_rowid)))
+        matches = matches.subquery()
+        # bm25 scores are negative; lower means more relevant
+        return query.join(matches, entry_rowid == matches.c.fts_rowid).order_by(matches.c.rank)
+
+    tsquery = func.to_tsquery("simple", " & ".join(f"{term}:*" for term in terms))
+    document = literal_column(PG_TSVECTOR_SQL)
+    query = query.filter(document.op("@@")(tsquery))
+    if rank:
+        query = query.order_by(func.ts_rank(document, tsquery).desc())
+    return query
+
+
+if __name__ == "__main__":
+    """Command line entry point for search index maintenance.
+
+    Usage:
+        python -m app.services.search_service rebuild
+    """
+    import argparse
+    from app.db.database import engine
+
+    parser = argparse.ArgumentParser(description="Maintain the logbook full-text search index")
+    parser.add_argument("command", choices=["rebuild"], help="Maintenance command to run")
+    args = parser.parse_args()
+
+    rebuild_search_index(engine)
+    print("Rebuilt logbook full-text search index")
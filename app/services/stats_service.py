@@ -0,0 +1,151 @@
+from sqlalchemy import Float, Integer, case, cast, func, or_, select
+
+from app.db.models import LogbookEntry, StatusEnum
+
+"""Logbook statistics service.
+
+This module provides:
+- Per-status entry counts computed with a single conditional-aggregate query
+- Completion and escalation rates
+- Per-status average resolution hours
+- Top-N grouped counts with the remainder folded into an "Other" bucket
+- Formatting helpers shared by the dashboard and reports views
+"""
+
+
+def resolution_hours_expression(dialect_name: str):
+    """Build a SQL expression for the resolution hours of an entry.
+
+    resolution_time stores a duration as a time of day (e.g. 03:30 means 3.5 hours),
+    so only its hour and minute components are used.
+
+    Args:
+        dialect_name: Name of the engine dialect ('sqlite', 'postgresql', ...)
+
+    Returns:
+        ColumnElement: A float-valued SQL expression, NULL when resolution_time is NULL
+    """
+    column = LogbookEntry.resolution_time
+    if dialect_name == "sqlite":
+        hours = cast(func.strftime("%H", column), Integer)
+        minutes = cast(func.strftime("%M", column), Integer)
+    else:
+        hours = func.extract("hour", column)
+        minutes = func.extract("minute", column)
+    return cast(hours, Float) + cast(minutes, Float) / 60.0
+
+
+def get_entry_stats(session, filters=None) -> dict:
+    """Compute logbook statistics for non-deleted entries in one query.
+
+    Args:
+        session: Database session
+        filters: Optional list of extra SQLAlchemy filter expressions
+
+    Returns:
+        dict: Statistics with keys:
+            total: Number of entries
+            counts: {StatusEnum: count} for every status
+            completion_rate: Percentage of completed entries
+            escalation_rate: Percentage of escalated entries
+            avg_resolution_hours: {StatusEnum: average resolution hours} for every status
+    """
+    hours = resolution_hours_expression(session.get_bind().dialect.name)
+
+    columns = [func.count(LogbookEntry.id)]
+    for status in StatusEnum:
+        columns.append(func.sum(case((LogbookEntry.status == status, 1), else_=0)))
+    for status in StatusEnum:
+        columns.append(func.avg(case((LogbookEntry.status == status, hours), else_=None)))
+
+    query = session.query(*columns).filter(
+        or_(LogbookEntry.is_deleted == False, LogbookEntry.is_deleted == None)
+    )
+    for condition in filters or []:
+        query = query.filter(condition)
+    row = query.one()
+
+    statuses = list(StatusEnum)
+    counts = {status: int(row[1 + i] or 0) for i, status in enumerate(statuses)}
+    averages = {status: float(row[1 + len(statuses) + i] or 0) for i, status in enumerate(statuses)}
+    return build_stats(row[0] or 0, counts, averages)
+
+
+def build_stats(total: int, counts: dict, averages: dict) -> dict:
+    """Assemble the statistics dictionary returned by the stats functions.
+
+    Args:
+        total: Number of entries
+        counts: {StatusEnum: count}; missing statuses count as 0
+        averages: {StatusEnum: average resolution hours}; missing statuses average 0
+
+    Returns:
+        dict: See get_entry_stats
+    """
+    counts = {status: counts.get(status, 0) for status in StatusEnum}
+    averages = {status: averages.get(status, 0.0) for status in StatusEnum}
+    return {
+        "total": total,
+        "counts": counts,
+        "completion_rate": counts[StatusEnum.COMPLETED] / total * 100 if total > 0 else 0,
+        "escalation_rate": counts[StatusEnum.ESCALATION] / total * 100 if total > 0 else 0,
+        "avg_resolution_hours": averages,
+    }
+
+
+OTHER_LABEL = "Other"
+"""Label of the bucket holding the groups beyond the top N."""
+
+
+def top_n_counts(session, column, limit: int, filters=None) -> list:
+    """Count non-deleted entries per value of a column, keeping only the top N.
+
+    Groups are ranked with a window function and everything below the top
+    `limit` is summed into one "Other" row, all in the same query, so the
+    result size is bounded whatever the column's cardinality.
+
+    Args:
+        session: Database session
+        column: Column to group by (e.g. LogbookEntry.device)
+        limit: Number of groups kept
+        filters: Optional list of extra SQLAlchemy filter expressions
+
+    Returns:
+        list: (value, count) tuples, largest first, followed by
+        (OTHER_LABEL, count) if more than `limit` groups exist
+    """
+    counts = select(column.label("label"), func.count(LogbookEntry.id).label("entry_count")).where(
+        or_(LogbookEntry.is_deleted == False, LogbookEntry.is_deleted == None)
+    )
+    for condition in filters or []:
+        counts = counts.where(condition)
+    counts = counts.group_by(column).subquery()
+
+    ranked = select(
+        counts.c.label,
+        counts.c.entry_count,
+        func.row_number().over(order_by=(counts.c.entry_count.desc(), counts.c.label)).label("rank"),
+    ).subquery()
+    bucket = case((ranked.c.rank <= limit, ranked.c.rank), else_=limit + 1)
+    statement = select(bucket, func.max(ranked.c.label), func.sum(ranked.c.entry_count)).group_by(bucket).order_by(
+        bucket
+    )
+
+    return [
+        (OTHER_LABEL if rank > limit else label, int(count))
+        for rank, label, count in session.execute(statement)
+    ]
+
+
+def format_hours(hours: float) -> str:
+    """Format a duration in hours for display.
+
+    Args:
+        hours: Duration in hours
+
+    Returns:
+        str: 'N mins' below one hour, otherwise 'N.N hours'
+    """
+    if hours < 1:
+        return f"{int(hours * 60)} mins"
+    return f"{hours:.1f} hours"
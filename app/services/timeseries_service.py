@@ -0,0 +1,226 @@
+from datetime import date, datetime, timedelta
+from sqlalchemy import String, case, func, or_
+
+from app.db.models import LogbookEntry
+
+"""Time-bucketed aggregation service for logbook entries.
+
+This module provides:
+- Portable bucket expressions (SQLite strftime / PostgreSQL date_trunc)
+- Grouped counts per (bucket, group) in a single SQL statement
+- Filling of empty buckets in Python for chart series
+- Largest-triangle-three-buckets downsampling of long series
+"""
+
+BUCKETS = ("day", "week", "month", "quarter")
+"""Supported bucket sizes. Weeks start on Monday on every backend."""
+
+
+def bucket_start(value, bucket: str) -> date:
+    """Return the first day of the bucket containing a date.
+
+    Args:
+        value: A date or datetime inside the bucket
+        bucket: One of BUCKETS
+
+    Returns:
+        date: The first day of the bucket
+
+    Raises:
+        ValueError: If the bucket size is not supported
+    """
+    if isinstance(value, datetime):
+        value = value.date()
+    if bucket == "day":
+        return value
+    if bucket == "week":
+        return value - timedelta(days=value.weekday())
+    if bucket == "month":
+        return value.replace(day=1)
+    if bucket == "quarter":
+        return value.replace(month=(value.month - 1) // 3 * 3 + 1, day=1)
+    raise ValueError(f"Unsupported bucket: {bucket}")
+
+
+def next_bucket(start: date, bucket: str) -> date:
+    """Return the first day of the bucket following the given one.
+
+    Args:
+        start: First day of a bucket (see bucket_start)
+        bucket: One of BUCKETS
+
+    Returns:
+        date: The first day of the next bucket
+    """
+    if bucket == "day":
+        return start + timedelta(days=1)
+    if bucket == "week":
+        return start + timedelta(days=7)
+    months = 3 if bucket == "quarter" else 1
+    month_index = start.month - 1 + months
+    return start.replace(year=start.year + month_index // 12, month=month_index % 12 + 1, day=1)
+
+
+def iter_buckets(start, end, bucket: str):
+    """Yield the first day of every bucket between two dates (inclusive).
+
+    Args:
+        start: Date or datetime of the first bucket
+        end: Date or datetime of the last bucket
+        bucket: One of BUCKETS
+
+    Yields:
+        date: The first day of each bucket in order
+    """
+    current = bucket_start(start, bucket)
+    last = bucket_start(end, bucket)
+    while current <= last:
+        yield current
+        current = next_bucket(current, bucket)
+
+
+def bucket_expression(column, bucket: str, dialect_name: str):
+    """Build a SQL expression mapping a timestamp column to its bucket key.
+
+    The key is the first day of the bucket formatted as 'YYYY-MM-DD' so both
+    backends return the same value and it can be parsed with date.fromisoformat.
+
+    Args:
+        column: SQLAlchemy DateTime column to bucket
+        bucket: One of BUCKETS
+        dialect_name: Name of the engine dialect ('sqlite', 'postgresql', ...)
+
+    Returns:
+        ColumnElement: A string-valued SQL expression
+
+    Raises:
+        ValueError: If the bucket size is not supported
+    """
+    if bucket not in BUCKETS:
+        raise ValueError(f"Unsupported bucket: {bucket}")
+
+    if dialect_name == "postgresql":
+        return func.to_char(func.date_trunc(bucket, column), "YYYY-MM-DD")
+
+    # SQLite has no date_trunc, so derive the bucket start with strftime/date modifiers
+    if bucket == "day":
+        return func.strftime("%Y-%m-%d", column)
+    if bucket == "week":
+        # 'weekday 0' moves forward to Sunday, '-6 days' steps back to Monday
+        return func.date(column, "weekday 0", "-6 days")
+    if bucket == "month":
+        return func.strftime("%Y-%m-01", column)
+    month = func.strftime("%m", column)
+    quarter_month = case((month <= "03", "01"), (month <= "06", "04"), (month <= "09", "07"), else_="10")
+    return func.strftime("%Y-", column, type_=String) + quarter_month + "-01"
+
+
+def count_by_bucket(session, bucket: str, start=None, end=None, group_by=None, filters=None) -> dict:
+    """Count non-deleted entries per (bucket, group) in one grouped query.
+
+    Args:
+        session: Database session
+        bucket: One of BUCKETS
+        start: Optional lower bound on created_at (inclusive, rounded down to its bucket)
+        end: Optional upper bound on created_at (inclusive, rounded up to the end of its bucket)
+        group_by: Optional column to group by in addition to the bucket (e.g. LogbookEntry.status)
+        filters: Optional list of extra SQLAlchemy filter expressions
+
+    Returns:
+        dict: {(bucket_date, group_value): count}; group_value is None when group_by is not given
+    """
+    key = bucket_expression(LogbookEntry.created_at, bucket, session.get_bind().dialect.name).label("bucket")
+    columns = [key]
+    if group_by is not None:
+        columns.append(group_by)
+
+    query = session.query(*columns, func.count(LogbookEntry.id)).filter(
+        or_(LogbookEntry.is_deleted == False, LogbookEntry.is_deleted == None)
+    )
+    if start is not None:
+        query = query.filter(LogbookEntry.created_at >= bucket_start(start, bucket))
+    if end is not None:
+        query = query.filter(LogbookEntry.created_at < next_bucket(bucket_start(end, bucket), bucket))
+    for condition in filters or []:
+        query = query.filter(condition)
+
+    query = query.group_by(*columns)
+
+    counts = {}
+    for row in query.all():
+        bucket_key = date.fromisoformat(row[0])
+        group_value = row[1] if group_by is not None else None
+        counts[(bucket_key, group_value)] = row[-1]
+    return counts
+
+
+def bucketed_series(session, bucket: str, start, end, group_by, groups, filters=None):
+    """Return dense per-group series with zero-filled empty buckets.
+
+    Args:
+        session: Database session
+        bucket: One of BUCKETS
+        start: Date or datetime of the first bucket
+        end: Date or datetime of the last bucket
+        group_by: Column to group by (e.g. LogbookEntry.status)
+        groups: Group values to build series for, in display order
+        filters: Optional list of extra SQLAlchemy filter expressions
+
+    Returns:
+        tuple: (bucket_dates, series) where series maps each group to a list
+        of counts aligned with bucket_dates
+    """
+    counts = count_by_bucket(session, bucket, start, end, group_by=group_by, filters=filters)
+    bucket_dates = list(iter_buckets(start, end, bucket))
+    series = {
+        group: [counts.get((bucket_date, group), 0) for bucket_date in bucket_dates]
+        for group in groups
+    }
+    return bucket_dates, series
+
+
+def downsample_lttb(points: list, threshold: int) -> list:
+    """Downsample a series with the largest-triangle-three-buckets algorithm.
+
+    Keeps the first and last points and, from each of threshold - 2 equal
+    buckets in between, the point forming the largest triangle with the
+    previously kept point and the average of the next bucket. Peaks and dips
+    survive, unlike with plain striding.
+
+    Args:
+        points: (x, y) tuples ordered by x
+        threshold: Maximum number of points to return
+
+    Returns:
+        list: The selected (x, y) tuples (all points if there are at most threshold)
+    """
+    if threshold >= len(points) or threshold < 3:
+        return list(points)
+
+    sampled = [points[0]]
+    bucket_size = (len(points) - 2) / (threshold - 2)
+    previous = 0
+
+    for i in range(threshold - 2):
+        # Current bucket [start, end) and the next bucket used for the average point
+        start = int(i * bucket_size) + 1
+        end = int((i + 1) * bucket_size) + 1
+        next_end = min(int((i + 2) * bucket_size) + 1, len(points))
+        next_bucket = points[end:next_end] or [points[-1]]
+        avg_x = sum(x for x, _ in next_bucket) / len(next_bucket)
+        avg_y = sum(y for _, y in next_bucket) / len(next_bucket)
+
+        prev_x, prev_y = points[previous]
+        best_area = -1.0
+        best = start
+        for j in range(start, end):
+            x, y = points[j]
+            area = abs((prev_x - avg_x) * (y - prev_y) - (prev_x - x) * (avg_y - prev_y))
+            if area > best_area:
+                best_area = area
+                best = j
+        sampled.append(points[best])
+        previous = best
+
+    sampled.append(points[-1])
+    return sampled
@@ -0,0 +1,282 @@
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from dotenv import load_dotenv
+
+from app.db.database import RoutingSession, SessionLocal
+
+"""Serialized write queue with group commit.
+
+This module provides:
+- A single writer thread accepting units of work from any Flet session,
+  API handler or background thread
+- Group commit: units arriving within WRITE_BATCH_WINDOW_MS of the first one
+  run in one transaction, so a burst of writes pays for one commit
+- Isolation of a failing unit, which is rolled back alone while the others
+  in its batch still commit
+- A Future per unit, resolved with the unit's own result or error once the
+  batch has committed
+
+A unit is a callable(session, *args, **kwargs). It must not commit; the queue
+commits the batch. Batches first run without savepoints; if any unit fails,
+the batch is rolled back and run again with one savepoint per unit, so units
+must not have side effects outside the session. Sessions do not expire
+objects on commit, so ORM objects a unit returns stay readable (detached) in
+the calling thread.
+
+Usage:
+    python -m app.services.write_queue_service benchmark [--threads 20] [--writes 50]
+"""
+
+# Load environment variables
+load_dotenv()
+
+WRITE_BATCH_WINDOW_MS = float(os.getenv("WRITE_BATCH_WINDOW_MS", "5"))
+"""How long the writer waits for more units after the first one of a batch."""
+
+WRITE_BATCH_MAX = int(os.getenv("WRITE_BATCH_MAX", "200"))
+"""Maximum number of units committed together."""
+
+_STOP = object()
+
+
+class WriteQueue:
+    """Single-threaded writer committing queued units of work in batches."""
+
+    def __init__(self, session_factory=SessionLocal, window_ms: float = None, max_batch: int = None):
+        """Initialize the queue; the writer thread starts with the first submitted unit.
+
+        Args:
+            session_factory: Factory of the sessions batches run in
+            window_ms: Batching window (default: WRITE_BATCH_WINDOW_MS)
+            max_batch: Maximum units per batch (default: WRITE_BATCH_MAX)
+        """
+        self.session_factory = session_factory
+        self.window = (WRITE_BATCH_WINDOW_MS if window_ms is None else window_ms) / 1000
+        self.max_batch = max_batch or WRITE_BATCH_MAX
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def submit(self, unit, *args, **kwargs) -> Future:
+        """Queue a unit of work.
+
+        Args:
+            unit: Callable(session, *args, **kwargs) performing the writes
+            *args: Positional arguments for the unit
+            **kwargs: Keyword arguments for the unit
+
+        Returns:
+            Future: Resolved with the unit's return value once committed, or its error
+        """
+        future = Future()
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="write-queue", daemon=True)
+                self._thread.start()
+        self._queue.put((future, unit, args, kwargs))
+        return future
+
+    def run(self, unit, *args, timeout: float = None, **kwargs):
+        """Queue a unit of work and wait until it is committed.
+
+        Args:
+            unit: Callable(session, *args, **kwargs) performing the writes
+            timeout: Optional number of seconds to wait
+
+        Returns:
+            The unit's return value
+
+        Raises:
+            Exception: The unit's error, or the batch's commit error
+        """
+        return self.submit(unit, *args, **kwargs).result(timeout)
+
+    def stop(self):
+        """Commit the units already queued, then stop the writer thread."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._queue.put(_STOP)
+            thread.join()
+
+    def _run(self):
+        """Collect batches and commit them until stopped."""
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                return
+            batch = [item]
+            stopping = False
+            deadline = time.monotonic() + self.window
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                try:
+                    item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            self._commit_batch(batch)
+            if stopping:
+                return
+
+    def _commit_batch(self, batch: list):
+        """Run a batch of units in one transaction and resolve their futures."""
+        batch = [item for item in batch if item[0].set_running_or_notify_cancel()]
+        if not batch:
+            return
+        try:
+            outcomes = self._run_units(batch, isolate=False)
+        except Exception:
+            # Some unit failed: run the batch again with each unit in its own savepoint
+            try:
+                outcomes = self._run_units(batch, isolate=True)
+            except Exception as ex:
+                print(f"Error committing write batch of {len(batch)} units: {ex}")
+                for future, _, _, _ in batch:
+                    future.set_exception(ex)
+                return
+
+        for future, result, error in outcomes:
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+
+    def _run_units(self, batch: list, isolate: bool) -> list:
+        """Run units in one session and commit.
+
+        Without isolation any failing unit aborts the whole attempt (the fast
+        path: no savepoints). With isolation each unit runs in a savepoint and
+        its error is returned in place of its result.
+
+        Returns:
+            list: (future, result, error) tuples
+        """
+        outcomes = []
+        with self.session_factory(expire_on_commit=False) as session:
+            if isinstance(session, RoutingSession):
+                # Keep the savepoints and the writes on the same (writer) connection
+                session.use_writer()
+            for future, unit, args, kwargs in batch:
+                if not isolate:
+                    outcomes.append((future, unit(session, *args, **kwargs), None))
+                    continue
+                try:
+                    with session.begin_nested():
+                        result = unit(session, *args, **kwargs)
+                except Exception as ex:
+                    outcomes.append((future, None, ex))
+                else:
+                    outcomes.append((future, result, None))
+            session.commit()
+        return outcomes
+
+
+_write_queue = WriteQueue()
+
+
+def submit_write(unit, *args, **kwargs) -> Future:
+    """Queue a unit of work on the application's write queue.
+
+    API handlers can await the result with asyncio.wrap_future.
+
+    Args:
+        unit: Callable(session, *args, **kwargs) performing the writes
+
+    Returns:
+        Future: Resolved with the unit's return value once committed, or its error
+    """
+    return _write_queue.submit(unit, *args, **kwargs)
+
+
+def run_write(unit, *args, timeout: float = None, **kwargs):
+    """Run a unit of work on the application's write queue and wait for its commit.
+
+    Args:
+        unit: Callable(session, *args, **kwargs) performing the writes
+        timeout: Optional number of seconds to wait
+
+    Returns:
+        The unit's return value
+    """
+    return _write_queue.run(unit, *args, timeout=timeout, **kwargs)
+
+
+def stop_write_queue():
+    """Commit the queued units and stop the application's writer thread."""
+    _write_queue.stop()
+
+
+def _benchmark(threads: int, writes: int):
+    """Compare per-caller commits with the write queue on a scratch database."""
+    import tempfile
+    import uuid
+    from datetime import date
+    from sqlalchemy import func
+    from sqlalchemy.orm import sessionmaker
+    from app.db.database import Base, create_db_engine
+    from app.db.models import LogbookEntry
+
+    def add_entry(session, index):
+        session.add(LogbookEntry(
+            user_id=uuid.uuid4(), start_date=date.today(), responsible_person="benchmark", location_id=1,
+            device=f"device {index % 50}", call_description="Benchmark entry",
+        ))
+
+    with tempfile.TemporaryDirectory(prefix="logbook_write_queue_") as work_dir:
+        write_engine = create_db_engine(f"sqlite:///{os.path.join(work_dir, 'benchmark.db')}")
+        Base.metadata.create_all(write_engine)
+        factory = sessionmaker(bind=write_engine, autoflush=False)
+        write_queue = WriteQueue(session_factory=factory)
+
+        def direct(index):
+            with factory() as session:
+                add_entry(session, index)
+                session.commit()
+
+        def queued(index):
+            write_queue.run(add_entry, index)
+
+        print(f"{threads} threads x {writes} writes, window {WRITE_BATCH_WINDOW_MS:g} ms")
+        for label, write in (("commit per write", direct), ("write queue", queued)):
+            def worker():
+                for i in range(writes):
+                    write(i)
+
+            workers = [threading.Thread(target=worker) for _ in range(threads)]
+            started = time.perf_counter()
+            for thread in workers:
+                thread.start()
+            for thread in workers:
+                thread.join()
+            elapsed = time.perf_counter() - started
+            print(f"{label:<17} {threads * writes / elapsed:9.1f} writes/s")
+
+        write_queue.stop()
+        with factory() as session:
+            stored = session.query(func.count(LogbookEntry.id)).scalar()
+        print(f"{stored} of {2 * threads * writes} writes stored")
+        write_engine.dispose()
+
+
+if __name__ == "__main__":
+    """Command line entry point for the write queue benchmark.
+
+    Usage:
+        python -m app.services.write_queue_service benchmark [--threads 20] [--writes 50]
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark group commit through the write queue")
+    parser.add_argument("command", choices=["benchmark"], help="Command to run")
+    parser.add_argument("--threads", type=int, default=20, help="Concurrent writers (e.g. Flet sessions)")
+    parser.add_argument("--writes", type=int, default=50, help="Writes per writer")
+    args = parser.parse_args()
+
+    _benchmark(args.threads, args.writes)
@@ -192,7 +192,7 @@ class DashboardView(Column):
         # Connect to the database and load entries
         from app.db.database import SessionLocal
         from app.db.models import LogbookEntry, StatusEnum
-        from sqlalchemy import func
+        from app.services.rollup_service import get_rollup_stats
 
         # Initialize counters
         total_count = 0
@@ -205,32 +205,13 @@ class DashboardView(Column):
         # Create a database session
         db = SessionLocal()
         try:
-            # Count total entries
-            total_count = db.query(func.count(LogbookEntry.id)).filter(LogbookEntry.is_deleted == False).scalar() or 0
-
-            # Count open entries
-            open_count = db.query(func.count(LogbookEntry.id)).filter(
-                LogbookEntry.status == StatusEnum.OPEN,
-                LogbookEntry.is_deleted == False
-            ).scalar() or 0
-
-            # Count completed entries
-            completed_count = db.query(func.count(LogbookEntry.id)).filter(
-                LogbookEntry.status == StatusEnum.COMPLETED,
-                LogbookEntry.is_deleted == False
-            ).scalar() or 0
-
-            # Count ongoing entries
-            ongoing_count = db.query(func.count(LogbookEntry.id)).filter(
-                LogbookEntry.status == StatusEnum.ONGOING,
-                LogbookEntry.is_deleted == False
-            ).scalar() or 0
-
-            # Count escalated entries
-            escalated_count = db.query(func.count(LogbookEntry.id)).filter(
-                LogbookEntry.status == StatusEnum.ESCALATION,
-                LogbookEntry.is_deleted == False
-            ).scalar() or 0
+            # Count total and per-status entries from the daily rollup
+            stats = get_rollup_stats(db)
+            total_count = stats["total"]
+            open_count = stats["counts"][StatusEnum.OPEN]
+            ongoing_count = stats["counts"][StatusEnum.ONGOING]
+            completed_count = stats["counts"][StatusEnum.COMPLETED]
+            escalated_count = stats["counts"][StatusEnum.ESCALATION]
 
             # Get recent activities (latest 5 entries)
             recent_entries = db.query(LogbookEntry).filter(
@@ -553,8 +534,8 @@ class DashboardView(Column):
             def handle_save(entry_data):
                 print(f"Saving entry: {entry_data}")
                 # Save the entry to the database
-                from app.db.database import SessionLocal
                 from app.db.models import LogbookEntry, StatusEnum, PriorityEnum, Location, User, RoleEnum
+                from app.services.write_queue_service import run_write
                 import uuid
                 import datetime
                 from sqlalchemy import func
@@ -572,9 +553,79 @@ class DashboardView(Column):
                     )
                     return
 
-                # Create a database session
-                db = SessionLocal()
+                # Format task field if it exists
+                task = entry_data.get('task', '')
+
+                # Parse dates properly
+                try:
+                    start_date = datetime.datetime.strptime(entry_data['start_date'], '%Y-%m-%d').date()
+                except ValueError as e:
+                    print(f"Invalid start date format: {e}")
+                    self.show_dialog("Date Error", f"Invalid start date format: {entry_data['start_date']}")
+                    return
+
+                end_date = None
+                if entry_data.get('end_date'):
+                    try:
+                        end_date = datetime.datetime.strptime(entry_data['end_date'], '%Y-%m-%d').date()
+                    except ValueError as e:
+                        print(f"Invalid end date format: {e}")
+                        self.show_dialog("Date Error", f"Invalid end date format: {entry_data['end_date']}")
+                        return
+
+                # Get the status from the entry data or default to OPEN
+                status_value = entry_data.get('status', 'Open')
+
+                # Map UI status values to StatusEnum values
+                status_mapping = {
+                    'Open': StatusEnum.OPEN,
+                    'Ongoing': StatusEnum.ONGOING,
+                    'Completed': StatusEnum.COMPLETED,
+                    'Escalated': StatusEnum.ESCALATION
+                }
+
+                # Get the appropriate enum value or default to OPEN
+                status = status_mapping.get(status_value, StatusEnum.OPEN)
+                print(f"Mapped status '{status_value}' to enum value: {status}")
+
+                # Get the priority from the entry data or default to MEDIUM
+                priority_value = entry_data.get('priority', 'MEDIUM').upper()
+                # Make sure it's a valid PriorityEnum value
                 try:
+                    priority = getattr(PriorityEnum, priority_value)
+                except AttributeError:
+                    print(f"Invalid priority value: {priority_value}, defaulting to MEDIUM")
+                    priority = PriorityEnum.MEDIUM
+
+                print(f"Using status: {status} and priority: {priority}")
+
+                # Process resolution time if provided
+                resolution_time = None
+                if entry_data.get('resolution_time'):
+                    try:
+                        # Parse the time in HH:MM format
+                        time_str = entry_data['resolution_time']
+                        hour, minute = map(int, time_str.split(':'))
+
+                        # Create a datetime object with today's date and the specified time
+                        # In a real app, you might want to use the end_date or another specific date
+                        base_date = datetime.datetime.now().date()
+                        if end_date:
+                            base_date = end_date
+
+                        resolution_time = datetime.datetime.combine(base_date, datetime.time(hour, minute))
+                        print(f"Parsed resolution time: {resolution_time}")
+                    except (ValueError, IndexError) as e:
+                        print(f"Error parsing resolution time: {e}")
+                        # Continue without resolution time if there's an error
+                        pass
+
+                category_name = entry_data.get('category', 'Not categorized')
+
+                def write_entry(db):
+                    """Write-queue unit creating the entry and any missing location or category."""
+                    from app.db.models import Category
+
                     # Get or create location
                     location_name = entry_data['device']
                     location = db.query(Location).filter(Location.name == location_name).first()
@@ -599,76 +650,7 @@ class DashboardView(Column):
 
                     print(f"Using location ID: {location.id} for {location_name}")
 
-                    # Format task field if it exists
-                    task = entry_data.get('task', '')
-
-                    # Parse dates properly
-                    try:
-                        start_date = datetime.datetime.strptime(entry_data['start_date'], '%Y-%m-%d').date()
-                    except ValueError as e:
-                        print(f"Invalid start date format: {e}")
-                        self.show_dialog("Date Error", f"Invalid start date format: {entry_data['start_date']}")
-                        return
-
-                    end_date = None
-                    if entry_data.get('end_date'):
-                        try:
-                            end_date = datetime.datetime.strptime(entry_data['end_date'], '%Y-%m-%d').date()
-                        except ValueError as e:
-                            print(f"Invalid end date format: {e}")
-                            self.show_dialog("Date Error", f"Invalid end date format: {entry_data['end_date']}")
-                            return
-
-                    # Get the status from the entry data or default to OPEN
-                    status_value = entry_data.get('status', 'Open')
-
-                    # Map UI status values to StatusEnum values
-                    status_mapping = {
-                        'Open': StatusEnum.OPEN,
-                        'Ongoing': StatusEnum.ONGOING,
-                        'Completed': StatusEnum.COMPLETED,
-                        'Escalated': StatusEnum.ESCALATION
-                    }
-
-                    # Get the appropriate enum value or default to OPEN
-                    status = status_mapping.get(status_value, StatusEnum.OPEN)
-                    print(f"Mapped status '{status_value}' to enum value: {status}")
-
-                    # Get the priority from the entry data or default to MEDIUM
-                    priority_value = entry_data.get('priority', 'MEDIUM').upper()
-                    # Make sure it's a valid PriorityEnum value
-                    try:
-                        priority = getattr(PriorityEnum, priority_value)
-                    except AttributeError:
-                        print(f"Invalid priority value: {priority_value}, defaulting to MEDIUM")
-                        priority = PriorityEnum.MEDIUM
-
-                    print(f"Using status: {status} and priority: {priority}")
-
-                    # Process resolution time if provided
-                    resolution_time = None
-                    if entry_data.get('resolution_time'):
-                        try:
-                            # Parse the time in HH:MM format
-                            time_str = entry_data['resolution_time']
-                            hour, minute = map(int, time_str.split(':'))
-
-                            # Create a datetime object with today's date and the specified time
-                            # In a real app, you might want to use the end_date or another specific date
-                            base_date = datetime.datetime.now().date()
-                            if end_date:
-                                base_date = end_date
-
-                            resolution_time = datetime.datetime.combine(base_date, datetime.time(hour, minute))
-                            print(f"Parsed resolution time: {resolution_time}")
-                        except (ValueError, IndexError) as e:
-                            print(f"Error parsing resolution time: {e}")
-                            # Continue without resolution time if there's an error
-                            pass
-
                     # Look up the category ID based on the category name
-                    from app.db.models import Category
-                    category_name = entry_data.get('category', 'Not categorized')
                     category = db.query(Category).filter(Category.name == category_name).first()
 
                     # If category doesn't exist, create it
@@ -702,35 +684,24 @@ class DashboardView(Column):
                         resolution_time=resolution_time,  # Add resolution time to the entry
                         status=status,
                         priority=priority,
-                        category_id=category.id if category else None,  # Set the category_id field
-                        created_at=func.now(),
-                        updated_at=func.now()
+                        category_id=category.id if category else None  # Set the category_id field
                     )
 
                     print(f"Created LogbookEntry object: {new_entry}")
-
-                    # Add and commit to the database
                     db.add(new_entry)
-                    db.commit()
+                    return new_entry.id
 
-                    # Verify the entry was saved
-                    check_entry = db.query(LogbookEntry).filter(LogbookEntry.id == new_entry.id).first()
-                    if check_entry:
-                        print(f"Entry confirmed in database with ID: {check_entry.id}")
-                    else:
-                        print("Warning: Entry not found in database after commit!")
-
-                    print(f"Entry saved to database with ID: {new_entry.id}")
+                # Commit through the write queue, together with writes from other sessions
+                try:
+                    entry_id = run_write(write_entry)
+                    print(f"Entry saved to database with ID: {entry_id}")
                 except Exception as e:
-                    db.rollback()
                     print(f"Error saving entry to database: {e}")
                     import traceback
                     traceback.print_exc()
                     # Show error dialog
                     self.show_dialog("Database Error", f"Failed to save entry: {str(e)}")
                     return
-                finally:
-                    db.close()
 
                 # Update the statistics based on the entry's status
                 self.total_entries = str(int(self.total_entries) + 1)
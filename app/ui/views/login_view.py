@@ -243,12 +243,21 @@ class LoginView(ft.Container):
         from sqlalchemy.orm import Session
         from app.db.database import SessionLocal
         from app.core.security import authenticate_user
+        from app.core.throttle import LoginThrottled
+        import math
 
         # Create a database session
         db = SessionLocal()
         try:
-            # Authenticate the user
-            user_obj = authenticate_user(db, username, password)
+            # Authenticate the user (throttled per username and client IP)
+            client_ip = getattr(self.page, "client_ip", None) if self.page else None
+            try:
+                user_obj = authenticate_user(db, username, password, client_ip)
+            except LoginThrottled as throttled:
+                self.error_text.value = f"Too many login attempts. Try again in {math.ceil(throttled.retry_after)} seconds"
+                self.error_text.visible = True
+                self.update()
+                return
 
             if user_obj:
                 # Convert user object to dictionary for the callback
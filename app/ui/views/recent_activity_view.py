@@ -21,9 +21,12 @@ from flet import (
     margin,
 )
 from sqlalchemy import desc, or_
+from sqlalchemy.orm import joinedload
 from app.db.database import SessionLocal
 from app.db.models import LogbookEntry
+from app.services.search_service import apply_text_search
 from app.utils.date_utils import format_date
+from app.utils.pagination import apply_keyset
 
 """Recent Activity View Module.
 
@@ -66,8 +69,20 @@ class RecentActivityView(ft.Column):
         self.is_start_date_selection = True
         self.selected_date = None
 
+        # Keyset pagination state for the entries list
+        self.page_size = 50
+        self.load_more_threshold = 300  # Pixels from the bottom that trigger the next page
+        self.next_cursor = None
+        self.has_more_entries = True
+        self.is_loading_page = False
+
         # UI components
-        self.entries_column = Column(scroll=ft.ScrollMode.AUTO, expand=True)
+        # ListView only lays out visible cards and is extended page by page while scrolling
+        self.entries_column = ft.ListView(
+            expand=True,
+            on_scroll=self.handle_entries_scroll,
+            on_scroll_interval=100,
+        )
 
         # Initialize filters with default values (last 30 days)
         self.init_date_range()
@@ -465,57 +480,125 @@ class RecentActivityView(ft.Column):
         self.date_dialog.open = False
         self.page.update()
 
+    def current_filters(self):
+        """Read the values of the filter controls.
+
+        Call it on the UI thread; background jobs get the returned snapshot
+        instead of reading controls the user may change meanwhile.
+
+        Returns:
+            dict: start_date, end_date, status (dropdown value) and search text
+        """
+        return {
+            "start_date": self.start_date_value,
+            "end_date": self.end_date_value,
+            "status": self.status_dropdown.value if self.status_dropdown else None,
+            "search": self.search_field.value if self.search_field else None,
+        }
+
+    def build_entries_query(self, session, filters=None):
+        """Build the entries query for the current filters, without ordering.
+
+        Args:
+            session: Database session
+            filters (dict): Filter values from current_filters (default: read the controls now)
+
+        Returns:
+            Query: Filtered LogbookEntry query shared by paging and counting
+        """
+        if filters is None:
+            filters = self.current_filters()
+
+        # No need to filter by is_deleted since we're now using hard delete
+        query = session.query(LogbookEntry)
+
+        # Apply date filters if set
+        if filters["start_date"]:
+            query = query.filter(LogbookEntry.created_at >= filters["start_date"])
+        if filters["end_date"]:
+            # Add one day to include entries from the end date
+            end_date = filters["end_date"] + timedelta(days=1)
+            query = query.filter(LogbookEntry.created_at < end_date)
+
+        # Apply status filter if not "All"
+        if filters["status"] and filters["status"] != "All":
+            # Map dropdown values to StatusEnum values
+            status_map = {
+                "Open": "open",
+                "Ongoing": "ongoing",
+                "Completed": "completed",
+                "Escalated": "escalation"  # Note: dropdown has "Escalated" but enum has "escalation"
+            }
+            if filters["status"] in status_map:
+                query = query.filter(LogbookEntry.status == status_map[filters["status"]])
+
+        # Apply search filter if provided (full-text index lookup instead of a table scan)
+        if filters["search"]:
+            query = apply_text_search(query, session, filters["search"])
+
+        return query
+
     def load_entries(self):
-        """Load entries from database based on current filters."""
-        with SessionLocal() as session:
-            # Get all entries ordered by creation date (newest first)
-            # No need to filter by is_deleted since we're now using hard delete
-            query = session.query(LogbookEntry).order_by(desc(LogbookEntry.created_at))
-
-            # Apply date filters if set
-            if self.start_date_value:
-                query = query.filter(LogbookEntry.created_at >= self.start_date_value)
-            if self.end_date_value:
-                # Add one day to include entries from the end date
-                end_date = self.end_date_value + timedelta(days=1)
-                query = query.filter(LogbookEntry.created_at < end_date)
-
-            # Apply status filter if not "All"
-            if self.status_dropdown and self.status_dropdown.value != "All":
-                # Map dropdown values to StatusEnum values
-                status_map = {
-                    "Open": "open",
-                    "Ongoing": "ongoing",
-                    "Completed": "completed",
-                    "Escalated": "escalation"  # Note: dropdown has "Escalated" but enum has "escalation"
-                }
-                if self.status_dropdown.value in status_map:
-                    query = query.filter(LogbookEntry.status == status_map[self.status_dropdown.value])
-
-            # Apply search filter if provided
-            if self.search_field and self.search_field.value:
-                search_term = f"%{self.search_field.value}%"
-                query = query.filter(
-                    or_(
-                        LogbookEntry.call_description.ilike(search_term),
-                        LogbookEntry.responsible_person.ilike(search_term),
-                        LogbookEntry.task.ilike(search_term),
-                        LogbookEntry.device.ilike(search_term)
-                    )
-                )
+        """Reset the list and load the first page of entries based on current filters."""
+        self.entries = []
+        self.filtered_entries = []
+        self.next_cursor = None
+        self.has_more_entries = True
+        self.entries_column.controls.clear()
+        self.load_next_page()
 
-            try:
-                self.entries = query.all()
-                self.filtered_entries = self.entries.copy()
-                print(f"Loaded {len(self.entries)} entries from database")
-            except Exception as ex:
-                print(f"Error loading entries: {ex}")
-                self.entries = []
-                self.filtered_entries = []
+    def load_next_page(self):
+        """Load the next page of entries after the current keyset cursor and append their cards."""
+        if self.is_loading_page or not self.has_more_entries:
+            return
 
+        self.is_loading_page = True
+        try:
+            with SessionLocal() as session:
+                # Newest first, seeking on (created_at, id) so deep pages stay cheap
+                query = apply_keyset(
+                    self.build_entries_query(session),
+                    LogbookEntry.created_at,
+                    LogbookEntry.id,
+                    self.next_cursor
+                )
+                # Fetch one extra row to know whether another page exists; location and
+                # category are eager-loaded because the cards are built after the session closes
+                page_entries = query.options(
+                    joinedload(LogbookEntry.location),
+                    joinedload(LogbookEntry.category)
+                ).limit(self.page_size + 1).all()
+        except Exception as ex:
+            print(f"Error loading entries: {ex}")
+            page_entries = []
+        finally:
+            self.is_loading_page = False
+
+        self.has_more_entries = len(page_entries) > self.page_size
+        page_entries = page_entries[:self.page_size]
+        if page_entries:
+            self.next_cursor = (page_entries[-1].created_at, page_entries[-1].id)
+
+        self.entries.extend(page_entries)
+        self.filtered_entries.extend(page_entries)
+        print(f"Loaded {len(page_entries)} entries from database ({len(self.entries)} total)")
+
+        if self.entries:
+            self.entries_column.controls.extend(self.create_entry_card(entry) for entry in page_entries)
+            self.page.update()
+        else:
             # Update UI
             self.update_entries_list()
 
+    def handle_entries_scroll(self, e):
+        """Load the next page when the list is scrolled close to its end.
+
+        Args:
+            e: The scroll event from the entries list
+        """
+        if e.max_scroll_extent is not None and e.pixels >= e.max_scroll_extent - self.load_more_threshold:
+            self.load_next_page()
+
     def update_entries_list(self):
         """Update the UI with current filtered entries."""
         self.entries_column.controls.clear()
@@ -868,35 +951,51 @@ class RecentActivityView(ft.Column):
 
         print(f"Found entry: {entry.id}, creating details dialog")
 
+        # Change history, loaded page by page on demand
+        history_list = Column(scroll=ft.ScrollMode.AUTO, spacing=10, expand=True)
+        self.load_entry_history(entry.id, history_list)
+
         # Create a details dialog
         details_dialog = ft.AlertDialog(
             modal=True,
             title=Text("Entry Details", weight=ft.FontWeight.BOLD),
             content=Container(
-                content=Column([
-                    Container(height=10),
-                    Row([Text("ID:", weight=ft.FontWeight.BOLD), Text(str(entry.id))]),
-                    Container(height=10),
-                    Row([Text("Description:", weight=ft.FontWeight.BOLD), Text(entry.call_description)]),
-                    Container(height=10),
-                    Row([Text("Status:", weight=ft.FontWeight.BOLD), Text(entry.status)]),
-                    Container(height=10),
-                    Row([Text("Location:", weight=ft.FontWeight.BOLD),
-                         Text(entry.location.name if entry.location else "Unknown")]),
-                    Container(height=10),
-                    Row([Text("Device:", weight=ft.FontWeight.BOLD), Text(entry.device)]),
-                    Container(height=10),
-                    Row([Text("Task:", weight=ft.FontWeight.BOLD),
-                         Text(entry.task if entry.task else "Not specified")]),
-                    Container(height=10),
-                    Row([Text("Responsible Person:", weight=ft.FontWeight.BOLD), Text(entry.responsible_person)]),
-                    Container(height=10),
-                    Row([Text("Created At:", weight=ft.FontWeight.BOLD), Text(format_date(entry.created_at))]),
-                    Container(height=10),
-                    Row([Text("Updated At:", weight=ft.FontWeight.BOLD), Text(format_date(entry.updated_at))]),
-                    Container(height=10),
-                    # Add more fields as needed
-                ], scroll=ft.ScrollMode.AUTO),
+                content=ft.Tabs(
+                    selected_index=0,
+                    tabs=[
+                        ft.Tab(
+                            text="Details",
+                            content=Column([
+                                Container(height=10),
+                                Row([Text("ID:", weight=ft.FontWeight.BOLD), Text(str(entry.id))]),
+                                Container(height=10),
+                                Row([Text("Description:", weight=ft.FontWeight.BOLD), Text(entry.call_description)]),
+                                Container(height=10),
+                                Row([Text("Status:", weight=ft.FontWeight.BOLD), Text(entry.status)]),
+                                Container(height=10),
+                                Row([Text("Location:", weight=ft.FontWeight.BOLD),
+                                     Text(entry.location.name if entry.location else "Unknown")]),
+                                Container(height=10),
+                                Row([Text("Device:", weight=ft.FontWeight.BOLD), Text(entry.device)]),
+                                Container(height=10),
+                                Row([Text("Task:", weight=ft.FontWeight.BOLD),
+                                     Text(entry.task if entry.task else "Not specified")]),
+                                Container(height=10),
+                                Row([Text("Responsible Person:", weight=ft.FontWeight.BOLD), Text(entry.responsible_person)]),
+                                Container(height=10),
+                                Row([Text("Created At:", weight=ft.FontWeight.BOLD), Text(format_date(entry.created_at))]),
+                                Container(height=10),
+                                Row([Text("Updated At:", weight=ft.FontWeight.BOLD), Text(format_date(entry.updated_at))]),
+                                Container(height=10),
+                                # Add more fields as needed
+                            ], scroll=ft.ScrollMode.AUTO),
+                        ),
+                        ft.Tab(
+                            text="History",
+                            content=Container(content=history_list, padding=padding.only(top=10)),
+                        ),
+                    ],
+                ),
                 width=400,
                 height=400,
                 padding=padding.all(20),
@@ -915,6 +1014,69 @@ class RecentActivityView(ft.Column):
         self.page.update()
         print("Page updated with dialog")
 
+    def load_entry_history(self, entry_id, history_list, position=None):
+        """Append a page of an entry's change history to the details dialog.
+
+        Args:
+            entry_id: The ID of the entry
+            history_list: Column holding the history events
+            position: Optional keyset position of the last event already shown
+        """
+        from app.services.history_service import ENTRY_ENTITY_TYPE, entity_history
+        from app.utils.pagination import decode_cursor
+
+        # Drop the "Load more" button of the previous page
+        if history_list.controls and isinstance(history_list.controls[-1], TextButton):
+            history_list.controls.pop()
+
+        try:
+            with SessionLocal() as session:
+                events, next_cursor = entity_history(session, ENTRY_ENTITY_TYPE, entry_id, position)
+        except Exception as ex:
+            print(f"Error loading history for entry {entry_id}: {ex}")
+            history_list.controls.append(Text("History could not be loaded", color=ft.colors.RED_400))
+            return
+
+        if not events and position is None:
+            history_list.controls.append(Text("No recorded changes", italic=True, color=ft.colors.GREY_600))
+        history_list.controls.extend(self._history_event_control(event) for event in events)
+
+        if next_cursor:
+            def load_more(e):
+                self.load_entry_history(entry_id, history_list, decode_cursor(next_cursor))
+                self.page.update()
+
+            history_list.controls.append(TextButton("Load more", on_click=load_more))
+
+    def _history_event_control(self, event):
+        """Build the timeline item of one history event.
+
+        Args:
+            event: Event dict from history_service.entity_history
+
+        Returns:
+            Container: The event with its field-level changes
+        """
+        def show(value):
+            return "—" if value is None or value == "" else str(value)
+
+        rows = [
+            Row([
+                Text(event["action"].replace("_", " ").capitalize(), weight=ft.FontWeight.BOLD),
+                Text(format_date(event["created_at"]), size=12, color=ft.colors.GREY_600),
+            ], alignment=ft.MainAxisAlignment.SPACE_BETWEEN),
+            Text(f"by {event['user_name'] or 'Unknown user'}", size=12, color=ft.colors.GREY_600),
+        ]
+        for change in event["changes"]:
+            label = change["field"].replace("_", " ").capitalize()
+            rows.append(Text(f"{label}: {show(change['old'])} → {show(change['new'])}", size=13))
+
+        return Container(
+            content=Column(rows, spacing=2),
+            padding=padding.all(8),
+            border=ft.border.only(left=ft.BorderSide(3, ft.colors.BLUE_200)),
+        )
+
     def close_details_dialog(self, e=None):
         """Close the entry details dialog.
 
@@ -1130,6 +1292,7 @@ class RecentActivityView(ft.Column):
             entry_id: The ID of the entry to edit
         """
         # Import here to avoid circular imports
+        from app.services.write_queue_service import run_write
         from app.ui.views.new_entry_view import NewEntryView
 
         # Find the entry in the database
@@ -1150,7 +1313,8 @@ class RecentActivityView(ft.Column):
             def handle_save(entry_data):
                 try:
                     # Update the entry in the database
-                    with SessionLocal() as update_session:
+                    def write_update(update_session):
+                        """Write-queue unit applying the edited fields to the entry."""
                         db_entry = update_session.query(LogbookEntry).filter(LogbookEntry.id == entry_id).first()
 
                         if not db_entry:
@@ -1209,10 +1373,10 @@ class RecentActivityView(ft.Column):
                             db_entry.status = entry_data["status"]
 
                         # Update the updated_at timestamp
-                        db_entry.updated_at = datetime.now()
+                        db_entry.updated_at = datetime.utcnow()
 
-                        # Commit the changes
-                        update_session.commit()
+                    # Commit through the write queue, together with writes from other sessions
+                    run_write(write_update)
 
                     # Show success message
                     self.page.snack_bar = ft.SnackBar(
@@ -1292,6 +1456,9 @@ class RecentActivityView(ft.Column):
     def handle_generate_report(self, e=None):
         """Generate a report from current filtered entries.
 
+        The report record is created by a background job so the session stays
+        responsive; on_report_job_event shows the result.
+
         Args:
             e: The click event object (optional)
         """
@@ -1305,15 +1472,65 @@ class RecentActivityView(ft.Column):
             self.page.update()
             return
 
-        # Create a new report in the database
+        from app.services.job_service import job_topic, submit_job
+
+        # Get current user ID (assuming it's available in the page data)
+        user_id = None
+        if hasattr(self.page, "data") and self.page.data is not None:
+            user_id = self.page.data.get("user_id")
+
+        # Snapshot the filters here: the job runs on a worker thread while the user keeps editing them
+        filters = self.current_filters()
+
+        # Create report parameters from current filters
+        parameters = {
+            "start_date": filters["start_date"].strftime("%Y-%m-%d") if filters["start_date"] else None,
+            "end_date": filters["end_date"].strftime("%Y-%m-%d") if filters["end_date"] else None,
+            "status": filters["status"],
+            "search": filters["search"],
+        }
+
+        if not getattr(self, "_jobs_subscribed", False):
+            self.page.pubsub.subscribe_topic(job_topic(self.page, "recent_activity"), self.on_report_job_event)
+            self._jobs_subscribed = True
+
+        submit_job(
+            "generate_report",
+            self.create_report_record,
+            parameters,
+            filters,
+            user_id,
+            page=self.page,
+            channel="recent_activity",
+            user_id=user_id,
+        )
+
+        self.page.snack_bar = ft.SnackBar(
+            content=Text("Generating report..."),
+            action="OK",
+        )
+        self.page.snack_bar.open = True
+        self.page.update()
+
+    def create_report_record(self, job, parameters, filters, user_id):
+        """Create a report record for a filter snapshot (runs as a background job).
+
+        Args:
+            job: JobContext of the running job
+            parameters (dict): Report filter parameters
+            filters (dict): Filter values captured by current_filters at submission
+            user_id: Creating user, if known
+
+        Returns:
+            str: Completion message
+        """
         with SessionLocal() as session:
             from app.db.models import Report
             import uuid
 
-            # Get current user ID (assuming it's available in the page data)
-            user_id = None
-            if hasattr(self.page, "data") and self.page.data is not None:
-                user_id = self.page.data.get("user_id")
+            # Only the scrolled-in pages are held in memory, so count the full result in SQL
+            entry_count = self.build_entries_query(session, filters).count()
+            job.check_cancelled()
 
             # If user_id is still None, try to get a default user from the database
             if user_id is None:
@@ -1329,22 +1546,13 @@ class RecentActivityView(ft.Column):
                     # If no users exist in the database, create a system user ID
                     user_id = uuid.uuid4()
 
-            # Create report parameters from current filters
-            parameters = {
-                "start_date": self.start_date_value.strftime("%Y-%m-%d") if self.start_date_value else None,
-                "end_date": self.end_date_value.strftime("%Y-%m-%d") if self.end_date_value else None,
-                "status": self.status_dropdown.value if self.status_dropdown else None,
-                "search": self.search_field.value if self.search_field else None,
-                "entry_count": len(self.filtered_entries)
-            }
-
             # Create a new report record
             new_report = Report(
                 id=uuid.uuid4(),
                 name=f"Activity Report {datetime.now().strftime('%Y-%m-%d %H:%M')}",
-                parameters=parameters,
-                start_date=self.start_date_value,
-                end_date=self.end_date_value,
+                parameters={**parameters, "entry_count": entry_count},
+                start_date=filters["start_date"],
+                end_date=filters["end_date"],
                 file_type="PDF",
                 status="generated",
                 created_by_id=user_id
@@ -1353,17 +1561,37 @@ class RecentActivityView(ft.Column):
             session.add(new_report)
             session.commit()
 
-            # Show success message
-            self.page.snack_bar = ft.SnackBar(
-                content=Text(f"Report generated successfully with {len(self.filtered_entries)} entries"),
-                action="OK",
-            )
-            self.page.snack_bar.open = True
-            self.page.update()
+        return f"Report generated successfully with {entry_count} entries"
+
+    def on_report_job_event(self, topic, event):
+        """Show the outcome of a report generation job.
+
+        Args:
+            topic (str): Pubsub topic of the event.
+            event (dict): Job event published by the job service.
+        """
+        from app.services.job_service import FINISHED_STATUSES
+
+        if event["status"] not in FINISHED_STATUSES:
+            return
+
+        if event["status"] == "completed":
+            message = event["message"]
+        elif event["status"] == "failed":
+            message = f"Error generating report: {event.get('error')}"
+        else:
+            message = "Report generation cancelled"
+
+        self.page.snack_bar = ft.SnackBar(
+            content=Text(message),
+            action="OK",
+        )
+        self.page.snack_bar.open = True
+        self.page.update()
 
-            # Navigate to the Reports view
-            if hasattr(self.page, "go"):
-                self.page.go("/reports")
+        # Navigate to the Reports view
+        if event["status"] == "completed" and hasattr(self.page, "go"):
+            self.page.go("/reports")
 
 
 
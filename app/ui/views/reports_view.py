@@ -5,6 +5,16 @@ from datetime import datetime, timedelta
 from sqlalchemy import not_, or_
 
 
+CHART_TOP_N = 4
+"""Groups shown individually in the pie charts; the rest form an "Other" slice."""
+
+LINE_POINT_BUDGET = 60
+"""Maximum points drawn per line chart series (longer series are downsampled)."""
+
+LINE_LABEL_BUDGET = 12
+"""Maximum x-axis labels drawn under a line chart."""
+
+
 class ChartCard(ft.Card):
     """A customizable card component that displays various types of charts.
 
@@ -12,106 +22,257 @@ class ChartCard(ft.Card):
     It handles data visualization with interactive elements and fallback behaviors.
     """
 
-    def __init__(self, title, chart_type="bar", height=300):
+    def __init__(self, title, chart_type="bar", height=300, report_filter=None):
         """Initialize the ChartCard.
 
         Args:
             title (str): The title to display on the card
             chart_type (str): Type of chart to display ('pie', 'bar', or 'line')
             height (int): Height of the chart in pixels
+            report_filter (ReportFilter): Filter applied to the chart's queries (default: all entries)
         """
+        from app.services.report_filter_service import ReportFilter
+
         super().__init__()
         self.title = title
         self.chart_type = chart_type
         self.height = height
+        self.report_filter = report_filter or ReportFilter()
+        self.load_error = None
+        self.loading = True
+        # Cached data is shown at once; otherwise a skeleton until the worker pool delivers it
         self.data = self.get_chart_data()
         self.content = self.build_content()
         self.elevation = 3
         self.tooltip = None  # Will hold the active tooltip
 
     def get_chart_data(self):
-        """Fetch chart data from the database or return default data if unavailable.
+        """Return cached chart data, or queue a load on the chart worker pool.
+
+        Stale or missing data is loaded in the background and applied through
+        apply_chart_data (or apply_chart_error).
 
         Returns:
-            dict: A dictionary containing chart data with labels, values, and colors
+            dict: A dictionary containing chart data with labels, values, and colors,
+            or None while the data is loading or if no entries match
+        """
+        from app.services.chart_cache_service import request_chart_data
+
+        cached, data = request_chart_data(
+            (self.title, self.report_filter.key), self.load_chart_data, self.apply_chart_data, on_error=self.apply_chart_error
+        )
+        self.loading = not cached
+        return data
+
+    def apply_chart_data(self, data):
+        """Swap in data delivered by the chart worker pool.
+
+        Args:
+            data (dict): Loaded chart data
+        """
+        self.data = data
+        self.loading = False
+        self.load_error = None
+        self.refresh_content()
+
+    def apply_chart_error(self, error):
+        """Replace the skeleton with an error placeholder after a failed load.
+
+        Args:
+            error (Exception): The error raised while loading the chart data
         """
+        self.loading = False
+        self.load_error = str(error)
+        self.refresh_content()
+
+    def refresh_content(self):
+        """Rebuild the card and push it to the page if it is mounted."""
+        self.content = self.build_content()
         try:
-            from app.db.database import SessionLocal
-            from app.db.models import LogbookEntry, StatusEnum, Category
-            from sqlalchemy import func, not_, or_, desc, extract
-            from datetime import datetime, timedelta
-            import random  # For generating demo data if needed
-
-            # Default data in case of errors
-            default_data = {
-                "pie": {
-                    "labels": ["Open", "Ongoing", "Completed", "Escalated"],
-                    "values": [25, 25, 25, 25],
-                    "colors": [ft.colors.AMBER_500, ft.colors.PURPLE_500, ft.colors.GREEN_500, ft.colors.RED_500]
-                },
-                "bar": {
-                    "labels": ["Category 1", "Category 2", "Category 3", "Category 4", "Category 5"],
-                    "values": [10, 20, 15, 25, 30],
-                    "colors": [ft.colors.BLUE_400, ft.colors.GREEN_400, ft.colors.AMBER_400, ft.colors.RED_400,
-                               ft.colors.PURPLE_400]
-                },
-                "line": {
-                    "labels": ["Jan", "Feb", "Mar", "Apr", "May", "Jun"],
-                    "datasets": [
-                        {
-                            "name": "Open",
-                            "values": [5, 8, 12, 10, 7, 9],
-                            "color": ft.colors.AMBER_500
-                        },
-                        {
-                            "name": "Completed",
-                            "values": [3, 5, 8, 10, 12, 15],
-                            "color": ft.colors.GREEN_500
-                        },
-                        {
-                            "name": "Escalated",
-                            "values": [2, 3, 1, 4, 2, 3],
-                            "color": ft.colors.RED_500
-                        }
+            if self.page:
+                self.update()
+        except Exception as ex:
+            # The card may have been replaced by a newer instance in the meantime
+            print(f"Error updating chart {self.title}: {ex}")
+
+    def load_chart_data(self):
+        """Query the data shown by this chart.
+
+        Every query is restricted by the card's report filter.
+
+        Returns:
+            dict: A dictionary containing chart data with labels, values, and colors,
+            or None if no entries match
+        """
+        from app.db.database import SessionLocal
+        from app.db.models import LogbookEntry, StatusEnum, Category
+        from app.services.stats_service import top_n_counts
+        from app.services.timeseries_service import bucketed_series
+        from sqlalchemy import func, or_, desc
+
+        filters = self.report_filter.predicates
+
+        with SessionLocal() as session:
+            # Get data based on chart title and type
+            if self.title == "Issues by Category":
+                # Top tasks plus an "Other" bucket, aggregated in SQL
+                query_result = top_n_counts(session, LogbookEntry.task, CHART_TOP_N, filters)
+
+                if query_result:
+                    labels = [r[0] or "Uncategorized" for r in query_result]
+                    values = [r[1] for r in query_result]
+                    # Generate colors for each category - using predefined colors instead of from_rgb
+                    predefined_colors = [
+                        ft.colors.BLUE_400, ft.colors.GREEN_400, ft.colors.AMBER_400,
+                        ft.colors.RED_400, ft.colors.PURPLE_400, ft.colors.CYAN_400,
+                        ft.colors.DEEP_ORANGE_400, ft.colors.INDIGO_400, ft.colors.TEAL_400
+                    ]
+                    # The "Other" bucket (after the top CHART_TOP_N) is shown in grey
+                    colors = [
+                        predefined_colors[i] if i < CHART_TOP_N else ft.colors.GREY_400
+                        for i, _ in enumerate(labels)
                     ]
-                }
-            }
+                    return {"labels": labels, "values": values, "colors": colors}
+
+            elif self.title == "Issues by Location":
+                # Top devices plus an "Other" bucket, aggregated in SQL
+                query_result = top_n_counts(session, LogbookEntry.device, CHART_TOP_N, filters)
+
+                if query_result:
+                    labels = [r[0] or "Unknown" for r in query_result]
+                    values = [r[1] for r in query_result]
+                    predefined_colors = [
+                        ft.colors.BLUE_400, ft.colors.GREEN_400, ft.colors.AMBER_400,
+                        ft.colors.RED_400, ft.colors.PURPLE_400, ft.colors.CYAN_400,
+                        ft.colors.DEEP_ORANGE_400, ft.colors.INDIGO_400, ft.colors.TEAL_400
+                    ]
+                    # The "Other" bucket (after the top CHART_TOP_N) is shown in grey
+                    colors = [
+                        predefined_colors[i] if i < CHART_TOP_N else ft.colors.GREY_400
+                        for i, _ in enumerate(labels)
+                    ]
+                    return {"labels": labels, "values": values, "colors": colors}
+
+            elif self.title == "Monthly Trends" or self.title == "Resolution Time Trends" or self.title == "Issue Categories Over Time" or self.title == "Seasonal Patterns":
+                # Get data based on actual database entries
+                # First, find the date range of the matching entries in a single query
+                earliest_entry, latest_entry = session.query(
+                    func.min(LogbookEntry.created_at),
+                    func.max(LogbookEntry.created_at)
+                ).filter(*filters).one()
+
+                # Use the filtered date range, else the data range or the current date if no entries
+                if self.report_filter.end_date:
+                    end_date = datetime.combine(self.report_filter.end_date, datetime.min.time())
+                else:
+                    end_date = latest_entry if latest_entry else datetime.now()
+                if self.report_filter.start_date:
+                    start_date = datetime.combine(self.report_filter.start_date, datetime.min.time())
+                else:
+                    # Use 6 months before end_date or earliest entry, whichever is later
+                    default_start = end_date - timedelta(days=180)  # ~6 months
+                    start_date = earliest_entry if earliest_entry and earliest_entry > default_start else default_start
 
-            with SessionLocal() as session:
-                # Get data based on chart title and type
-                if self.title == "Issues by Category":
-                    # Group entries by task/category
-                    query_result = session.query(
-                        LogbookEntry.task,
-                        func.count(LogbookEntry.id)
+                # Get counts by status and month in one grouped query; empty months are filled with zeros
+                status_colors = [
+                    (StatusEnum.OPEN, ft.colors.AMBER_500),
+                    (StatusEnum.COMPLETED, ft.colors.GREEN_500),
+                    (StatusEnum.ESCALATION, ft.colors.RED_500)
+                ]
+                month_dates, series = bucketed_series(
+                    session, "month", start_date, end_date,
+                    group_by=LogbookEntry.status,
+                    groups=[status for status, _ in status_colors],
+                    filters=filters
+                )
+
+                # Include year in the label if it spans multiple years
+                label_format = "%b %Y" if start_date.year != end_date.year else "%b"
+                months = [month_date.strftime(label_format) for month_date in month_dates]
+
+                datasets = [
+                    {
+                        "name": status.value.capitalize(),
+                        "values": series[status],
+                        "color": color
+                    }
+                    for status, color in status_colors
+                ]
+                return {"labels": months, "datasets": datasets}
+
+            elif "Resolution Time" in self.title:
+                # For resolution time charts
+                if "by Category" in self.title:
+                    # Get average resolution time by category
+                    # For SQLite compatibility, we need to handle datetime calculations differently
+                    # First, get all completed entries with their category and resolution times
+                    entries = session.query(
+                        LogbookEntry,
+                        Category
+                    ).join(
+                        Category,
+                        LogbookEntry.category_id == Category.id,
+                        isouter=True
                     ).filter(
-                        or_(LogbookEntry.is_deleted == False, LogbookEntry.is_deleted == None)
-                    ).group_by(LogbookEntry.task).all()
+                        LogbookEntry.status == StatusEnum.COMPLETED,
+                        or_(LogbookEntry.is_deleted == False, LogbookEntry.is_deleted == None),
+                        *filters
+                    ).all()
+
+                    # Process the entries to calculate resolution times
+                    category_hours = {}
+                    category_counts = {}
+
+                    for entry_tuple in entries:
+                        entry = entry_tuple[0]
+                        category = entry_tuple[1]
+
+                        # Use category name if available, otherwise use "Uncategorized"
+                        category_name = category.name if category else "Uncategorized"
+
+                        if category_name not in category_hours:
+                            category_hours[category_name] = 0
+                            category_counts[category_name] = 0
+
+                        # Calculate hours using Python datetime objects
+                        if entry.resolution_time and entry.created_at:
+                            # Use resolution_time if available
+                            # For entries with future resolution times, use a more meaningful calculation
+                            # Extract just the time part (hours and minutes) from the resolution_time
+                            resolution_hours = entry.resolution_time.hour
+                            resolution_minutes = entry.resolution_time.minute
+
+                            # Calculate total hours as a simple value (e.g., 3:30 = 3.5 hours)
+                            hours = resolution_hours + (resolution_minutes / 60)
+                            print(f"Using time-only calculation: {hours:.2f} hours for category {category_name}")
+                        elif entry.updated_at:
+                            # Fall back to updated_at time component
+                            updated_hours = entry.updated_at.hour
+                            updated_minutes = entry.updated_at.minute
+
+                            # Calculate total hours as a simple value (e.g., 3:30 = 3.5 hours)
+                            hours = updated_hours + (updated_minutes / 60)
+                            print(
+                                f"Using updated_at time-only calculation: {hours:.2f} hours for category {category_name}")
+                        else:
+                            continue  # Skip entries without valid timestamps
 
-                    if query_result:
-                        labels = [r[0] or "Uncategorized" for r in query_result]
-                        values = [r[1] for r in query_result]
-                        # Generate colors for each category - using predefined colors instead of from_rgb
-                        predefined_colors = [
-                            ft.colors.BLUE_400, ft.colors.GREEN_400, ft.colors.AMBER_400,
-                            ft.colors.RED_400, ft.colors.PURPLE_400, ft.colors.CYAN_400,
-                            ft.colors.DEEP_ORANGE_400, ft.colors.INDIGO_400, ft.colors.TEAL_400
-                        ]
-                        colors = [predefined_colors[i % len(predefined_colors)] for i, _ in enumerate(labels)]
-                        return {"labels": labels, "values": values, "colors": colors}
+                        category_hours[category_name] += hours
+                        category_counts[category_name] += 1
 
-                elif self.title == "Issues by Location":
-                    # Group entries by location/device
-                    query_result = session.query(
-                        LogbookEntry.device,
-                        func.count(LogbookEntry.id)
-                    ).filter(
-                        or_(LogbookEntry.is_deleted == False, LogbookEntry.is_deleted == None)
-                    ).group_by(LogbookEntry.device).all()
+                    # Calculate averages and create result tuples
+                    query_result = [
+                        (category_name,
+                         category_hours[category_name] / category_counts[category_name] if category_counts[
+                                                                                               category_name] > 0 else 0)
+                        for category_name in category_hours.keys()
+                    ]
 
                     if query_result:
-                        labels = [r[0] or "Unknown" for r in query_result]
-                        values = [r[1] for r in query_result]
+                        labels = [r[0] for r in query_result]
+                        values = [float(r[1] or 0) for r in query_result]
+
+                        # Use predefined colors for better visualization
                         predefined_colors = [
                             ft.colors.BLUE_400, ft.colors.GREEN_400, ft.colors.AMBER_400,
                             ft.colors.RED_400, ft.colors.PURPLE_400, ft.colors.CYAN_400,
@@ -120,290 +281,87 @@ class ChartCard(ft.Card):
                         colors = [predefined_colors[i % len(predefined_colors)] for i, _ in enumerate(labels)]
                         return {"labels": labels, "values": values, "colors": colors}
 
-                elif self.title == "Monthly Trends" or self.title == "Resolution Time Trends" or self.title == "Issue Categories Over Time" or self.title == "Seasonal Patterns":
-                    # Get data based on actual database entries
-                    # First, find the date range from the database
-                    earliest_entry = session.query(func.min(LogbookEntry.created_at)).scalar()
-                    latest_entry = session.query(func.max(LogbookEntry.created_at)).scalar()
-
-                    # Use actual data range or fallback to current date if no entries
-                    end_date = latest_entry if latest_entry else datetime.now()
-                    # Use 6 months before end_date or earliest entry, whichever is later
-                    default_start = end_date - timedelta(days=180)  # ~6 months
-                    start_date = earliest_entry if earliest_entry and earliest_entry > default_start else default_start
-
-                    print(f"Using date range: {start_date} to {end_date}")
-
-                    # Get month names for the date range
-                    months = []
-                    month_dates = []
-                    current = start_date
-
-                    # Make sure we include the full month of the end date
-                    end_month_date = end_date.replace(day=28)  # Use day 28 to ensure we're still in the same month
-                    if end_month_date.month != end_date.month:
-                        end_month_date = end_date.replace(month=end_date.month + 1, day=1) - timedelta(days=1)
-
-                    while current <= end_month_date:
-                        # Include year in the label if it spans multiple years
-                        if start_date.year != end_date.year:
-                            months.append(current.strftime("%b %Y"))
-                        else:
-                            months.append(current.strftime("%b"))
+                elif "by Technician" in self.title:
+                    # Get average resolution time by responsible person
+                    # For SQLite compatibility, we need to handle datetime calculations differently
+                    # First, get all completed entries with their responsible person and resolution times
+                    entries = session.query(
+                        LogbookEntry.responsible_person,
+                        LogbookEntry.resolution_time,
+                        LogbookEntry.created_at,
+                        LogbookEntry.updated_at
+                    ).filter(
+                        LogbookEntry.status == StatusEnum.COMPLETED,
+                        or_(LogbookEntry.is_deleted == False, LogbookEntry.is_deleted == None),
+                        *filters
+                    ).all()
 
-                        month_dates.append(current)
+                    # Process the entries to calculate resolution times
+                    person_hours = {}
+                    person_counts = {}
 
-                        # Move to next month
-                        if current.month == 12:
-                            current = current.replace(year=current.year + 1, month=1)
+                    for entry in entries:
+                        person = entry.responsible_person or "Unknown"
+                        if person not in person_hours:
+                            person_hours[person] = 0
+                            person_counts[person] = 0
+
+                        # Calculate hours using Python datetime objects
+                        if entry.resolution_time and entry.created_at:
+                            # Use resolution_time if available
+                            # For entries with future resolution times, use a more meaningful calculation
+                            # Extract just the time part (hours and minutes) from the resolution_time
+                            resolution_hours = entry.resolution_time.hour
+                            resolution_minutes = entry.resolution_time.minute
+
+                            # Calculate total hours as a simple value (e.g., 3:30 = 3.5 hours)
+                            hours = resolution_hours + (resolution_minutes / 60)
+                            print(f"Using time-only calculation: {hours:.2f} hours for tech {person}")
+                        elif entry.updated_at:
+                            # Fall back to updated_at time component
+                            updated_hours = entry.updated_at.hour
+                            updated_minutes = entry.updated_at.minute
+
+                            # Calculate total hours as a simple value (e.g., 3:30 = 3.5 hours)
+                            hours = updated_hours + (updated_minutes / 60)
+                            print(f"Using updated_at time-only calculation: {hours:.2f} hours for tech {person}")
                         else:
-                            current = current.replace(month=current.month + 1)
-
-                    print(f"Using months: {months}")
-
-                    # Get counts by status and month
-                    datasets = []
-                    for status, color in [
-                        (StatusEnum.OPEN, ft.colors.AMBER_500),
-                        (StatusEnum.COMPLETED, ft.colors.GREEN_500),
-                        (StatusEnum.ESCALATION, ft.colors.RED_500)
-                    ]:
-                        monthly_counts = []
-                        # Use the month_dates list we created earlier
-                        for i, month_start in enumerate(month_dates):
-                            # Calculate the end of this month
-                            if i < len(month_dates) - 1:
-                                month_end = month_dates[i + 1]
-                            else:
-                                # For the last month, go to the end of the month
-                                if month_start.month == 12:
-                                    month_end = month_start.replace(year=month_start.year + 1, month=1)
-                                else:
-                                    month_end = month_start.replace(month=month_start.month + 1)
-
-                            # Query for this month
-                            count = session.query(func.count(LogbookEntry.id)).filter(
-                                LogbookEntry.status == status,
-                                LogbookEntry.created_at >= month_start,
-                                LogbookEntry.created_at < month_end,
-                                or_(LogbookEntry.is_deleted == False, LogbookEntry.is_deleted == None)
-                            ).scalar() or 0
-
-                            # We'll keep the actual count, even if it's zero
-                            # The chart rendering will handle zero values appropriately
-
-                            monthly_counts.append(count)
-                            print(f"Month: {months[i]}, Status: {status.value}, Count: {count}")
-
-                        datasets.append({
-                            "name": status.value.capitalize(),
-                            "values": monthly_counts,
-                            "color": color
-                        })
-
-                    # Print the final dataset for debugging
-                    print(f"Final datasets: {datasets}")
-                    return {"labels": months, "datasets": datasets}
-
-                elif "Resolution Time" in self.title:
-                    # For resolution time charts
-                    if "by Category" in self.title:
-                        # Get average resolution time by category
-                        # For SQLite compatibility, we need to handle datetime calculations differently
-                        # First, get all completed entries with their category and resolution times
-                        entries = session.query(
-                            LogbookEntry,
-                            Category
-                        ).join(
-                            Category,
-                            LogbookEntry.category_id == Category.id,
-                            isouter=True
-                        ).filter(
-                            LogbookEntry.status == StatusEnum.COMPLETED,
-                            or_(LogbookEntry.is_deleted == False, LogbookEntry.is_deleted == None)
-                        ).all()
-
-                        # Process the entries to calculate resolution times
-                        category_hours = {}
-                        category_counts = {}
-
-                        for entry_tuple in entries:
-                            entry = entry_tuple[0]
-                            category = entry_tuple[1]
-
-                            # Use category name if available, otherwise use "Uncategorized"
-                            category_name = category.name if category else "Uncategorized"
-
-                            if category_name not in category_hours:
-                                category_hours[category_name] = 0
-                                category_counts[category_name] = 0
-
-                            # Calculate hours using Python datetime objects
-                            if entry.resolution_time and entry.created_at:
-                                # Use resolution_time if available
-                                # For entries with future resolution times, use a more meaningful calculation
-                                # Extract just the time part (hours and minutes) from the resolution_time
-                                resolution_hours = entry.resolution_time.hour
-                                resolution_minutes = entry.resolution_time.minute
-
-                                # Calculate total hours as a simple value (e.g., 3:30 = 3.5 hours)
-                                hours = resolution_hours + (resolution_minutes / 60)
-                                print(f"Using time-only calculation: {hours:.2f} hours for category {category_name}")
-                            elif entry.updated_at:
-                                # Fall back to updated_at time component
-                                updated_hours = entry.updated_at.hour
-                                updated_minutes = entry.updated_at.minute
-
-                                # Calculate total hours as a simple value (e.g., 3:30 = 3.5 hours)
-                                hours = updated_hours + (updated_minutes / 60)
-                                print(
-                                    f"Using updated_at time-only calculation: {hours:.2f} hours for category {category_name}")
-                            else:
-                                continue  # Skip entries without valid timestamps
-
-                            category_hours[category_name] += hours
-                            category_counts[category_name] += 1
-
-                        # Calculate averages and create result tuples
-                        query_result = [
-                            (category_name,
-                             category_hours[category_name] / category_counts[category_name] if category_counts[
-                                                                                                   category_name] > 0 else 0)
-                            for category_name in category_hours.keys()
-                        ]
+                            continue  # Skip entries without valid timestamps
 
-                        if query_result:
-                            labels = [r[0] for r in query_result]
-                            values = [float(r[1] or 0) for r in query_result]
-
-                            # Use predefined colors for better visualization
-                            predefined_colors = [
-                                ft.colors.BLUE_400, ft.colors.GREEN_400, ft.colors.AMBER_400,
-                                ft.colors.RED_400, ft.colors.PURPLE_400, ft.colors.CYAN_400,
-                                ft.colors.DEEP_ORANGE_400, ft.colors.INDIGO_400, ft.colors.TEAL_400
-                            ]
-                            colors = [predefined_colors[i % len(predefined_colors)] for i, _ in enumerate(labels)]
-                            return {"labels": labels, "values": values, "colors": colors}
-
-                    elif "by Technician" in self.title:
-                        # Get average resolution time by responsible person
-                        # For SQLite compatibility, we need to handle datetime calculations differently
-                        # First, get all completed entries with their responsible person and resolution times
-                        entries = session.query(
-                            LogbookEntry.responsible_person,
-                            LogbookEntry.resolution_time,
-                            LogbookEntry.created_at,
-                            LogbookEntry.updated_at
-                        ).filter(
-                            LogbookEntry.status == StatusEnum.COMPLETED,
-                            or_(LogbookEntry.is_deleted == False, LogbookEntry.is_deleted == None)
-                        ).all()
-
-                        # Process the entries to calculate resolution times
-                        person_hours = {}
-                        person_counts = {}
-
-                        for entry in entries:
-                            person = entry.responsible_person or "Unknown"
-                            if person not in person_hours:
-                                person_hours[person] = 0
-                                person_counts[person] = 0
-
-                            # Calculate hours using Python datetime objects
-                            if entry.resolution_time and entry.created_at:
-                                # Use resolution_time if available
-                                # For entries with future resolution times, use a more meaningful calculation
-                                # Extract just the time part (hours and minutes) from the resolution_time
-                                resolution_hours = entry.resolution_time.hour
-                                resolution_minutes = entry.resolution_time.minute
-
-                                # Calculate total hours as a simple value (e.g., 3:30 = 3.5 hours)
-                                hours = resolution_hours + (resolution_minutes / 60)
-                                print(f"Using time-only calculation: {hours:.2f} hours for tech {person}")
-                            elif entry.updated_at:
-                                # Fall back to updated_at time component
-                                updated_hours = entry.updated_at.hour
-                                updated_minutes = entry.updated_at.minute
-
-                                # Calculate total hours as a simple value (e.g., 3:30 = 3.5 hours)
-                                hours = updated_hours + (updated_minutes / 60)
-                                print(f"Using updated_at time-only calculation: {hours:.2f} hours for tech {person}")
-                            else:
-                                continue  # Skip entries without valid timestamps
-
-                            print(f"Adding {hours:.2f} hours for technician {person}")
-                            person_hours[person] += hours
-                            person_counts[person] += 1
-
-                        # Calculate averages and create result tuples
-                        query_result = [
-                            (person, person_hours[person] / person_counts[person] if person_counts[person] > 0 else 0)
-                            for person in person_hours.keys()
-                        ]
+                        print(f"Adding {hours:.2f} hours for technician {person}")
+                        person_hours[person] += hours
+                        person_counts[person] += 1
 
-                        if query_result:
-                            labels = [r[0] or "Unknown" for r in query_result]
-                            values = [float(r[1] or 0) for r in query_result]
-                            colors = [ft.colors.GREEN_400 for _ in labels]
-                            return {"labels": labels, "values": values, "colors": colors}
-
-                elif self.title == "Common Issues":
-                    # Get most common issues by description
-                    query_result = session.query(
-                        LogbookEntry.call_description,
-                        func.count(LogbookEntry.id)
-                    ).filter(
-                        or_(LogbookEntry.is_deleted == False, LogbookEntry.is_deleted == None)
-                    ).group_by(LogbookEntry.call_description).order_by(desc(func.count(LogbookEntry.id))).limit(5).all()
+                    # Calculate averages and create result tuples
+                    query_result = [
+                        (person, person_hours[person] / person_counts[person] if person_counts[person] > 0 else 0)
+                        for person in person_hours.keys()
+                    ]
 
                     if query_result:
-                        # Truncate descriptions if they're too long
-                        labels = [r[0][:30] + "..." if len(r[0]) > 30 else r[0] for r in query_result]
-                        values = [r[1] for r in query_result]
-                        colors = [ft.colors.PURPLE_400 for _ in labels]
+                        labels = [r[0] or "Unknown" for r in query_result]
+                        values = [float(r[1] or 0) for r in query_result]
+                        colors = [ft.colors.GREEN_400 for _ in labels]
                         return {"labels": labels, "values": values, "colors": colors}
 
-            # Return default data if no specific data was generated
-            return default_data[self.chart_type]
+            elif self.title == "Common Issues":
+                # Get most common issues by description
+                query_result = session.query(
+                    LogbookEntry.call_description,
+                    func.count(LogbookEntry.id)
+                ).filter(
+                    or_(LogbookEntry.is_deleted == False, LogbookEntry.is_deleted == None),
+                    *filters
+                ).group_by(LogbookEntry.call_description).order_by(desc(func.count(LogbookEntry.id))).limit(5).all()
 
-        except Exception as e:
-            print(f"Error getting chart data for {self.title}: {e}")
-            import traceback
-            traceback.print_exc()
-            # Return default data for this chart type
-            return {
-                "pie": {
-                    "labels": ["Open", "Ongoing", "Completed", "Escalated"],
-                    "values": [25, 25, 25, 25],
-                    "colors": [ft.colors.AMBER_500, ft.colors.PURPLE_500, ft.colors.GREEN_500, ft.colors.RED_500]
-                },
-                "bar": {
-                    "labels": ["Category 1", "Category 2", "Category 3", "Category 4", "Category 5"],
-                    "values": [10, 20, 15, 25, 30],
-                    "colors": [ft.colors.BLUE_400, ft.colors.GREEN_400, ft.colors.AMBER_400, ft.colors.RED_400,
-                               ft.colors.PURPLE_400]
-                },
-                "line": {
-                    "labels": ["Jan", "Feb", "Mar", "Apr", "May", "Jun"],
-                    "datasets": [
-                        {
-                            "name": "Open",
-                            "values": [5, 8, 12, 10, 7, 9],
-                            "color": ft.colors.AMBER_500
-                        },
-                        {
-                            "name": "Completed",
-                            "values": [3, 5, 8, 10, 12, 15],
-                            "color": ft.colors.GREEN_500
-                        },
-                        {
-                            "name": "Escalated",
-                            "values": [2, 3, 1, 4, 2, 3],
-                            "color": ft.colors.RED_500
-                        }
-                    ]
-                }
-            }[self.chart_type]
+                if query_result:
+                    # Truncate descriptions if they're too long
+                    labels = [r[0][:30] + "..." if len(r[0]) > 30 else r[0] for r in query_result]
+                    values = [r[1] for r in query_result]
+                    colors = [ft.colors.PURPLE_400 for _ in labels]
+                    return {"labels": labels, "values": values, "colors": colors}
+
+        return None
 
     def build_content(self):
         """Build the card's content with appropriate chart based on chart type.
@@ -413,7 +371,11 @@ class ChartCard(ft.Card):
         """
 
         # Create actual chart based on chart type and data
-        if self.chart_type == "pie":
+        if self.loading:
+            chart = self.create_skeleton()
+        elif self.load_error:
+            chart = self.create_placeholder("Chart data could not be loaded")
+        elif self.chart_type == "pie":
             chart = self.create_pie_chart()
         elif self.chart_type == "bar":
             chart = self.create_bar_chart()
@@ -897,6 +859,8 @@ class ChartCard(ft.Card):
         # Create a stack with grid lines and data points
         grid_stack = ft.Stack(expand=True)
 
+        from app.services.timeseries_service import downsample_lttb
+
         # Add horizontal grid lines
         grid_lines = ft.Column(expand=True)
         for i in range(5):
@@ -918,99 +882,83 @@ class ChartCard(ft.Card):
             if num_points > 0:
                 # For each dataset, create a series of data points
                 for dataset in self.data["datasets"]:
+                    # Long series are downsampled, keeping their peaks and dips
+                    points = downsample_lttb(list(enumerate(dataset["values"][:num_points])), LINE_POINT_BUDGET)
+                    positions = []
                     data_points = []
-                    for i, value in enumerate(dataset["values"]):
-                        if i < num_points:
-                            # Calculate position (x from 0 to 1, y from 0 to 1 inverted)
-                            x_pos = i / (num_points - 1) if num_points > 1 else 0.5
-
-                            # For zero values, position at the bottom but still show the point
-                            if value == 0:
-                                y_pos = 1.0  # Bottom of the chart
-                            else:
-                                y_pos = 1 - (value / max_value if max_value > 0 else 0)
-
-                            # Create the data point with hover effect
-                            data_point = ft.Container(
+                    for i, value in points:
+                        # Calculate position (x from 0 to 1, y from 0 to 1 inverted) from the original index
+                        x_pos = i / (num_points - 1) if num_points > 1 else 0.5
+
+                        # For zero values, position at the bottom but still show the point
+                        if value == 0:
+                            y_pos = 1.0  # Bottom of the chart
+                        else:
+                            y_pos = 1 - (value / max_value if max_value > 0 else 0)
+                        positions.append((x_pos, y_pos))
+
+                        # Create the data point with hover effect
+                        data_point = ft.Container(
+                            content=ft.Container(
                                 content=ft.Container(
-                                    content=ft.Container(
-                                        bgcolor=dataset["color"],
-                                        width=10,
-                                        height=10,
-                                        border_radius=ft.border_radius.all(5),
-                                        border=ft.border.all(1.5, ft.colors.WHITE),
-                                        shadow=ft.BoxShadow(
-                                            spread_radius=1,
-                                            blur_radius=2,
-                                            color=ft.colors.with_opacity(0.3, ft.colors.BLACK),
-                                        ),
+                                    bgcolor=dataset["color"],
+                                    width=10,
+                                    height=10,
+                                    border_radius=ft.border_radius.all(5),
+                                    border=ft.border.all(1.5, ft.colors.WHITE),
+                                    shadow=ft.BoxShadow(
+                                        spread_radius=1,
+                                        blur_radius=2,
+                                        color=ft.colors.with_opacity(0.3, ft.colors.BLACK),
                                     ),
-                                    padding=ft.padding.all(1),
                                 ),
-                                alignment=ft.alignment.center,
-                                # Adjust positioning to ensure full width distribution
-                                left=f"{x_pos * 100}%",  # Use percentage string format
-                                top=f"{y_pos * 100}%",  # Use percentage string format
-                                right=None,
-                                bottom=None,
-                                width=14,
-                                height=14,
-                                animate=ft.animation.Animation(500, ft.AnimationCurve.EASE_OUT),
-                                # Store the data for hover tooltip
-                                data={"dataset": dataset["name"], "value": value, "color": dataset["color"]},
-                                # Add hover effect for better interaction
-                                on_hover=self.handle_point_hover
-                            )
-                            data_points.append(data_point)
+                                padding=ft.padding.all(1),
+                            ),
+                            alignment=ft.alignment.center,
+                            # Adjust positioning to ensure full width distribution
+                            left=f"{x_pos * 100}%",  # Use percentage string format
+                            top=f"{y_pos * 100}%",  # Use percentage string format
+                            right=None,
+                            bottom=None,
+                            width=14,
+                            height=14,
+                            animate=ft.animation.Animation(500, ft.AnimationCurve.EASE_OUT),
+                            # Store the data for hover tooltip
+                            data={"dataset": dataset["name"], "value": value, "color": dataset["color"]},
+                            # Add hover effect for better interaction
+                            on_hover=self.handle_point_hover
+                        )
+                        data_points.append(data_point)
 
                     # Add all data points to the stack
                     for point in data_points:
                         grid_stack.controls.append(point)
 
-                    # Create a simulated line using a series of small containers
-                    if len(dataset["values"]) > 1:
-                        for i in range(len(dataset["values"]) - 1):
-                            if i < num_points - 1:
-                                # Calculate positions for start and end points
-                                x1 = i / (num_points - 1) if num_points > 1 else 0.5
-
-                                # Handle zero values for line positioning
-                                if dataset["values"][i] == 0:
-                                    y1 = 1.0  # Bottom of chart
-                                else:
-                                    y1 = 1 - (dataset["values"][i] / max_value if max_value > 0 else 0)
-
-                                x2 = (i + 1) / (num_points - 1) if num_points > 1 else 0.5
-
-                                # Handle zero values for line positioning
-                                if dataset["values"][i + 1] == 0:
-                                    y2 = 1.0  # Bottom of chart
-                                else:
-                                    y2 = 1 - (dataset["values"][i + 1] / max_value if max_value > 0 else 0)
-
-                                # Create a line segment with improved positioning
-                                # Calculate the angle of the line for proper positioning
-                                dx = x2 - x1
-                                dy = y2 - y1
-                                angle = math.atan2(dy, dx) * 180 / math.pi
-
-                                # Create a line segment that connects the points properly with enhanced styling
-                                line = ft.Container(
-                                    bgcolor=dataset["color"],
-                                    height=3,  # Increased line thickness for better visibility
-                                    left=f"{x1 * 100}%",  # Use percentage string format
-                                    top=f"{y1 * 100}%",  # Position at first point
-                                    width=f"{(x2 - x1) * 100}%",  # Width as percentage of container
-                                    rotate=ft.Rotate(angle, alignment=ft.alignment.center_left),
-                                    opacity=0.8,  # Slight transparency for a more modern look
-                                    animate=ft.animation.Animation(500, ft.AnimationCurve.EASE_OUT),
-                                    shadow=ft.BoxShadow(
-                                        spread_radius=0.5,
-                                        blur_radius=1,
-                                        color=ft.colors.with_opacity(0.2, ft.colors.BLACK),
-                                    ),
-                                )
-                                grid_stack.controls.append(line)
+                    # Create a simulated line using a series of small containers between consecutive points
+                    for (x1, y1), (x2, y2) in zip(positions, positions[1:]):
+                        # Create a line segment with improved positioning
+                        # Calculate the angle of the line for proper positioning
+                        dx = x2 - x1
+                        dy = y2 - y1
+                        angle = math.atan2(dy, dx) * 180 / math.pi
+
+                        # Create a line segment that connects the points properly with enhanced styling
+                        line = ft.Container(
+                            bgcolor=dataset["color"],
+                            height=3,  # Increased line thickness for better visibility
+                            left=f"{x1 * 100}%",  # Use percentage string format
+                            top=f"{y1 * 100}%",  # Position at first point
+                            width=f"{(x2 - x1) * 100}%",  # Width as percentage of container
+                            rotate=ft.Rotate(angle, alignment=ft.alignment.center_left),
+                            opacity=0.8,  # Slight transparency for a more modern look
+                            animate=ft.animation.Animation(500, ft.AnimationCurve.EASE_OUT),
+                            shadow=ft.BoxShadow(
+                                spread_radius=0.5,
+                                blur_radius=1,
+                                color=ft.colors.with_opacity(0.2, ft.colors.BLACK),
+                            ),
+                        )
+                        grid_stack.controls.append(line)
 
         return grid_stack
 
@@ -1033,6 +981,11 @@ class ChartCard(ft.Card):
         # Get the labels row
         labels_row = x_axis_container.content
 
+        # Show at most LINE_LABEL_BUDGET evenly spaced labels
+        labels = self.data["labels"]
+        step = math.ceil(len(labels) / LINE_LABEL_BUDGET) if labels else 1
+        labels = labels[::step]
+
         # Add a container for the labels with improved distribution
         labels_container = ft.Container(
             content=ft.Row(
@@ -1046,7 +999,7 @@ class ChartCard(ft.Card):
                     ),
                     width=None,  # Allow flexible width
                     alignment=ft.alignment.center,
-                ) for label in self.data["labels"]],
+                ) for label in labels],
                 spacing=0,
                 alignment=ft.MainAxisAlignment.SPACE_BETWEEN,
                 expand=True,
@@ -1117,6 +1070,44 @@ class ChartCard(ft.Card):
                 self.page.overlay.remove(self.tooltip)
                 self.page.update()
 
+    def create_skeleton(self):
+        """Create a grey skeleton shaped like the chart, shown while its data loads.
+
+        Returns:
+            ft.Container: A styled container with skeleton shapes
+        """
+        shade = ft.colors.BLUE_GREY_100
+        if self.chart_type == "pie":
+            shape = ft.Container(width=160, height=160, bgcolor=shade, border_radius=80)
+        elif self.chart_type == "bar":
+            shape = ft.Row(
+                [
+                    ft.Container(width=28, height=height, bgcolor=shade, border_radius=4)
+                    for height in (150, 110, 180, 90, 130, 60)
+                ],
+                alignment=ft.MainAxisAlignment.CENTER,
+                vertical_alignment=ft.CrossAxisAlignment.END,
+                spacing=16,
+            )
+        else:
+            shape = ft.Container(height=self.height - 100, width=float("inf"), bgcolor=shade, border_radius=8)
+
+        return ft.Container(
+            content=ft.Column(
+                [
+                    shape,
+                    ft.Container(width=120, height=12, bgcolor=shade, border_radius=6),
+                ],
+                alignment=ft.MainAxisAlignment.CENTER,
+                horizontal_alignment=ft.CrossAxisAlignment.CENTER,
+                spacing=20,
+            ),
+            alignment=ft.alignment.center,
+            expand=True,
+            height=self.height,
+            padding=ft.padding.all(20),
+        )
+
     def create_placeholder(self, message="No data available"):
         """Create a placeholder container when no chart data is available.
 
@@ -1339,12 +1330,8 @@ class ReportFilters(ft.Column):
             color=ft.colors.BLACK,
             text_style=ft.TextStyle(color=ft.colors.WHITE),
             label_style=ft.TextStyle(color=ft.colors.WHITE),
-            options=[
-                ft.dropdown.Option("all", "All Technicians"),
-                ft.dropdown.Option("1", "John Smith"),
-                ft.dropdown.Option("2", "Jane Doe"),
-                ft.dropdown.Option("3", "Mike Johnson"),
-                ft.dropdown.Option("4", "Sarah Williams"),
+            options=[ft.dropdown.Option("all", "All Technicians")] + [
+                ft.dropdown.Option(name) for name in self.load_technician_names()
             ],
             value="all",
         )
@@ -1377,6 +1364,22 @@ class ReportFilters(ft.Column):
         # Set up the controls
         self.controls = [self.build_content()]
 
+    def load_technician_names(self):
+        """Load the responsible persons offered by the technician filter.
+
+        Returns:
+            list: Technician names, empty if they could not be loaded
+        """
+        try:
+            from app.db.database import SessionLocal
+            from app.services.report_filter_service import technician_names
+
+            with SessionLocal() as session:
+                return technician_names(session)
+        except Exception as ex:
+            print(f"Error loading technician names: {ex}")
+            return []
+
     def build_content(self):
         """Build the filter UI components.
 
@@ -1645,147 +1648,40 @@ class SummaryStats(ft.Row):
         # Load initial data
         self.load_data()
 
-    def load_data(self):
+    def load_data(self, report_filter=None):
         """Load statistics data from the database.
 
         Queries the database for total entries, resolution times, and status rates.
         Updates the component's display values with the fetched data.
+
+        Args:
+            report_filter (ReportFilter): Optional filter restricting the entries counted
         """
         try:
             from app.db.database import SessionLocal
-            from app.db.models import LogbookEntry, StatusEnum
-            from sqlalchemy import func, not_, or_
+            from app.db.models import StatusEnum
+            from app.services.rollup_service import get_rollup_stats
+            from app.services.stats_service import format_hours, get_entry_stats
 
             with SessionLocal() as session:
-                # Total entries (excluding deleted or where is_deleted is None)
-                total_entries = session.query(LogbookEntry).filter(
-                    or_(LogbookEntry.is_deleted == False, LogbookEntry.is_deleted == None)
-                ).count()
-
-                # Completed entries for completion rate
-                completed_entries = session.query(LogbookEntry).filter(
-                    LogbookEntry.status == StatusEnum.COMPLETED,
-                    or_(LogbookEntry.is_deleted == False, LogbookEntry.is_deleted == None)
-                ).count()
-
-                # Escalated entries for escalation rate
-                escalated_entries = session.query(LogbookEntry).filter(
-                    LogbookEntry.status == StatusEnum.ESCALATION,  # Note: ESCALATION not ESCALATED
-                    or_(LogbookEntry.is_deleted == False, LogbookEntry.is_deleted == None)
-                ).count()
-
-                # Average resolution time (for completed entries)
-                # For SQLite compatibility, we need to handle datetime calculations in Python
-                completed_entries_data = session.query(
-                    LogbookEntry.resolution_time,
-                    LogbookEntry.created_at,
-                    LogbookEntry.updated_at
-                ).filter(
-                    LogbookEntry.status == StatusEnum.COMPLETED,
-                    or_(LogbookEntry.is_deleted == False, LogbookEntry.is_deleted == None)
-                ).all()
-
-                # Calculate average resolution time using Python datetime objects
-                total_hours = 0
-                entry_count = 0
-
-                for entry in completed_entries_data:
-                    # Calculate hours using Python datetime objects
-                    if entry.resolution_time:
-                        # Use resolution_time if available
-                        # For entries with future resolution times, use a more meaningful calculation
-                        # Extract just the time part (hours and minutes) from the resolution_time
-                        resolution_hours = entry.resolution_time.hour
-                        resolution_minutes = entry.resolution_time.minute
-
-                        # Calculate total hours as a simple value (e.g., 3:30 = 3.5 hours)
-                        hours = resolution_hours + (resolution_minutes / 60)
-                        total_hours += hours
-                        entry_count += 1
-                        print(f"Using time-only calculation: {hours:.2f} hours for summary stats")
-
-                avg_resolution_hours = total_hours / entry_count if entry_count > 0 else 0
-
-                # Average resolution time for OPEN entries
-                open_entries_data = session.query(
-                    LogbookEntry.resolution_time,
-                    LogbookEntry.created_at,
-                    LogbookEntry.updated_at
-                ).filter(
-                    LogbookEntry.status == StatusEnum.OPEN,
-                    or_(LogbookEntry.is_deleted == False, LogbookEntry.is_deleted == None)
-                ).all()
-
-                # Calculate average resolution time for OPEN entries
-                total_open_hours = 0
-                open_entry_count = 0
-
-                for entry in open_entries_data:
-                    if entry.resolution_time:
-                        resolution_hours = entry.resolution_time.hour
-                        resolution_minutes = entry.resolution_time.minute
-                        hours = resolution_hours + (resolution_minutes / 60)
-                        total_open_hours += hours
-                        open_entry_count += 1
-                        print(f"Open entry resolution time: {hours:.2f} hours")
-
-                avg_resolution_open_hours = total_open_hours / open_entry_count if open_entry_count > 0 else 0
-
-                # Average resolution time for ONGOING entries
-                ongoing_entries_data = session.query(
-                    LogbookEntry.resolution_time,
-                    LogbookEntry.created_at,
-                    LogbookEntry.updated_at
-                ).filter(
-                    LogbookEntry.status == StatusEnum.ONGOING,
-                    or_(LogbookEntry.is_deleted == False, LogbookEntry.is_deleted == None)
-                ).all()
-
-                # Calculate average resolution time for ONGOING entries
-                total_ongoing_hours = 0
-                ongoing_entry_count = 0
-
-                for entry in ongoing_entries_data:
-                    if entry.resolution_time:
-                        resolution_hours = entry.resolution_time.hour
-                        resolution_minutes = entry.resolution_time.minute
-                        hours = resolution_hours + (resolution_minutes / 60)
-                        total_ongoing_hours += hours
-                        ongoing_entry_count += 1
-                        print(f"Ongoing entry resolution time: {hours:.2f} hours")
-
-                avg_resolution_ongoing_hours = total_ongoing_hours / ongoing_entry_count if ongoing_entry_count > 0 else 0
+                if report_filter is None or report_filter.dates_only:
+                    # Counts, rates and per-status average resolution times from the daily rollup
+                    stats = get_rollup_stats(
+                        session,
+                        start_day=report_filter.start_date if report_filter else None,
+                        end_day=report_filter.end_date if report_filter else None,
+                    )
+                else:
+                    # The rollup has no task or technician dimension; aggregate the filtered entries
+                    stats = get_entry_stats(session, filters=report_filter.predicates)
 
             # Update values
-            self.total_entries = str(total_entries)
-
-            # Format average resolution time for completed entries
-            if avg_resolution_hours < 1:
-                avg_resolution_formatted = f"{int(avg_resolution_hours * 60)} mins"
-            else:
-                avg_resolution_formatted = f"{avg_resolution_hours:.1f} hours"
-            self.avg_resolution_time = avg_resolution_formatted
-
-            # Format average resolution time for open entries
-            if avg_resolution_open_hours < 1:
-                avg_resolution_open_formatted = f"{int(avg_resolution_open_hours * 60)} mins"
-            else:
-                avg_resolution_open_formatted = f"{avg_resolution_open_hours:.1f} hours"
-            self.avg_resolution_open = avg_resolution_open_formatted
-
-            # Format average resolution time for ongoing entries
-            if avg_resolution_ongoing_hours < 1:
-                avg_resolution_ongoing_formatted = f"{int(avg_resolution_ongoing_hours * 60)} mins"
-            else:
-                avg_resolution_ongoing_formatted = f"{avg_resolution_ongoing_hours:.1f} hours"
-            self.avg_resolution_ongoing = avg_resolution_ongoing_formatted
-
-            # Calculate rates
-            completion_rate = (completed_entries / total_entries * 100) if total_entries > 0 else 0
-            escalation_rate = (escalated_entries / total_entries * 100) if total_entries > 0 else 0
-
-            self.completion_rate = f"{int(completion_rate)}%"
-            self.escalation_rate = f"{int(escalation_rate)}%"
+            self.total_entries = str(stats["total"])
+            self.avg_resolution_time = format_hours(stats["avg_resolution_hours"][StatusEnum.COMPLETED])
+            self.avg_resolution_open = format_hours(stats["avg_resolution_hours"][StatusEnum.OPEN])
+            self.avg_resolution_ongoing = format_hours(stats["avg_resolution_hours"][StatusEnum.ONGOING])
+            self.completion_rate = f"{int(stats['completion_rate'])}%"
+            self.escalation_rate = f"{int(stats['escalation_rate'])}%"
 
             # Rebuild the content
             self.controls = [self.build_content()]
@@ -1887,6 +1783,9 @@ class ReportsView(ft.Container):
         self.excel_picker = ft.FilePicker(on_result=self.save_excel_result)
         self.csv_picker = ft.FilePicker(on_result=self.save_csv_result)
 
+        # Background export jobs of this session: {job id: {"label", "update"}}
+        self.export_jobs = {}
+
         # Create chart instances and store references to them
         self.chart_issues_by_category = ChartCard("Issues by Category", chart_type="pie")
         self.chart_issues_by_location = ChartCard("Issues by Location", chart_type="pie")
@@ -2252,25 +2151,16 @@ class ReportsView(ft.Container):
     def save_pdf_result(self, e: ft.FilePickerResultEvent):
         """Handle the result of the PDF file picker dialog.
 
+        The report is generated by a background job; progress and the result
+        are shown by on_job_event.
+
         Args:
             e (ft.FilePickerResultEvent): The file picker result event containing the selected path.
         """
         try:
             if e.path:
                 print(f"PDF file path selected: {e.path}")
-                # Generate and save the PDF file
-                self.generate_pdf_report(e.path)
-
-                # Show success message
-                if self.page:
-                    self.page.snack_bar = ft.SnackBar(
-                        content=ft.Text(f"PDF report saved to: {e.path}"),
-                        action="OK",
-                        bgcolor=ft.colors.BLACK,
-                        action_color=ft.colors.ORANGE,
-                    )
-                    self.page.snack_bar.open = True
-                    self.page.update()
+                self.run_export_job("PDF", "export_pdf", self.generate_pdf_report, e.path, unit="pages")
             else:
                 print("PDF export cancelled")
         except Exception as ex:
@@ -2285,185 +2175,31 @@ class ReportsView(ft.Container):
                 self.page.snack_bar.open = True
                 self.page.update()
 
-    def generate_pdf_report(self, file_path):
+    def generate_pdf_report(self, file_path, progress=None):
         """Generate a PDF report and save it to the specified path.
 
+        Entry pages are rendered in chunks on a process pool and merged with a
+        final summary page; every page carries the report header and a page
+        number.
+
         Args:
             file_path (str): The path where the PDF report should be saved.
+            progress: Optional callback(pages_done, total_pages) called as chunks finish.
         """
         try:
-            # Import required libraries for PDF generation
-            from reportlab.lib.pagesizes import letter
-            from reportlab.lib import colors
-            from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-            from reportlab.lib.styles import getSampleStyleSheet
             from app.db.database import SessionLocal
-            from app.db.models import LogbookEntry
-            from datetime import datetime
-
-            # Create a PDF document
-            doc = SimpleDocTemplate(file_path, pagesize=letter)
-            styles = getSampleStyleSheet()
-            elements = []
-
-            # Add title
-            title_style = styles['Heading1']
-            title = Paragraph("LogBook Report", title_style)
-            elements.append(title)
-            elements.append(Spacer(1, 12))
-
-            # Add date
-            date_style = styles['Normal']
-            current_date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            date_text = Paragraph(f"Generated on: {current_date}", date_style)
-            elements.append(date_text)
-            elements.append(Spacer(1, 12))
-
-            # Get data from database
-            with SessionLocal() as session:
-                entries = session.query(LogbookEntry).filter(
-                    LogbookEntry.is_deleted.is_(False)
-                ).all()
+            from app.services.artifact_service import cached_report
+            from app.services.pdf_service import write_pdf
 
-                # Create table data
-                data = [
-                    ["ID", "Task", "Call Description", "Solution", "Status", "Location", "Created At"]
-                ]
+            with SessionLocal() as session:
+                # Reuse the previous export if no matching entry changed since
+                cached_report(session, file_path, "pdf", lambda path: write_pdf(path, session, progress=progress))
 
-                for entry in entries:
-                    data.append([
-                        str(entry.id),
-                        entry.task or "",
-                        entry.call_description or "",
-                        entry.solution_description or "",
-                        entry.status.value if entry.status else "",
-                        entry.device or "",
-                        entry.created_at.strftime("%Y-%m-%d") if entry.created_at else ""
-                    ])
-
-                # Process data to truncate long text and ensure text fits in cells
-                processed_data = [data[0]]  # Keep the header row
-                for row in data[1:]:
-                    processed_row = []
-
-                    # Process each cell in the row
-                    for i, cell in enumerate(row):
-                        # Column-specific processing
-                        if i == 0:  # ID column
-                            # Truncate ID to first 8 characters + '...' if too long
-                            if len(cell) > 10:
-                                processed_row.append(cell[:8] + '...')
-                            else:
-                                processed_row.append(cell)
-                        elif i == 2 or i == 3:  # Call Description and Solution columns
-                            # Truncate long text to 30 characters + '...' if too long
-                            if len(cell) > 30:
-                                processed_row.append(cell[:30] + '...')
-                            else:
-                                processed_row.append(cell)
-                        else:  # Other columns
-                            processed_row.append(cell)
-
-                    processed_data.append(processed_row)
-
-                # Set up the page size and margins
-                page_width = letter[0]  # Width of letter page in points
-                margin = 40  # Margin in points
-                usable_width = page_width - (2 * margin)  # Usable width for the table
-
-                # Calculate proportional column widths that fit within the page
-                # Allocate more space to text columns (Call Description and Solution)
-                proportions = [0.12, 0.12, 0.20, 0.20, 0.12, 0.12, 0.12]  # Must sum to 1.0
-                col_widths = [usable_width * p for p in proportions]
-
-                # Create table with calculated column widths
-                table = Table(processed_data, colWidths=col_widths, repeatRows=1)
-
-                # Apply styles to ensure text stays within cells
-                table.setStyle(TableStyle([
-                    # Basic styling
-                    ('BACKGROUND', (0, 0), (-1, 0), colors.orange),
-                    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-                    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-
-                    # Font sizes - make them smaller to fit more text
-                    ('FONTSIZE', (0, 0), (-1, 0), 8),  # Headers
-                    ('FONTSIZE', (0, 1), (-1, -1), 6),  # Data rows
-
-                    # Cell padding - minimize to maximize text space
-                    ('TOPPADDING', (0, 0), (-1, -1), 1),
-                    ('BOTTOMPADDING', (0, 0), (-1, 0), 6),  # Header bottom padding
-                    ('BOTTOMPADDING', (0, 1), (-1, -1), 1),  # Data rows bottom padding
-                    ('LEFTPADDING', (0, 0), (-1, -1), 2),
-                    ('RIGHTPADDING', (0, 0), (-1, -1), 2),
-
-                    # Background and borders
-                    ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-                    ('GRID', (0, 0), (-1, -1), 1, colors.black),
-
-                    # Critical for text containment
-                    ('WORDWRAP', (0, 0), (-1, -1), True),
-                    ('SHRINK', (0, 0), (-1, -1), 1.0),  # Allow text to shrink if needed
-                ]))
-
-                # Set a reasonable row height to accommodate wrapped text
-                for i in range(len(processed_data)):
-                    if i == 0:  # Header row
-                        table._rowHeights[i] = 20
-                    else:  # Data rows
-                        table._rowHeights[i] = 30  # Fixed height for all data rows
-
-                elements.append(table)
-
-                # Add summary statistics
-                elements.append(Spacer(1, 20))
-                summary_style = styles['Heading2']
-                summary_title = Paragraph("Summary Statistics", summary_style)
-                elements.append(summary_title)
-                elements.append(Spacer(1, 12))
-
-                # Count by status
-                status_counts = {}
-                for entry in entries:
-                    status = entry.status.value if entry.status else "Unknown"
-                    status_counts[status] = status_counts.get(status, 0) + 1
-
-                # Create status summary table
-                status_data = [["Status", "Count"]]
-                for status, count in status_counts.items():
-                    status_data.append([status, str(count)])
-
-                # Use fixed column widths for summary table
-                summary_col_widths = [100, 60]  # Status column wider than Count column
-                status_table = Table(status_data, colWidths=summary_col_widths)
-                status_table.setStyle(TableStyle([
-                    ('BACKGROUND', (0, 0), (-1, 0), colors.orange),
-                    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-                    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                    ('FONTSIZE', (0, 0), (-1, 0), 10),  # Slightly larger font for summary headers
-                    ('FONTSIZE', (0, 1), (-1, -1), 9),  # Normal font for summary data
-                    ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
-                    ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-                    ('GRID', (0, 0), (-1, -1), 1, colors.black)
-                ]))
-
-                elements.append(status_table)
-
-            # Build the PDF document
-            doc.build(elements)
             print(f"PDF report successfully generated at {file_path}")
 
         except ImportError as ie:
-            print(f"Missing required library for PDF generation: {ie}")
-            # Install reportlab if not available
-            import subprocess
-            subprocess.run(["pip", "install", "reportlab"])
-            # Try again after installation
-            self.generate_pdf_report(file_path)
+            print(f"Missing required library for PDF generation (install reportlab and pypdf): {ie}")
+            raise
         except Exception as ex:
             print(f"Error generating PDF report: {ex}")
             raise
@@ -2471,25 +2207,16 @@ class ReportsView(ft.Container):
     def save_excel_result(self, e: ft.FilePickerResultEvent):
         """Handle the result of the Excel file picker dialog.
 
+        The report is generated by a background job; progress and the result
+        are shown by on_job_event.
+
         Args:
             e (ft.FilePickerResultEvent): The file picker result event containing the selected path.
         """
         try:
             if e.path:
                 print(f"Excel file path selected: {e.path}")
-                # Generate and save the Excel file
-                self.generate_excel_report(e.path)
-
-                # Show success message
-                if self.page:
-                    self.page.snack_bar = ft.SnackBar(
-                        content=ft.Text(f"Excel report saved to: {e.path}"),
-                        action="OK",
-                        bgcolor=ft.colors.BLACK,
-                        action_color=ft.colors.ORANGE,
-                    )
-                    self.page.snack_bar.open = True
-                    self.page.update()
+                self.run_export_job("Excel", "export_excel", self.generate_excel_report, e.path)
             else:
                 print("Excel export cancelled")
         except Exception as ex:
@@ -2504,90 +2231,31 @@ class ReportsView(ft.Container):
                 self.page.snack_bar.open = True
                 self.page.update()
 
-    def generate_excel_report(self, file_path):
+    def generate_excel_report(self, file_path, progress=None):
         """Generate an Excel report and save it to the specified path.
 
+        The workbook has entries, status summary and per-location summary
+        sheets and is written in openpyxl's write_only mode, streaming rows
+        from the database so memory use stays bounded.
+
         Args:
             file_path (str): The path where the Excel report should be saved.
+            progress: Optional callback(rows_written, total_rows) called after each batch.
         """
         try:
-            # Import required libraries for Excel generation
-            import pandas as pd
             from app.db.database import SessionLocal
-            from app.db.models import LogbookEntry
-            from datetime import datetime
+            from app.services.artifact_service import cached_report
+            from app.services.export_service import write_excel
 
-            # Get data from database
             with SessionLocal() as session:
-                entries = session.query(LogbookEntry).filter(
-                    LogbookEntry.is_deleted.is_(False)
-                ).all()
-
-                # Create dataframe
-                data = []
-                for entry in entries:
-                    data.append({
-                        "ID": entry.id,
-                        "Task": entry.task or "",
-                        "Call Description": entry.call_description or "",
-                        "Solution": entry.solution_description or "",
-                        "Status": entry.status.value if entry.status else "",
-                        "Location": entry.device or "",
-                        "Created At": entry.created_at.strftime("%Y-%m-%d") if entry.created_at else ""
-                    })
-
-                df = pd.DataFrame(data)
-
-                # Create Excel writer
-                with pd.ExcelWriter(file_path, engine='openpyxl') as writer:
-                    # Write main data sheet
-                    df.to_excel(writer, sheet_name='Logbook Entries', index=False)
-
-                    # Create summary sheet
-                    if not df.empty:
-                        # Count by status
-                        status_counts = df['Status'].value_counts().reset_index()
-                        status_counts.columns = ['Status', 'Count']
-
-                        # Write summary sheet
-                        status_counts.to_excel(writer, sheet_name='Summary', index=False)
-
-                        # Get workbook and summary worksheet
-                        workbook = writer.book
-                        summary_sheet = workbook['Summary']
-
-                        # Add title to summary sheet
-                        summary_sheet['A1'].font = workbook.create_font(size=14, bold=True)
-                        summary_sheet.merge_cells('A1:B1')
-                        summary_sheet['A1'] = 'Status Summary'
-
-                        # Add headers in row 2
-                        summary_sheet['A2'] = 'Status'
-                        summary_sheet['B2'] = 'Count'
-
-                        # Style headers
-                        for cell in summary_sheet[2]:
-                            cell.font = workbook.create_font(bold=True)
-
-                        # Adjust column widths
-                        for column in summary_sheet.columns:
-                            max_length = 0
-                            column_letter = column[0].column_letter
-                            for cell in column:
-                                if cell.value:
-                                    max_length = max(max_length, len(str(cell.value)))
-                            adjusted_width = (max_length + 2)
-                            summary_sheet.column_dimensions[column_letter].width = adjusted_width
+                # Reuse the previous export if no matching entry changed since
+                cached_report(session, file_path, "xlsx", lambda path: write_excel(path, session, progress=progress))
 
             print(f"Excel report successfully generated at {file_path}")
 
         except ImportError as ie:
-            print(f"Missing required library for Excel generation: {ie}")
-            # Install required libraries if not available
-            import subprocess
-            subprocess.run(["pip", "install", "pandas", "openpyxl"])
-            # Try again after installation
-            self.generate_excel_report(file_path)
+            print(f"Missing required library for Excel generation (install openpyxl): {ie}")
+            raise
         except Exception as ex:
             print(f"Error generating Excel report: {ex}")
             raise
@@ -2595,25 +2263,16 @@ class ReportsView(ft.Container):
     def save_csv_result(self, e: ft.FilePickerResultEvent):
         """Handle the result of the CSV file picker dialog.
 
+        The report is generated by a background job; progress and the result
+        are shown by on_job_event.
+
         Args:
             e (ft.FilePickerResultEvent): The file picker result event containing the selected path.
         """
         try:
             if e.path:
                 print(f"CSV file path selected: {e.path}")
-                # Generate and save the CSV file
-                self.generate_csv_report(e.path)
-
-                # Show success message
-                if self.page:
-                    self.page.snack_bar = ft.SnackBar(
-                        content=ft.Text(f"CSV report saved to: {e.path}"),
-                        action="OK",
-                        bgcolor=ft.colors.BLACK,
-                        action_color=ft.colors.ORANGE,
-                    )
-                    self.page.snack_bar.open = True
-                    self.page.update()
+                self.run_export_job("CSV", "export_csv", self.generate_csv_report, e.path)
             else:
                 print("CSV export cancelled")
         except Exception as ex:
@@ -2628,44 +2287,24 @@ class ReportsView(ft.Container):
                 self.page.snack_bar.open = True
                 self.page.update()
 
-    def generate_csv_report(self, file_path):
+    def generate_csv_report(self, file_path, progress=None):
         """Generate a CSV report and save it to the specified path.
 
+        Rows are streamed from the database in batches, so memory use does not
+        grow with the number of entries.
+
         Args:
             file_path (str): The path where the CSV report should be saved.
+            progress: Optional callback(rows_written, total_rows) called after each batch.
         """
         try:
-            # Import required libraries for CSV generation
-            import csv
             from app.db.database import SessionLocal
-            from app.db.models import LogbookEntry
+            from app.services.artifact_service import cached_report
+            from app.services.export_service import write_csv
 
-            # Get data from database
             with SessionLocal() as session:
-                entries = session.query(LogbookEntry).filter(
-                    LogbookEntry.is_deleted.is_(False)
-                ).all()
-
-                # Write to CSV file
-                with open(file_path, 'w', newline='', encoding='utf-8') as csvfile:
-                    # Define CSV writer and headers
-                    fieldnames = ['ID', 'Task', 'Call Description', 'Solution', 'Status', 'Location', 'Created At']
-                    writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-
-                    # Write header
-                    writer.writeheader()
-
-                    # Write data rows
-                    for entry in entries:
-                        writer.writerow({
-                            'ID': entry.id,
-                            'Task': entry.task or "",
-                            'Call Description': entry.call_description or "",
-                            'Solution': entry.solution_description or "",
-                            'Status': entry.status.value if entry.status else "",
-                            'Location': entry.device or "",
-                            'Created At': entry.created_at.strftime("%Y-%m-%d") if entry.created_at else ""
-                        })
+                # Reuse the previous export if no matching entry changed since
+                cached_report(session, file_path, "csv", lambda path: write_csv(path, session, progress=progress))
 
             print(f"CSV report successfully generated at {file_path}")
 
@@ -2673,6 +2312,118 @@ class ReportsView(ft.Container):
             print(f"Error generating CSV report: {ex}")
             raise
 
+    def run_export_job(self, label, kind, generate, file_path, unit="rows"):
+        """Run an export as a background job with a cancellable progress snackbar.
+
+        Args:
+            label (str): Export format shown to the user.
+            kind (str): Job type recorded in the jobs table.
+            generate: Report method called as generate(file_path, progress=...).
+            file_path (str): The path where the report should be saved.
+            unit (str): Name of the counted items shown in the progress text.
+        """
+        from app.services.job_service import job_topic, submit_job
+
+        if not getattr(self, "_jobs_subscribed", False):
+            self.page.pubsub.subscribe_topic(job_topic(self.page, "reports"), self.on_job_event)
+            self._jobs_subscribed = True
+
+        user_id = None
+        if self.page.data is not None:
+            user_id = self.page.data.get("user_id")
+
+        job_id = submit_job(
+            kind,
+            lambda job: generate(file_path, progress=job.progress),
+            page=self.page,
+            channel="reports",
+            user_id=user_id,
+            result_path=file_path,
+        )
+        self.export_jobs[job_id] = {
+            "label": label,
+            "update": self.show_export_progress(f"Exporting {label}", unit=unit, job_id=job_id),
+        }
+
+    def on_job_event(self, topic, event):
+        """Update the export snackbar from a background job event.
+
+        Args:
+            topic (str): Pubsub topic of the event.
+            event (dict): Job event published by the job service.
+        """
+        export_job = self.export_jobs.get(event["job_id"])
+        if export_job is None or not self.page:
+            return
+
+        status = event["status"]
+        if status == "running":
+            if event.get("done") and export_job["update"]:
+                export_job["update"](event["done"], event.get("total"))
+            return
+        if status == "queued":
+            return
+
+        del self.export_jobs[event["job_id"]]
+        if status == "completed":
+            message = f"{export_job['label']} report saved to: {event['result_path']}"
+            bgcolor, action_color = ft.colors.BLACK, ft.colors.ORANGE
+        elif status == "cancelled":
+            message = f"{export_job['label']} export cancelled"
+            bgcolor, action_color = ft.colors.BLACK, ft.colors.ORANGE
+        else:
+            message = f"Error saving {export_job['label']}: {event.get('error')}"
+            bgcolor, action_color = ft.colors.RED_500, ft.colors.WHITE
+
+        self.page.snack_bar = ft.SnackBar(
+            content=ft.Text(message),
+            action="OK",
+            bgcolor=bgcolor,
+            action_color=action_color,
+        )
+        self.page.snack_bar.open = True
+        self.page.update()
+
+    def show_export_progress(self, label, unit="rows", job_id=None):
+        """Show a progress snackbar and return a callback that updates it.
+
+        Args:
+            label (str): Text describing the running export.
+            unit (str): Name of the counted items shown in the progress text.
+            job_id (str): Background job to cancel from the snackbar, if any.
+
+        Returns:
+            callable: progress(done, total) callback.
+        """
+        if not self.page:
+            return None
+
+        progress_bar = ft.ProgressBar(value=0, color=ft.colors.ORANGE, bgcolor=ft.colors.GREY_800)
+        progress_text = ft.Text(f"{label}...", color=ft.colors.WHITE)
+        self.page.snack_bar = ft.SnackBar(
+            content=ft.Column([progress_text, progress_bar], tight=True),
+            bgcolor=ft.colors.BLACK,
+            duration=600000,
+        )
+        if job_id:
+            from app.services.job_service import cancel_job
+
+            self.page.snack_bar.action = "Cancel"
+            self.page.snack_bar.action_color = ft.colors.ORANGE
+            self.page.snack_bar.on_action = lambda _: cancel_job(job_id)
+        self.page.snack_bar.open = True
+        self.page.update()
+
+        def update_progress(rows_written, total_rows):
+            if total_rows:
+                progress_bar.value = rows_written / total_rows
+                progress_text.value = f"{label}: {rows_written} of {total_rows} {unit}"
+            else:
+                progress_text.value = f"{label}: {rows_written} {unit}"
+            self.page.update()
+
+        return update_progress
+
     def export_to_pdf_direct(self, e):
         """Direct export to PDF handler that doesn't use optional parameters.
         Opens the file picker dialog for PDF export.
@@ -3066,8 +2817,7 @@ class ReportsView(ft.Container):
                     self.page.update()
                 return
 
-            # Here you would save the configuration to the database
-            # For now, just show a success message
+            schedule = self.create_report_schedule(email, frequency, report_type)
 
             # Close the custom dialog
             self.close_custom_dialog(dialog_container)
@@ -3075,7 +2825,10 @@ class ReportsView(ft.Container):
             # Show a success message
             if self.page:
                 self.page.snack_bar = ft.SnackBar(
-                    content=ft.Text(f"Scheduled report configured for {email} with {frequency} frequency."),
+                    content=ft.Text(
+                        f"Scheduled report configured for {email} with {frequency} frequency. "
+                        f"First report: {schedule.next_run:%Y-%m-%d %H:%M}."
+                    ),
                     action="OK",
                     bgcolor=ft.colors.BLACK,
                     action_color=ft.colors.ORANGE,
@@ -3085,6 +2838,75 @@ class ReportsView(ft.Container):
                 print(f"Report configuration saved for {email}")
         except Exception as ex:
             print(f"Error saving report configuration: {ex}")
+            if self.page:
+                self.page.snack_bar = ft.SnackBar(
+                    content=ft.Text(f"Error saving report configuration: {ex}"),
+                    bgcolor=ft.colors.RED_500,
+                )
+                self.page.snack_bar.open = True
+                self.page.update()
+
+    def create_report_schedule(self, email, frequency, report_type):
+        """Store a report schedule and hand it to the report scheduler.
+
+        Weekly reports go out on Mondays and monthly reports on the first of
+        the month, at the scheduler's default time of day.
+
+        Args:
+            email (str): The email address to receive reports.
+            frequency (str): The frequency of reports ('daily', 'weekly', 'monthly').
+            report_type (str): The type of report ('summary', 'detailed', 'custom').
+
+        Returns:
+            ReportSchedule: The stored schedule.
+        """
+        import uuid
+        from app.db.database import SessionLocal
+        from app.db.models import Report, ReportSchedule, RoleEnum, User
+        from app.services.schedule_service import (
+            DEFAULT_TIME_OF_DAY, REPORT_FORMATS, compute_next_run, notify_schedule_changed
+        )
+
+        with SessionLocal() as session:
+            user_id = None
+            if self.page and self.page.data is not None:
+                user_id = self.page.data.get("user_id")
+            if user_id is None:
+                # Fall back to an admin (or any) user as the creator
+                default_user = session.query(User).filter(User.role == RoleEnum.ADMIN).first() or \
+                    session.query(User).first()
+                if default_user is None:
+                    raise ValueError("No user available to own the schedule")
+                user_id = default_user.id
+
+            report = Report(
+                name=f"{report_type.capitalize()} Report",
+                parameters={"report_type": report_type},
+                file_type=REPORT_FORMATS[report_type][0],
+                status="scheduled",
+                created_by_id=uuid.UUID(str(user_id)),
+            )
+            session.add(report)
+            session.flush()
+
+            schedule = ReportSchedule(
+                report_id=report.id,
+                frequency=frequency,
+                day_of_week=0 if frequency == "weekly" else None,
+                day_of_month=1 if frequency == "monthly" else None,
+                time_of_day=DEFAULT_TIME_OF_DAY,
+                recipients=[email],
+                is_active=True,
+                created_by_id=report.created_by_id,
+            )
+            schedule.next_run = compute_next_run(schedule, datetime.now())
+            session.add(schedule)
+            session.commit()
+            session.refresh(schedule)
+            session.expunge(schedule)
+
+        notify_schedule_changed(schedule.id)
+        return schedule
 
     def close_dialog(self, dialog):
         """Close the specified dialog.
@@ -3147,18 +2969,24 @@ class ReportsView(ft.Container):
         except Exception as ex:
             print(f"Error closing custom dialog: {ex}")
 
-    def refresh_charts(self, filter_data):
-        """Refresh all charts with new data based on the filter data.
+    def refresh_charts(self, report_filter):
+        """Refresh all charts with new data based on the report filter.
 
         Args:
-            filter_data (dict): Dictionary containing filter parameters.
+            report_filter (ReportFilter): Filter applied to every chart query.
         """
-        # Create new chart instances with fresh data
-        self.chart_issues_by_category = ChartCard("Issues by Category", chart_type="pie")
-        self.chart_issues_by_location = ChartCard("Issues by Location", chart_type="pie")
-        self.chart_monthly_trends = ChartCard("Monthly Trends", chart_type="line", height=400)
-        self.chart_resolution_by_category = ChartCard("Resolution Time by Category", chart_type="bar")
-        self.chart_resolution_by_technician = ChartCard("Resolution Time by Technician", chart_type="bar")
+        # Create new chart instances; each is cached under its title and filter
+        self.chart_issues_by_category = ChartCard("Issues by Category", chart_type="pie", report_filter=report_filter)
+        self.chart_issues_by_location = ChartCard("Issues by Location", chart_type="pie", report_filter=report_filter)
+        self.chart_monthly_trends = ChartCard(
+            "Monthly Trends", chart_type="line", height=400, report_filter=report_filter
+        )
+        self.chart_resolution_by_category = ChartCard(
+            "Resolution Time by Category", chart_type="bar", report_filter=report_filter
+        )
+        self.chart_resolution_by_technician = ChartCard(
+            "Resolution Time by Technician", chart_type="bar", report_filter=report_filter
+        )
 
         # Update the UI components with the new chart instances
         # Overview tab
@@ -3178,91 +3006,33 @@ class ReportsView(ft.Container):
         """Update reports based on filter data. This includes:
         - Updating summary statistics
         - Refreshing all charts
-        - Calculating metrics like completion rate and average resolution time
+
+        The filter data is compiled once into SQL predicates that every
+        summary and chart query applies.
 
         Args:
             filter_data (dict): Dictionary containing filter parameters including:
                 - start_date: Start date for filtering
                 - end_date: End date for filtering
+                - task: Task name or "all"
+                - technician: Responsible person or "all"
+                - status: Status value or "all"
         """
-        from app.db.database import SessionLocal
-        from app.db.models import LogbookEntry, StatusEnum, Category
-        from sqlalchemy import not_, or_
+        from app.services.report_filter_service import ReportFilter
 
         print(f"Update reports with filters: {filter_data}")
 
-        # Extract filter data
-        start_date = datetime.strptime(filter_data.get('start_date', '2020-01-01'), '%Y-%m-%d').date()
-        end_date = datetime.strptime(filter_data.get('end_date', datetime.now().strftime('%Y-%m-%d')),
-                                     '%Y-%m-%d').date()
+        try:
+            report_filter = ReportFilter.from_filter_data(filter_data)
+        except ValueError as ex:
+            print(f"Invalid report filter: {ex}")
+            return
 
         # Update summary stats with filtered data
-        with SessionLocal() as session:
-            # Base query with date filters and excluding deleted entries
-            base_query = session.query(LogbookEntry).filter(
-                LogbookEntry.created_at.between(start_date, end_date + timedelta(days=1)),
-                or_(LogbookEntry.is_deleted == False, LogbookEntry.is_deleted == None)
-            )
-
-            # Total entries
-            total_entries = base_query.count()
-
-            # Completed entries for completion rate
-            completed_entries = base_query.filter(LogbookEntry.status == StatusEnum.COMPLETED).count()
-
-            # Escalated entries for escalation rate
-            escalated_entries = base_query.filter(LogbookEntry.status == StatusEnum.ESCALATION).count()
-
-            # Get entries with resolution_time field
-            entries = session.query(LogbookEntry).filter(
-                LogbookEntry.created_at.between(start_date, end_date + timedelta(days=1)),
-                LogbookEntry.status == StatusEnum.COMPLETED,
-                LogbookEntry.resolution_time is not None,  # Only entries with resolution_time
-                or_(not LogbookEntry.is_deleted, LogbookEntry.is_deleted is None)
-            ).all()
-
-            # Calculate average resolution time
-            total_hours = 0
-            entry_count = 0
-
-            for entry in entries:
-                if entry.resolution_time and entry.created_at:
-                    # Calculate the difference in hours between created_at and resolution_time
-                    time_diff = (entry.resolution_time - entry.created_at).total_seconds() / 3600
-
-                    # Only count reasonable resolution times (less than 48 hours)
-                    # This prevents outliers from skewing the average
-                    if 0 <= time_diff <= 48:
-                        total_hours += time_diff
-                        entry_count += 1
-                        print(f"Entry {entry.id}: Resolution time: {time_diff:.2f} hours")
-
-            # Calculate average in hours
-            avg_resolution_hours = total_hours / entry_count if entry_count > 0 else 0
-            print(f"Total hours: {total_hours}, Entry count: {entry_count}, Average: {avg_resolution_hours:.2f} hours")
-
-        # Update summary stats
-        self.summary_stats.total_entries = str(total_entries)
-
-        # Format average resolution time
-        if avg_resolution_hours < 1:
-            avg_resolution_formatted = f"{int(avg_resolution_hours * 60)} mins"
-        else:
-            avg_resolution_formatted = f"{avg_resolution_hours:.1f} hours"
-        self.summary_stats.avg_resolution_time = avg_resolution_formatted
-
-        # Calculate rates
-        completion_rate = (completed_entries / total_entries * 100) if total_entries > 0 else 0
-        escalation_rate = (escalated_entries / total_entries * 100) if total_entries > 0 else 0
-
-        self.summary_stats.completion_rate = f"{int(completion_rate)}%"
-        self.summary_stats.escalation_rate = f"{int(escalation_rate)}%"
-
-        # Rebuild the summary stats content
-        self.summary_stats.controls = [self.summary_stats.build_content()]
+        self.summary_stats.load_data(report_filter)
 
-        # Refresh all charts with new data based on the date filters
-        self.refresh_charts(filter_data)
+        # Refresh all charts with new data based on the filters
+        self.refresh_charts(report_filter)
 
         # Update the UI
         self.update()
@@ -0,0 +1,99 @@
+import base64
+import json
+import uuid
+from datetime import datetime
+from sqlalchemy import and_, or_
+
+
+def encode_cursor(sort_value: datetime, id_value: uuid.UUID) -> str:
+    """Encode a keyset position as an opaque URL-safe cursor token.
+
+    Args:
+        sort_value: Timestamp of the last row on the page
+        id_value: Id of the last row on the page
+
+    Returns:
+        str: Cursor token to pass back for the next page
+    """
+    payload = json.dumps({"t": sort_value.isoformat(), "id": str(id_value)}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str):
+    """Decode a cursor token produced by encode_cursor.
+
+    Args:
+        token: Cursor token from a previous response
+
+    Returns:
+        tuple: (sort_value, id_value) keyset position
+
+    Raises:
+        ValueError: If the token is malformed
+    """
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return datetime.fromisoformat(payload["t"]), uuid.UUID(payload["id"])
+    except (ValueError, KeyError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {token}") from e
+
+
+def apply_keyset(query, sort_column, id_column, cursor=None):
+    """Order a query newest-first and seek past a keyset cursor.
+
+    Rows are ordered by (sort_column, id_column) descending, so the id breaks
+    ties between rows sharing the same timestamp and every row appears once.
+
+    Args:
+        query: SQLAlchemy query or select() statement to paginate
+        sort_column: Timestamp column to sort by (e.g. LogbookEntry.created_at)
+        id_column: Unique tie-breaker column (e.g. LogbookEntry.id)
+        cursor: Optional (sort_value, id_value) of the last row of the previous page
+
+    Returns:
+        Query: The ordered query restricted to rows after the cursor
+    """
+    if cursor is not None:
+        sort_value, id_value = cursor
+        query = query.filter(
+            or_(
+                sort_column < sort_value,
+                and_(sort_column == sort_value, id_column < id_value)
+            )
+        )
+    return query.order_by(sort_column.desc(), id_column.desc())
+
+
+def fetch_page(query, sort_attr: str, limit: int):
+    """Fetch one page from a keyset-ordered query and compute the next cursor.
+
+    Args:
+        query: Query already ordered/restricted by apply_keyset
+        sort_attr: Name of the row attribute holding the sort value (e.g. 'created_at')
+        limit: Maximum number of rows to return
+
+    Returns:
+        tuple: (rows, next_cursor) where next_cursor is None on the last page
+    """
+    return split_page(query.limit(limit + 1).all(), sort_attr, limit)
+
+
+def split_page(rows, sort_attr: str, limit: int):
+    """Trim rows fetched with limit + 1 to one page and compute the next cursor.
+
+    Used directly with select() statements executed on an AsyncSession.
+
+    Args:
+        rows: Up to limit + 1 rows from a keyset-ordered statement
+        sort_attr: Name of the row attribute holding the sort value (e.g. 'created_at')
+        limit: Maximum number of rows to return
+
+    Returns:
+        tuple: (rows, next_cursor) where next_cursor is None on the last page
+    """
+    rows = list(rows)
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(getattr(rows[-1], sort_attr), rows[-1].id)
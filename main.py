@@ -3,9 +3,15 @@ import flet as ft
 from dotenv import load_dotenv
 
 # Import database models for querying data
-from app.db.database import engine, SessionLocal
-from app.db.models import Base, LogbookEntry, StatusEnum
-from sqlalchemy import func
+from app.db.database import engine, SessionLocal, create_missing_indexes, normalize_sqlite_timestamps
+from app.db.models import Base, LogbookEntry
+from app.services.audit_partition_service import compact_audit_partitions, ensure_audit_partitions
+from app.services.audit_sink_service import replay_spool
+import app.services.artifact_service  # noqa: F401  registers the report cache version flush hooks
+from app.services.job_service import recover_interrupted_jobs
+from app.services.rollup_service import ensure_rollup
+from app.services.schedule_service import start_scheduler
+from app.services.search_service import ensure_search_index
 
 # Import views
 from app.ui.views.dashboard_view_new import DashboardView
@@ -24,9 +30,45 @@ including UI setup, routing, and view management.
 load_dotenv()
 """Loads configuration from .env file."""
 
-# Create database tables if they don't exist
-Base.metadata.create_all(bind=engine)
-"""Initializes database schema on startup."""
+
+def startup():
+    """Prepare the database and start the background services.
+
+    Runs only when main.py is executed: worker processes started with the
+    spawn method re-import this module as __mp_main__ and must not recover
+    the parent's jobs, replay its audit spool or start another scheduler.
+    """
+    # Create database tables if they don't exist
+    Base.metadata.create_all(bind=engine)
+    create_missing_indexes(engine)
+
+    # Entries written with CURRENT_TIMESTAMP by earlier releases would repeat in keyset pages
+    normalize_sqlite_timestamps(engine, LogbookEntry.__table__)
+
+    # Populate the dashboard rollup for databases created before it existed
+    with SessionLocal() as session:
+        ensure_rollup(session)
+
+    # Create the full-text search index (FTS5 on SQLite, GIN on PostgreSQL)
+    ensure_search_index(engine)
+
+    # Jobs still queued or running belonged to a previous process and will never finish
+    with SessionLocal() as session:
+        recover_interrupted_jobs(session)
+
+    # Store audit logs in monthly partitions behind the audit_logs view
+    ensure_audit_partitions(engine)
+
+    # Load audit log records spooled by a previous process but never flushed
+    replay_spool()
+
+    # Archive audit log months past AUDIT_RETENTION_MONTHS
+    compact_audit_partitions()
+
+    # Send scheduled reports from this process (disable with SCHEDULER_ENABLED=false)
+    if os.getenv("SCHEDULER_ENABLED", "true").lower() == "true":
+        start_scheduler()
+
 
 # Database is now persistent - entries will be saved between application restarts
 
@@ -154,42 +196,8 @@ def main(page: ft.Page):
         settings_view = SettingsView()
         settings_view.page = page
 
-        # Update dashboard view with actual data
-        # Get counts and recent activities from database
-        with SessionLocal() as session:
-            # Get counts
-            total_count = session.query(func.count(LogbookEntry.id)).scalar() or 0
-            open_count = session.query(func.count(LogbookEntry.id)).filter(
-                LogbookEntry.status == StatusEnum.OPEN).scalar() or 0
-            completed_count = session.query(func.count(LogbookEntry.id)).filter(
-                LogbookEntry.status == StatusEnum.COMPLETED).scalar() or 0
-            escalated_count = session.query(func.count(LogbookEntry.id)).filter(
-                LogbookEntry.status == StatusEnum.ESCALATION).scalar() or 0
-
-            # Get recent activities (5 most recent entries)
-            recent_entries = (
-                session.query(LogbookEntry)
-                .order_by(LogbookEntry.created_at.desc())
-                .limit(5)
-                .all()
-            )
-
-            # Format recent activities for the dashboard
-            recent_activities = []
-            for entry in recent_entries:
-                # Format the date/time
-                if entry.created_at:
-                    from datetime import datetime
-                    now = datetime.now()
-                    delta = now - entry.created_at
-                    if delta.days > 0:
-                        time_str = f"{delta.days} days ago"
-                    elif delta.seconds // 3600 > 0:
-                        time_str = f"{delta.seconds // 3600} hours ago"
-                    else:
-                        time_str = f"{delta.seconds // 60} minutes ago"
-                else:
-                    time_str = "Unknown time"
+        # Dashboard statistics and recent activities are loaded by DashboardView
+        # itself through the stats service, so no extra queries are issued here
 
         # Create app bar with navigation buttons
         app_bar = ft.AppBar(
@@ -388,6 +396,9 @@ if __name__ == "__main__":
     parser.add_argument('--port', type=int, default=PORT, help='Port to run the application on')
     args = parser.parse_args()
 
+    # Prepare the database and start the background services (not in spawned workers)
+    startup()
+
     # Run Flet app with the specified port
     print(f"Starting LogBook application on port {args.port}")
     ft.app(target=main, port=args.port)
\ No newline at end of file
@@ -0,0 +1,118 @@
+import os
+import tempfile
+import uuid
+from datetime import date
+
+import pytest
+
+"""Shared fixtures for the test suite.
+
+The application creates its engines when app.db.database is imported, so the
+environment is pointed at a scratch SQLite database (and scratch spool,
+archive and report cache directories) before anything from app is imported.
+All tests share that database; each test creates its own user and location
+and only looks at the rows it created.
+"""
+
+_work_dir = tempfile.mkdtemp(prefix="preventplus_tests_")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_work_dir, 'test.db')}"
+os.environ.pop("ASYNC_DATABASE_URL", None)
+os.environ["AUDIT_SPOOL_DIR"] = os.path.join(_work_dir, "audit_spool")
+os.environ["AUDIT_ARCHIVE_DIR"] = os.path.join(_work_dir, "audit_archive")
+os.environ["REPORT_CACHE_DIR"] = os.path.join(_work_dir, "report_cache")
+os.environ["UPLOAD_DIR"] = os.path.join(_work_dir, "uploads")
+os.environ["SCHEDULER_ENABLED"] = "false"
+os.environ["AUDIT_FLUSH_INTERVAL_MS"] = "50"
+
+
+@pytest.fixture(scope="session", autouse=True)
+def database():
+    """Create the schema the way the application does on startup."""
+    from app.db.database import Base, create_missing_indexes, engine
+    import app.db.models  # noqa: F401  registers the models
+    import app.services.artifact_service  # noqa: F401  registers the report cache version flush hooks
+    import app.services.rollup_service  # noqa: F401  registers the rollup flush hooks
+    from app.services.audit_partition_service import ensure_audit_partitions
+    from app.services.search_service import ensure_search_index
+
+    Base.metadata.create_all(bind=engine)
+    create_missing_indexes(engine)
+    ensure_search_index(engine)
+    ensure_audit_partitions(engine)
+    yield engine
+
+
+@pytest.fixture
+def session():
+    """A SessionLocal session, closed after the test."""
+    from app.db.database import SessionLocal
+
+    with SessionLocal() as db:
+        yield db
+
+
+@pytest.fixture
+def user(session):
+    """A committed admin user with the password 'secret'."""
+    from app.core.security import get_password_hash
+    from app.db.models import RoleEnum, User
+
+    name = f"user_{uuid.uuid4().hex[:8]}"
+    db_user = User(
+        username=name,
+        email=f"{name}@example.com",
+        password_hash=get_password_hash("secret"),
+        full_name=name.title(),
+        role=RoleEnum.ADMIN,
+    )
+    session.add(db_user)
+    session.commit()
+    return db_user
+
+
+@pytest.fixture
+def location(session, user):
+    """A committed location of its own, so tests can filter on it."""
+    from app.db.models import Location
+
+    db_location = Location(name=f"location_{uuid.uuid4().hex[:8]}", created_by_id=user.id)
+    session.add(db_location)
+    session.commit()
+    return db_location
+
+
+@pytest.fixture
+def make_entry(session, user, location):
+    """Factory adding a logbook entry at the test's location (not committed)."""
+    from app.db.models import LogbookEntry
+
+    def _make_entry(**values):
+        defaults = {
+            "user_id": user.id,
+            "start_date": date(2026, 1, 1),
+            "responsible_person": "Tester",
+            "location_id": location.id,
+            "device": "pump",
+            "call_description": "leaking seal",
+        }
+        entry = LogbookEntry(**{**defaults, **values})
+        session.add(entry)
+        return entry
+
+    return _make_entry
+
+
+@pytest.fixture
+def api_client(user):
+    """A TestClient for the logbook and auth routers, logged in as the user."""
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+    from app.api import auth, logbook
+
+    app = FastAPI()
+    app.include_router(auth.router)
+    app.include_router(logbook.router)
+    with TestClient(app) as client:
+        token = client.post("/auth/token", data={"username": user.username, "password": "secret"}).json()
+        client.headers["Authorization"] = f"Bearer {token['access_token']}"
+        yield client
@@ -0,0 +1,91 @@
+from sqlalchemy import update
+
+from app.db.models import Location, LogbookEntry
+from app.services.artifact_service import artifact_key, cached_report, data_versions
+from app.services.export_service import write_csv
+
+"""Report artifact cache keys."""
+
+
+def _render_csv(session, location, path):
+    """Write the location's entries CSV through the cache."""
+    filters = [LogbookEntry.location_id == location.id]
+    hit = cached_report(
+        session, str(path), "csv", lambda target: write_csv(target, session, filters),
+        parameters={"location_id": location.id}, filters=filters,
+    )
+    return hit, path.read_text(encoding="utf-8")
+
+
+def test_unchanged_report_is_served_from_cache(tmp_path, session, make_entry, location):
+    make_entry(call_description="first")
+    session.commit()
+
+    assert _render_csv(session, location, tmp_path / "a.csv")[0] is False
+    hit, content = _render_csv(session, location, tmp_path / "b.csv")
+
+    assert hit is True
+    assert "first" in content
+
+
+def test_edit_within_the_same_second_invalidates_report(tmp_path, session, make_entry, location):
+    entry = make_entry(call_description="OLD")
+    session.commit()
+    assert _render_csv(session, location, tmp_path / "before.csv")[0] is False
+
+    # Put updated_at back, as a second-resolution clock would within one second
+    updated_at = entry.updated_at
+    entry.call_description = "NEW"
+    session.commit()
+    session.execute(update(LogbookEntry).where(LogbookEntry.id == entry.id).values(updated_at=updated_at))
+    session.commit()
+    hit, content = _render_csv(session, location, tmp_path / "after.csv")
+
+    assert hit is False
+    assert "NEW" in content and "OLD" not in content
+
+
+def test_location_rename_within_the_same_second_changes_key(session, make_entry, location):
+    make_entry()
+    session.commit()
+    filters = [LogbookEntry.location_id == location.id]
+    before = artifact_key(session, {}, "xlsx", filters)
+    version = data_versions(session)["locations"]
+
+    updated_at = location.updated_at
+    location.name = f"{location.name} (renamed)"
+    session.commit()
+    session.execute(update(Location).where(Location.id == location.id).values(updated_at=updated_at))
+    session.commit()
+
+    assert data_versions(session)["locations"] == version + 1
+    assert artifact_key(session, {}, "xlsx", filters) != before
+
+
+def test_rolled_back_flush_keeps_versions(session, make_entry):
+    versions = data_versions(session)
+    make_entry()
+    session.flush()
+    session.rollback()
+
+    assert data_versions(session) == versions
+
+
+def test_scheduled_report_is_rendered_again_after_same_second_edit(tmp_path, session, make_entry):
+    from datetime import datetime, timedelta
+    from app.services.schedule_service import render_report
+
+    start = datetime(1999, 12, 31, 23, 59, 58)
+    entry = make_entry(created_at=start, call_description="OLD")
+    session.commit()
+    render_report(session, "custom", start, start + timedelta(seconds=1), str(tmp_path / "before.csv"))
+
+    updated_at = entry.updated_at
+    entry.call_description = "NEW"
+    session.commit()
+    session.execute(update(LogbookEntry).where(LogbookEntry.id == entry.id).values(updated_at=updated_at))
+    session.commit()
+    render_report(session, "custom", start, start + timedelta(seconds=1), str(tmp_path / "after.csv"))
+
+    content = (tmp_path / "after.csv").read_text(encoding="utf-8")
+    assert "NEW" in content and "OLD" not in content
@@ -0,0 +1,166 @@
+import uuid
+from datetime import date, datetime
+
+import pytest
+from sqlalchemy import Column, MetaData, Table, inspect, insert, select, text
+
+from app.db.database import Base, create_db_engine
+from app.db.models import AuditLog
+from app.services.audit_partition_service import (
+    archive_path,
+    audit_log_query,
+    compact_audit_partitions,
+    ensure_audit_partitions,
+    entity_timeline,
+    insert_audit_rows,
+    list_partitions,
+    month_start,
+    partition_name,
+    query_audit_logs,
+    read_archive,
+)
+
+"""Monthly partitions of the audit log."""
+
+
+@pytest.fixture
+def audit_engine(tmp_path):
+    """An engine on a database of its own, since compaction drops whole months."""
+    scratch = create_db_engine(f"sqlite:///{tmp_path / 'audit.db'}")
+    # audit_logs becomes the view over the partitions
+    tables = [table for name, table in Base.metadata.tables.items() if name != "audit_logs"]
+    Base.metadata.create_all(scratch, tables=tables)
+    ensure_audit_partitions(scratch)
+    yield scratch
+    scratch.dispose()
+
+
+def _row(created_at, entity_id="1", action="update"):
+    return {
+        "id": uuid.uuid4(),
+        "user_id": uuid.uuid4(),
+        "action": action,
+        "entity_type": "logbook_entry",
+        "entity_id": entity_id,
+        "details": {"device": {"old": "pump", "new": "valve"}},
+        "ip_address": None,
+        "user_agent": None,
+        "created_at": created_at,
+    }
+
+
+def _insert(audit_engine, rows, skip_existing=False):
+    with audit_engine.begin() as connection:
+        return insert_audit_rows(connection, rows, skip_existing=skip_existing)
+
+
+def test_rows_land_in_the_partition_of_their_month(audit_engine):
+    rows = [_row(datetime(2024, 1, 31, 23, 59)), _row(datetime(2024, 2, 1)), _row(datetime(2024, 2, 15))]
+
+    assert _insert(audit_engine, rows) == 3
+
+    with audit_engine.connect() as connection:
+        assert {date(2024, 1, 1), date(2024, 2, 1)} <= set(list_partitions(connection))
+        for month, expected in ((date(2024, 1, 1), 1), (date(2024, 2, 1), 2)):
+            count = connection.execute(text(f"SELECT count(*) FROM {partition_name(month)}")).scalar()
+            assert count == expected
+        # The view the AuditLog model reads covers every partition
+        assert connection.execute(select(AuditLog.id).where(AuditLog.id.in_([r["id"] for r in rows]))).all()
+        assert len(connection.execute(text("SELECT id FROM audit_logs")).all()) == 3
+
+
+def test_skip_existing_ignores_replayed_rows(audit_engine):
+    rows = [_row(datetime(2024, 3, 1)), _row(datetime(2024, 4, 1))]
+    _insert(audit_engine, rows[:1])
+
+    assert _insert(audit_engine, rows, skip_existing=True) == 1
+    assert len(query_audit_logs(audit_engine, entity_type="logbook_entry")) == 2
+
+
+def test_range_queries_only_read_overlapping_partitions(audit_engine):
+    rows = [_row(datetime(2024, month, 10)) for month in (5, 6, 7)]
+    _insert(audit_engine, rows)
+
+    with audit_engine.connect() as connection:
+        statement = audit_log_query(connection, start=datetime(2024, 6, 1), end=datetime(2024, 7, 1))
+        sql = str(statement)
+    assert partition_name(date(2024, 6, 1)) in sql
+    assert partition_name(date(2024, 5, 1)) not in sql
+    assert partition_name(date(2024, 7, 1)) not in sql
+
+    found = query_audit_logs(audit_engine, start=date(2024, 6, 1), end=date(2024, 8, 1))
+    assert [row["id"] for row in found] == [rows[2]["id"], rows[1]["id"]]
+
+
+def test_entity_timeline_pages_across_partitions(audit_engine):
+    rows = [_row(datetime(2024, month, day), entity_id="42") for month in (8, 9, 10) for day in (5, 20)]
+    rows.append(_row(datetime(2024, 9, 21), entity_id="43"))
+    _insert(audit_engine, rows)
+
+    seen = []
+    position = None
+    with audit_engine.connect() as connection:
+        while True:
+            page = entity_timeline(connection, "logbook_entry", "42", position, limit=4)
+            seen.extend(row.id for row in page)
+            if len(page) < 4:
+                break
+            position = (page[-1].created_at, page[-1].id)
+
+    expected = [row for row in rows if row["entity_id"] == "42"]
+    expected.sort(key=lambda row: row["created_at"], reverse=True)
+    assert seen == [row["id"] for row in expected]
+
+
+def test_compaction_archives_and_drops_old_months(audit_engine, tmp_path):
+    archive_dir = str(tmp_path / "archive")
+    old_month, now = date(2001, 1, 1), datetime.now()
+    old_rows = [_row(datetime(2001, 1, day)) for day in (3, 4)]
+    current_row = _row(now)
+    _insert(audit_engine, old_rows + [current_row])
+
+    compacted = compact_audit_partitions(audit_engine, retention_months=1, archive_dir=archive_dir)
+
+    assert (old_month, 2) in compacted
+    with audit_engine.connect() as connection:
+        months = list_partitions(connection)
+    assert old_month not in months
+    assert month_start(now) in months
+    assert archive_path(old_month, archive_dir).exists()
+    assert sorted(row["id"] for row in read_archive(old_month, archive_dir)) == sorted(row["id"] for row in old_rows)
+    assert [row["id"] for row in query_audit_logs(audit_engine, start=old_month)] == [current_row["id"]]
+
+
+def test_late_rows_are_merged_into_an_existing_archive(audit_engine, tmp_path):
+    archive_dir = str(tmp_path / "archive")
+    month = date(2001, 2, 1)
+    first, late = _row(datetime(2001, 2, 3)), _row(datetime(2001, 2, 4))
+    _insert(audit_engine, [first])
+    compact_audit_partitions(audit_engine, retention_months=1, archive_dir=archive_dir)
+
+    # A replayed spool recreates the month's partition with a late row (and a duplicate)
+    _insert(audit_engine, [late, first])
+    compact_audit_partitions(audit_engine, retention_months=1, archive_dir=archive_dir)
+
+    archived = [row["id"] for row in read_archive(month, archive_dir)]
+    assert sorted(archived) == sorted([first["id"], late["id"]])
+
+
+def test_legacy_table_is_moved_into_partitions(tmp_path):
+    legacy_engine = create_db_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    legacy = Table("audit_logs", MetaData(), *[Column(c.name, c.type) for c in AuditLog.__table__.columns])
+    rows = [_row(datetime(2023, 11, 2)), _row(datetime(2023, 12, 24)), _row(None)]
+    with legacy_engine.begin() as connection:
+        legacy.create(connection)
+        connection.execute(insert(legacy), rows)
+
+    ensure_audit_partitions(legacy_engine)
+
+    with legacy_engine.connect() as connection:
+        assert "audit_logs" in inspect(connection).get_view_names()
+        assert "audit_logs" not in inspect(connection).get_table_names()
+        months = list_partitions(connection)
+    assert {date(2023, 11, 1), date(2023, 12, 1), month_start(datetime.now())} <= set(months)
+    stored = query_audit_logs(legacy_engine)
+    assert sorted(row["id"] for row in stored) == sorted(row["id"] for row in rows)
+    legacy_engine.dispose()
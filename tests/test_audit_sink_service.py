@@ -0,0 +1,118 @@
+import shutil
+import subprocess
+import sys
+import textwrap
+import uuid
+from datetime import date
+
+from app.services.audit_partition_service import query_audit_logs
+from app.services.audit_sink_service import AuditSink, replay_spool, spool_status
+
+"""Write-behind audit sink and spool replay."""
+
+
+def _record(sink, user, entity_id, **details):
+    return sink.record({
+        "user_id": user.id, "action": "update", "entity_type": "test", "entity_id": entity_id,
+        "details": details or None, "ip_address": None, "user_agent": None,
+    })
+
+
+def _stored(entity_id):
+    return query_audit_logs(entity_type="test", entity_id=entity_id)
+
+
+def test_flush_inserts_batch_and_removes_segment(tmp_path, user):
+    entity_id = uuid.uuid4().hex
+    sink = AuditSink(spool_dir=str(tmp_path), interval_ms=60000)
+    _record(sink, user, entity_id, when=date(2026, 1, 2))
+    _record(sink, user, entity_id)
+    segment = sink.active_segment
+
+    assert sink.flush() == 2
+    sink.stop()
+
+    assert len(_stored(entity_id)) == 2
+    assert not segment.exists()
+
+
+def test_replay_loads_segments_of_a_crashed_sink_once(tmp_path, user):
+    entity_id = uuid.uuid4().hex
+    spool_dir = tmp_path / "spool"
+    crashed = AuditSink(spool_dir=str(spool_dir), interval_ms=60000)
+    for _ in range(3):
+        _record(crashed, user, entity_id)
+    segment = crashed.active_segment
+    # A crash closes the file, releasing its lock, without flushing
+    crashed._segment_file.close()
+    copy = tmp_path / "copy.jsonl"
+    shutil.copyfile(segment, copy)
+
+    result = replay_spool(spool_dir=str(spool_dir))
+
+    assert (result["segments"], result["inserted"], result["in_use"]) == (1, 3, 0)
+    assert not segment.exists()
+    assert len(_stored(entity_id)) == 3
+
+    # Replaying the same records again (e.g. a batch that committed before the crash) adds nothing
+    shutil.copyfile(copy, segment)
+    result = replay_spool(spool_dir=str(spool_dir))
+    assert (result["inserted"], result["skipped"]) == (0, 3)
+    assert len(_stored(entity_id)) == 3
+
+
+def test_replay_skips_segments_of_another_live_sink(tmp_path, user):
+    entity_id = uuid.uuid4().hex
+    spool_dir = str(tmp_path)
+    other = AuditSink(spool_dir=spool_dir, interval_ms=60000)
+    _record(other, user, entity_id)
+    segment = other.active_segment
+
+    result = replay_spool(spool_dir=spool_dir)
+
+    assert (result["segments"], result["in_use"]) == (0, 1)
+    assert segment.exists()
+    assert spool_status(spool_dir) == {"segments": 0, "records": 0, "in_use": 1}
+    _record(other, user, entity_id)
+    other.stop()
+    assert len(_stored(entity_id)) == 2
+
+
+def test_replay_skips_segments_of_another_live_process(tmp_path, user):
+    entity_id = uuid.uuid4().hex
+    spool_dir = str(tmp_path)
+    script = textwrap.dedent(f"""
+        import sys
+        from app.services.audit_sink_service import AuditSink
+
+        def record():
+            sink.record({{"user_id": "{user.id}", "action": "update", "entity_type": "test",
+                         "entity_id": "{entity_id}", "details": None, "ip_address": None, "user_agent": None}})
+
+        sink = AuditSink(spool_dir={spool_dir!r}, interval_ms=3600000)
+        record()
+        print(sink.active_segment, flush=True)
+        sys.stdin.readline()
+        record()
+        sink.stop()
+    """)
+    child = subprocess.Popen(
+        [sys.executable, "-c", script], stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True,
+    )
+    try:
+        segment = child.stdout.readline().strip()
+
+        # What main.py does on startup while the other process is still appending
+        result = replay_spool(spool_dir=spool_dir)
+
+        assert (result["segments"], result["in_use"]) == (0, 1)
+        assert len(_stored(entity_id)) == 0
+        child.stdin.write("\n")
+        child.stdin.flush()
+        assert child.wait(timeout=60) == 0
+    finally:
+        if child.poll() is None:
+            child.kill()
+
+    assert len(_stored(entity_id)) == 2
+    assert not tmp_path.joinpath(segment).exists()
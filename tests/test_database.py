@@ -0,0 +1,78 @@
+import asyncio
+from datetime import date
+
+import pytest
+from sqlalchemy import func, select, text
+
+from app.db.database import AsyncSessionLocal, SessionLocal, async_engine, async_read_engine, engine, read_engine
+from app.db.models import LogbookEntry
+
+"""Read/write routing of the SQLite engine profile."""
+
+
+def _entry(user, location, description):
+    return LogbookEntry(
+        user_id=user.id, start_date=date(2026, 1, 1), responsible_person="Tester",
+        location_id=location.id, device="pump", call_description=description,
+    )
+
+
+def test_sync_session_reads_on_readers_and_writes_on_writer(user, location):
+    with SessionLocal() as session:
+        assert session.get_bind() is read_engine
+        assert session.execute(text("PRAGMA query_only")).scalar() == 1
+
+        session.add(_entry(user, location, "routed"))
+        session.flush()
+        # The rest of the transaction stays on the writer and sees its own changes
+        assert session.get_bind() is engine
+        assert session.execute(select(func.count()).where(LogbookEntry.call_description == "routed")).scalar() == 1
+        session.rollback()
+
+        assert session.get_bind() is read_engine
+
+
+def test_async_reads_do_not_wait_for_the_writer(user, location):
+    assert async_read_engine is not async_engine
+
+    async def scenario():
+        async with AsyncSessionLocal() as writer:
+            writer.add(_entry(user, location, "held"))
+            # Holds the single async writer connection until the rollback below
+            await writer.flush()
+
+            async def read_count():
+                async with AsyncSessionLocal() as reader:
+                    assert (await reader.execute(text("PRAGMA query_only"))).scalar() == 1
+                    return (await reader.execute(select(func.count(LogbookEntry.id)))).scalar()
+
+            counts = await asyncio.wait_for(asyncio.gather(*(read_count() for _ in range(5))), timeout=5)
+            await writer.rollback()
+        return counts
+
+    counts = asyncio.run(scenario())
+    assert len(set(counts)) == 1
+
+
+def test_async_writes_share_one_connection(user, location):
+    async def write(description):
+        async with AsyncSessionLocal() as session:
+            session.add(_entry(user, location, description))
+            await session.commit()
+
+    async def scenario():
+        await asyncio.gather(*(write(f"concurrent {index}") for index in range(10)))
+        async with AsyncSessionLocal() as session:
+            statement = select(func.count()).where(LogbookEntry.location_id == location.id)
+            return (await session.execute(statement)).scalar()
+
+    assert asyncio.run(scenario()) == 10
+    assert async_engine.pool.size() == 1
+
+
+@pytest.fixture(autouse=True, scope="module")
+def _dispose_async_engines():
+    """Drop pooled aiosqlite connections bound to the event loops of these tests."""
+    yield
+    asyncio.run(async_engine.dispose())
+    asyncio.run(async_read_engine.dispose())
@@ -0,0 +1,62 @@
+from app.services.audit_sink_service import flush_audit_log
+from app.services.history_service import field_changes
+
+"""Change history of logbook entries."""
+
+
+def test_field_changes_reads_both_detail_formats():
+    details = {"status": {"old": "Open", "new": "Completed"}, "device": "valve", "notes": None}
+
+    assert field_changes(details) == [
+        {"field": "status", "old": "Open", "new": "Completed"},
+        {"field": "device", "old": None, "new": "valve"},
+    ]
+    assert field_changes(None) == []
+
+
+def _history(api_client, entry_id, **params):
+    """Collect every event of the entry's history, newest first."""
+    events = []
+    for _ in range(20):
+        body = api_client.get(f"/logbook/entries/{entry_id}/history", params=params).json()
+        events.extend(body["items"])
+        if body["next_cursor"] is None:
+            return events
+        params["cursor"] = body["next_cursor"]
+    raise AssertionError("next_cursor never became null")
+
+
+def test_history_lists_updates_with_previous_values(api_client, session, make_entry):
+    entry = make_entry(device="pump")
+    session.commit()
+
+    for device in ("valve", "motor", "fan"):
+        response = api_client.put(f"/logbook/entries/{entry.id}", json={"device": device})
+        assert response.status_code == 200
+    flush_audit_log()
+
+    events = _history(api_client, entry.id, limit=2)
+    assert [event["changes"] for event in events] == [
+        [{"field": "device", "old": "motor", "new": "fan"}],
+        [{"field": "device", "old": "valve", "new": "motor"}],
+        [{"field": "device", "old": "pump", "new": "valve"}],
+    ]
+
+
+def test_history_includes_attachment_uploads(api_client, session, make_entry, user):
+    entry = make_entry()
+    session.commit()
+
+    response = api_client.post(
+        f"/logbook/entries/{entry.id}/attachments",
+        files={"file": ("photo.txt", b"seal", "text/plain")},
+        data={"description": "worn seal"},
+    )
+    assert response.status_code == 201
+    flush_audit_log()
+
+    events = _history(api_client, entry.id)
+    uploads = [event for event in events if event["action"] == "attachment_added"]
+    assert len(uploads) == 1
+    assert uploads[0]["user_name"] == user.full_name
+    assert {"field": "file_name", "old": None, "new": "photo.txt"} in uploads[0]["changes"]
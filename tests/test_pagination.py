@@ -0,0 +1,109 @@
+import uuid
+from datetime import datetime
+
+import pytest
+from sqlalchemy import func, text
+
+from app.db.database import normalize_sqlite_timestamps
+from app.db.models import LogbookEntry
+from app.utils.pagination import apply_keyset, decode_cursor, encode_cursor, fetch_page
+
+"""Keyset pagination over (created_at, id)."""
+
+
+def _page_through(session, location, limit):
+    """Collect the ids of every page of the location's entries."""
+    seen = []
+    cursor = None
+    for _ in range(20):
+        query = apply_keyset(
+            session.query(LogbookEntry).filter(LogbookEntry.location_id == location.id),
+            LogbookEntry.created_at,
+            LogbookEntry.id,
+            cursor,
+        )
+        rows, token = fetch_page(query, "created_at", limit)
+        seen.extend(row.id for row in rows)
+        if token is None:
+            return seen
+        cursor = decode_cursor(token)
+    pytest.fail(f"pagination did not end after 20 pages ({len(seen)} rows, {len(set(seen))} distinct)")
+
+
+def test_cursor_round_trip():
+    position = (datetime(2026, 3, 4, 5, 6, 7, 890), uuid.uuid4())
+    assert decode_cursor(encode_cursor(*position)) == position
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor")
+
+
+def test_pages_cover_rows_sharing_a_timestamp_once(session, make_entry, location):
+    same_time = datetime(2026, 1, 2, 3, 4, 5)
+    entries = [make_entry(created_at=same_time) for _ in range(7)]
+    session.commit()
+
+    seen = _page_through(session, location, limit=3)
+
+    assert sorted(seen) == sorted(entry.id for entry in entries)
+
+
+def test_pages_cover_entries_created_with_defaults_once(session, make_entry, location):
+    entries = [make_entry() for _ in range(8)]
+    session.commit()
+
+    seen = _page_through(session, location, limit=3)
+
+    assert sorted(seen) == sorted(entry.id for entry in entries)
+
+
+def test_pages_cover_database_clock_rows_once_after_normalizing(session, make_entry, location, database):
+    # Rows written with CURRENT_TIMESTAMP, as earlier releases did, lack fractional seconds
+    entries = [make_entry(created_at=func.now()) for _ in range(8)]
+    session.commit()
+    stored = session.execute(
+        text("SELECT created_at FROM logbook_entries WHERE location_id = :id"), {"id": location.id}
+    ).scalars().all()
+    assert all(len(value) == 19 for value in stored)
+
+    normalize_sqlite_timestamps(database, LogbookEntry.__table__)
+
+    seen = _page_through(session, location, limit=3)
+    assert sorted(seen) == sorted(entry.id for entry in entries)
+
+
+def test_api_pages_cover_every_entry_once(api_client, session, make_entry, location):
+    entries = [make_entry() for _ in range(8)]
+    session.commit()
+
+    seen = []
+    params = {"limit": 3, "location_id": location.id}
+    for _ in range(20):
+        body = api_client.get("/logbook/entries", params=params).json()
+        seen.extend(item["id"] for item in body["items"])
+        if body["next_cursor"] is None:
+            break
+        params["cursor"] = body["next_cursor"]
+    else:
+        pytest.fail("next_cursor never became null")
+
+    assert sorted(seen) == sorted(str(entry.id) for entry in entries)
+
+
+
+def test_api_search_pages_cover_every_match_once(api_client, session, make_entry, location):
+    marker = f"gasket{uuid.uuid4().hex[:8]}"
+    entries = [make_entry(call_description=f"replace {marker}") for _ in range(5)]
+    session.commit()
+
+    seen = []
+    params = {"limit": 2}
+    for _ in range(20):
+        body = api_client.post("/logbook/search", params=params, json={"search_text": marker}).json()
+        seen.extend(item["id"] for item in body["items"])
+        if body["next_cursor"] is None:
+            break
+        params["cursor"] = body["next_cursor"]
+    else:
+        pytest.fail("next_cursor never became null")
+
+    assert sorted(seen) == sorted(str(entry.id) for entry in entries)
@@ -0,0 +1,56 @@
+import math
+import os
+import sys
+import types
+
+import pytest
+
+from app.db.models import Job, LogbookEntry
+from app.services import pdf_service
+
+"""Multi-process PDF rendering."""
+
+MAIN_SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "main.py")
+
+
+@pytest.fixture
+def running_job(session):
+    """A job marked as running, like the PDF export job itself."""
+    job = Job(kind="export_pdf", status="running")
+    session.add(job)
+    session.commit()
+    return job
+
+
+@pytest.fixture
+def main_script_as_main(monkeypatch):
+    """Make spawned workers re-import main.py, as they do when the app runs."""
+    main_module = types.ModuleType("__main__")
+    main_module.__file__ = MAIN_SCRIPT
+    main_module.__spec__ = None
+    monkeypatch.setitem(sys.modules, "__main__", main_module)
+
+
+def test_multi_chunk_pdf_leaves_running_jobs_alone(
+    tmp_path, monkeypatch, session, make_entry, location, running_job, main_script_as_main
+):
+    from pypdf import PdfReader
+
+    monkeypatch.setattr(pdf_service, "PAGES_PER_CHUNK", 1)
+    row_count = pdf_service.ROWS_PER_PAGE * 2 + 5
+    for index in range(row_count):
+        make_entry(call_description=f"entry {index}")
+    session.commit()
+
+    progress = []
+    output = tmp_path / "report.pdf"
+    pdf_service.write_pdf(
+        str(output), session, [LogbookEntry.location_id == location.id],
+        progress=lambda done, total: progress.append((done, total)), workers=2,
+    )
+
+    total_pages = math.ceil(row_count / pdf_service.ROWS_PER_PAGE) + 1
+    assert len(PdfReader(str(output)).pages) == total_pages
+    assert progress[-1] == (total_pages, total_pages)
+    session.refresh(running_job)
+    assert running_job.status == "running"
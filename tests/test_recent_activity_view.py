@@ -0,0 +1,109 @@
+import uuid
+
+from sqlalchemy import func
+
+from app.db.models import LogbookEntry, Report
+from app.ui.views.recent_activity_view import RecentActivityView
+
+"""Infinite scrolling and report jobs of the recent activity view."""
+
+
+class _PubSub:
+    """Stand-in for the page's pubsub hub."""
+
+    def subscribe_topic(self, topic, handler):
+        pass
+
+
+class _Page:
+    """Stand-in for ft.Page with the attributes the view uses."""
+
+    session_id = "test-session"
+    data = None
+    snack_bar = None
+    pubsub = _PubSub()
+
+    def update(self, *controls):
+        pass
+
+
+def _view_for(location, page_size):
+    """Build a view listing only the location's entries."""
+    view = RecentActivityView()
+    view.page = _Page()
+    view.page_size = page_size
+    base_query = view.build_entries_query
+    view.build_entries_query = lambda session, filters=None: base_query(session, filters).filter(
+        LogbookEntry.location_id == location.id
+    )
+    return view
+
+
+def _scroll_to_end(view):
+    """Load pages until the view reports no more entries."""
+    view.load_entries()
+    for _ in range(20):
+        if not view.has_more_entries:
+            return
+        view.load_next_page()
+    raise AssertionError(f"the list never reached its end ({len(view.entries)} entries loaded)")
+
+
+def test_scrolling_loads_each_entry_once(session, make_entry, location):
+    entries = [make_entry() for _ in range(7)]
+    session.commit()
+
+    view = _view_for(location, page_size=3)
+    _scroll_to_end(view)
+
+    assert sorted(entry.id for entry in view.entries) == sorted(entry.id for entry in entries)
+    assert len(view.entries_column.controls) == len(entries)
+
+
+def test_scrolling_reaches_the_end_of_same_second_entries(session, make_entry, location, database):
+    from app.db.database import normalize_sqlite_timestamps
+
+    # Stamped by the database clock, as the dashboard form did
+    entries = [make_entry(created_at=func.now()) for _ in range(7)]
+    session.commit()
+    normalize_sqlite_timestamps(database, LogbookEntry.__table__)
+
+    view = _view_for(location, page_size=3)
+    _scroll_to_end(view)
+
+    assert sorted(entry.id for entry in view.entries) == sorted(entry.id for entry in entries)
+
+
+class _Job:
+    """Stand-in for the JobContext passed to job targets."""
+
+    def check_cancelled(self):
+        pass
+
+
+def test_report_job_uses_filters_captured_at_submission(monkeypatch, session, make_entry, location, user):
+    import app.services.job_service as job_service
+
+    marker = f"bearing{uuid.uuid4().hex[:8]}"
+    for _ in range(3):
+        make_entry(call_description=f"noisy {marker}")
+    make_entry(call_description="unrelated")
+    session.commit()
+
+    submitted = []
+    monkeypatch.setattr(job_service, "submit_job", lambda kind, target, *args, **kwargs: submitted.append((target, args)))
+    view = _view_for(location, page_size=50)
+    view.search_field.value = marker
+    view.load_entries()
+    view.handle_generate_report()
+
+    # The user edits the filters before the worker thread picks the job up
+    view.search_field.value = ""
+    view.status_dropdown.value = "Completed"
+    target, (parameters, filters, _) = submitted[0]
+    message = target(_Job(), parameters, filters, user.id)
+
+    assert message == "Report generated successfully with 3 entries"
+    report = session.query(Report).filter(Report.created_by_id == user.id).one()
+    assert report.parameters["search"] == marker
+    assert report.parameters["entry_count"] == 3
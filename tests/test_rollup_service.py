@@ -0,0 +1,98 @@
+from datetime import date, datetime, timedelta
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from app.db.models import LogbookDailyRollup, LogbookEntry, PriorityEnum, StatusEnum
+from app.services.rollup_service import get_rollup_stats, rebuild_rollup
+from app.services.stats_service import get_entry_stats
+
+"""Incremental maintenance of the daily logbook rollup."""
+
+
+def _rollup_rows(session, location):
+    """Return the location's rollup rows as comparable tuples."""
+    rows = session.query(LogbookDailyRollup).filter(LogbookDailyRollup.location_id == location.id).all()
+    return sorted(
+        (row.day, row.category_id, row.status, row.priority, row.entry_count,
+         pytest.approx(row.downtime_hours), row.resolved_count, pytest.approx(row.resolution_minutes))
+        for row in rows
+        if row.entry_count
+    )
+
+
+def _assert_matches_rebuild(session, location):
+    """Check the incrementally maintained rows against a full rebuild (rolled back afterwards)."""
+    incremental = _rollup_rows(session, location)
+    rebuild_rollup(session)
+    rebuilt = _rollup_rows(session, location)
+    session.rollback()
+    assert incremental == rebuilt
+    return incremental
+
+
+def test_inserts_are_added_to_the_rollup(session, make_entry, location):
+    make_entry(status=StatusEnum.OPEN, downtime_hours=1.5)
+    make_entry(status=StatusEnum.COMPLETED, downtime_hours=2.0,
+               resolution_time=datetime(2026, 1, 1, 3, 30))
+    make_entry(status=StatusEnum.COMPLETED, priority=PriorityEnum.HIGH)
+    session.commit()
+
+    rows = _assert_matches_rebuild(session, location)
+    assert sum(row[4] for row in rows) == 3
+
+
+def test_updates_and_deletes_move_contributions(session, make_entry, location):
+    moved = make_entry(status=StatusEnum.OPEN, downtime_hours=1.0)
+    soft_deleted = make_entry(status=StatusEnum.OPEN)
+    hard_deleted = make_entry(status=StatusEnum.ESCALATION, downtime_hours=4.0)
+    make_entry(status=StatusEnum.OPEN)
+    session.commit()
+
+    moved.status = StatusEnum.COMPLETED
+    moved.resolution_time = datetime(2026, 1, 1, 1, 15)
+    moved.created_at = moved.created_at - timedelta(days=3)
+    soft_deleted.is_deleted = True
+    session.delete(hard_deleted)
+    session.commit()
+
+    rows = _assert_matches_rebuild(session, location)
+    assert sum(row[4] for row in rows) == 2
+
+
+def test_failed_flush_leaves_the_rollup_unchanged(session, make_entry, location):
+    entry = make_entry(status=StatusEnum.OPEN)
+    session.commit()
+    before = _rollup_rows(session, location)
+
+    entry.status = StatusEnum.ESCALATION
+    entry.device = None
+    with pytest.raises(IntegrityError):
+        session.flush()
+    session.rollback()
+    # The next flush must not subtract contributions captured by the failed one
+    make_entry(status=StatusEnum.OPEN)
+    session.commit()
+
+    rows = _assert_matches_rebuild(session, location)
+    assert sum(row[4] for row in rows) == sum(row[4] for row in before) + 1
+
+
+def test_rollup_stats_match_the_entry_stats(session, make_entry):
+    day = date(2031, 5, 14)
+    stamp = datetime.combine(day, datetime.min.time()) + timedelta(hours=9)
+    make_entry(created_at=stamp, status=StatusEnum.COMPLETED, resolution_time=datetime(2026, 1, 1, 2, 0))
+    make_entry(created_at=stamp, status=StatusEnum.COMPLETED, resolution_time=datetime(2026, 1, 1, 4, 30))
+    make_entry(created_at=stamp, status=StatusEnum.ESCALATION)
+    make_entry(created_at=stamp, status=StatusEnum.OPEN, is_deleted=True)
+    make_entry(created_at=stamp + timedelta(days=1), status=StatusEnum.OPEN)
+    session.commit()
+
+    stats = get_rollup_stats(session, day, day)
+
+    assert stats["total"] == 3
+    assert stats["counts"][StatusEnum.COMPLETED] == 2
+    assert stats["avg_resolution_hours"][StatusEnum.COMPLETED] == pytest.approx(3.25)
+    start = datetime.combine(day, datetime.min.time())
+    in_day = [LogbookEntry.created_at >= start, LogbookEntry.created_at < start + timedelta(days=1)]
+    assert stats == get_entry_stats(session, in_day)
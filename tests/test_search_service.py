@@ -0,0 +1,87 @@
+import uuid
+
+from sqlalchemy import text
+
+from app.db.models import LogbookEntry
+from app.services import search_service
+from app.services.search_service import FTS_TABLE, apply_text_search, rebuild_search_index
+
+"""Full-text search over logbook entry text columns."""
+
+
+def _search(session, location, search_text, rank=False):
+    """Return the ids of the location's entries matching the search text."""
+    query = session.query(LogbookEntry).filter(LogbookEntry.location_id == location.id)
+    return [entry.id for entry in apply_text_search(query, session, search_text, rank=rank)]
+
+
+def _marker():
+    return f"m{uuid.uuid4().hex[:8]}"
+
+
+def test_every_word_must_match_as_a_prefix(session, make_entry, location):
+    marker = _marker()
+    pump = make_entry(call_description=f"{marker} leaking seal", device="pump")
+    valve = make_entry(call_description=f"{marker} stuck", device="valve")
+    session.commit()
+
+    assert sorted(_search(session, location, marker)) == sorted([pump.id, valve.id])
+    assert _search(session, location, f"{marker} lea") == [pump.id]
+    assert _search(session, location, f"{marker} valv") == [valve.id]
+    assert _search(session, location, f"{marker} compressor") == []
+
+
+def test_query_syntax_characters_are_ignored(session, make_entry, location):
+    marker = _marker()
+    entry = make_entry(call_description=f"{marker} seal")
+    session.commit()
+
+    assert _search(session, location, f'"{marker}" (seal* -') == [entry.id]
+    # Input without any words leaves the query unrestricted
+    assert _search(session, location, '"*()') == [entry.id]
+
+
+def test_ranking_puts_the_best_match_first(session, make_entry, location):
+    marker = _marker()
+    weak = make_entry(call_description=f"{marker} " + "filler " * 40)
+    strong = make_entry(call_description=f"{marker} {marker}", device=marker)
+    session.commit()
+
+    assert _search(session, location, marker, rank=True) == [strong.id, weak.id]
+
+
+def test_triggers_keep_the_index_in_sync(session, make_entry, location):
+    old_marker, new_marker = _marker(), _marker()
+    entry = make_entry(solution_description=old_marker)
+    session.commit()
+
+    entry.solution_description = new_marker
+    session.commit()
+    assert _search(session, location, old_marker) == []
+    assert _search(session, location, new_marker) == [entry.id]
+
+    session.delete(entry)
+    session.commit()
+    assert _search(session, location, new_marker) == []
+
+
+def test_rebuild_restores_a_cleared_index(session, make_entry, location, database):
+    marker = _marker()
+    entry = make_entry(task=marker)
+    session.commit()
+
+    with database.begin() as connection:
+        connection.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('delete-all')"))
+    assert _search(session, location, marker) == []
+
+    rebuild_search_index(database)
+    assert _search(session, location, marker) == [entry.id]
+
+
+def test_substring_fallback_without_an_index(monkeypatch, session, make_entry, location):
+    marker = _marker()
+    entry = make_entry(call_description=f"pre{marker}post")
+    session.commit()
+
+    monkeypatch.setattr(search_service, "_has_search_index", lambda session: False)
+    assert _search(session, location, marker) == [entry.id]
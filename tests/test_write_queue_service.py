@@ -0,0 +1,81 @@
+import uuid
+
+import pytest
+
+from app.db.database import SessionLocal
+from app.db.models import Location
+from app.services.write_queue_service import WriteQueue
+
+"""Group commit through the serialized write queue."""
+
+
+@pytest.fixture
+def write_queue():
+    """A write queue counting the sessions (transactions) it opens."""
+    sessions = []
+
+    def session_factory(**kwargs):
+        session = SessionLocal(**kwargs)
+        sessions.append(session)
+        return session
+
+    # A wide window so a burst of submissions lands in one batch
+    queue = WriteQueue(session_factory=session_factory, window_ms=300)
+    queue.sessions = sessions
+    yield queue
+    queue.stop()
+
+
+def _add_location(session, name, user_id):
+    location = Location(name=name, created_by_id=user_id)
+    session.add(location)
+    session.flush()
+    return location
+
+
+def _fail(session, name, user_id):
+    _add_location(session, name, user_id)
+    raise ValueError(f"rejected {name}")
+
+
+def _stored(session, names):
+    return sorted(name for (name,) in session.query(Location.name).filter(Location.name.in_(names)))
+
+
+def test_burst_of_units_commits_once(write_queue, session, user):
+    names = [f"queued_{uuid.uuid4().hex[:8]}" for _ in range(10)]
+
+    futures = [write_queue.submit(_add_location, name, user.id) for name in names]
+    results = [future.result(10) for future in futures]
+
+    assert [location.name for location in results] == names
+    assert all(location.id is not None for location in results)
+    assert len(write_queue.sessions) == 1
+    assert _stored(session, names) == sorted(names)
+
+
+def test_failing_unit_is_rolled_back_alone(write_queue, session, user):
+    names = [f"queued_{uuid.uuid4().hex[:8]}" for _ in range(5)]
+    rejected = f"rejected_{uuid.uuid4().hex[:8]}"
+
+    futures = [write_queue.submit(_add_location, name, user.id) for name in names[:2]]
+    failing = write_queue.submit(_fail, rejected, user.id)
+    futures += [write_queue.submit(_add_location, name, user.id) for name in names[2:]]
+
+    with pytest.raises(ValueError, match=rejected):
+        failing.result(10)
+    assert [future.result(10).name for future in futures] == names
+    # The fast path failed, so the batch ran again with a savepoint per unit
+    assert len(write_queue.sessions) == 2
+    assert _stored(session, names + [rejected]) == sorted(names)
+
+
+def test_stop_commits_queued_units(session, user):
+    queue = WriteQueue(session_factory=SessionLocal, window_ms=1000)
+    name = f"queued_{uuid.uuid4().hex[:8]}"
+    future = queue.submit(_add_location, name, user.id)
+
+    queue.stop()
+
+    assert future.done()
+    assert _stored(session, [name]) == [name]